@@ -535,7 +535,7 @@ class Context(object):
         self._execute(cmd.format(**locals()), targets=distribution.targets)
         return DistArray.from_localarrays(da_name, distribution=distribution)
 
-    def apply(self, func, args=None, kwargs=None, targets=None):
+    def apply(self, func, args=None, kwargs=None, targets=None, block=True):
         """
         Analogous to IPython.parallel.view.apply_sync
 
@@ -548,6 +548,9 @@ class Context(object):
             key word arguments to func
         targets : sequence of integers
             engines func is to be run on.
+        block : bool, optional
+            If False, return immediately with an AsyncResult, so that
+            several applies can be in flight at once.
 
         Returns
         -------
@@ -608,4 +611,4 @@ class Context(object):
         targets = self.targets if targets is None else targets
 
         return self.view._really_apply(func_wrapper, args=wrapped_args,
-                                       targets=targets, block=True)
+                                       targets=targets, block=block)
@@ -179,8 +179,23 @@ class vectorize(DecoratorBase):
     """
     Analogous to numpy.vectorize. Input DistArray's must all be the
     same shape, and this will be the shape of the output distarray.
+
+    By default each engine applies the function to its whole local block,
+    so the engine with the most costly elements determines the runtime.
+    With ``balanced=True`` the local blocks are split into `chunks` chunks,
+    and engines that run out of chunks take over those of other engines
+    and send back the results (see `distarray.local.balance`).  This pays
+    off when the cost per element varies, as with escape-time fractals.
+    The input DistArrays must then all have the same distribution.
+
+    >>> julia_balanced = vectorize(julia, balanced=True)
     """
 
+    def __init__(self, fn, balanced=False, chunks=16):
+        super(vectorize, self).__init__(fn)
+        self.balanced = balanced
+        self.chunks = chunks
+
     def get_ndarray(self, da, arg_keys):
         return arg_keys + [da.key + '.ndarray']
 
@@ -196,6 +211,9 @@ class vectorize(DecoratorBase):
         # Find the first distarray, they should all be the same up to the data.
         for arg in args:
             if isinstance(arg, DistArray):
+                if self.balanced:
+                    return self._balanced_call(context, arg.distribution,
+                                               args, kwargs)
                 # Create the output distarray.
                 out = context.empty(arg.distribution, dtype=arg.dtype)
                 # parse args
@@ -210,3 +228,29 @@ class vectorize(DecoratorBase):
                              kwargs_str)
                 context._execute(exec_str, targets=context.targets)
                 return out
+
+    def _balanced_call(self, context, distribution, args, kwargs):
+        """Call the function with work stealing between the engines.
+
+        The engines agree on the dtype of the result, which is allocated
+        on the engines once the function has been applied.
+        """
+        for arg in args + tuple(kwargs.values()):
+            if (isinstance(arg, DistArray) and
+                    not arg.distribution.is_compatible(distribution)):
+                msg = "DistArrays must have the same distribution."
+                raise ValueError(msg)
+        # Pass the LocalArrays themselves, which are split into chunks.
+        args_str, kwargs_str = self.key_and_push_args(args, kwargs,
+                                                      context=context)
+        out_key = context._generate_key()
+        exec_str = ("import distarray.local.balance; "
+                    "%s = distarray.local.balance.balanced_vectorize("
+                    "%s, %s, %s, %s, chunks=%r)[0]")
+        exec_str %= (out_key, self.fn_key, distribution.comm, args_str,
+                     kwargs_str, self.chunks)
+        context._execute(exec_str, targets=distribution.targets)
+        dtype = context.apply(getattr, args=(out_key, 'dtype'),
+                              targets=distribution.targets[:1])[0]
+        return DistArray.from_localarrays(out_key, distribution=distribution,
+                                          dtype=dtype)
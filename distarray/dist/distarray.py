@@ -14,6 +14,7 @@ The Distarray data structure.`DistArray` objects are proxies for collections of
 
 from __future__ import absolute_import
 
+import numbers
 import operator
 from itertools import product
 from functools import reduce
@@ -23,7 +24,8 @@ import numpy as np
 import distarray
 from distarray.dist.maps import Distribution
 from distarray.utils import _raise_nie
-from distarray.metadata_utils import normalize_reduction_axes
+from distarray.metadata_utils import (normalize_reduction_axes,
+                                     owning_ranks_and_local_indices)
 
 __all__ = ['DistArray']
 
@@ -163,6 +165,10 @@ class DistArray(object):
                 raise IndexError("Index %r is out of bounds" % (index,))
             else:
                 return result[0]
+
+        elif isinstance(index, DistArray) and index.dtype == np.bool_:
+            return self.compress(index)
+
         else:
             raise TypeError("Invalid index type.")
 
@@ -270,10 +276,42 @@ class DistArray(object):
             arr.fill(value)
         self.context.apply(inner_fill, args=(self.key, value), targets=self.targets)
 
-    def _reduce(self, local_reduce_name, axes=None, dtype=None, out=None):
+    def exchange_halos(self, periodic=False):
+        """Fill the ghost cells of every local section from its neighbours.
+
+        The ghost cells are allocated by creating the DistArray with a
+        `halo` (see `Distribution.from_shape`).  Ghost cells at the global
+        boundary are left untouched unless the boundary is `periodic`.
+
+        Parameters
+        ----------
+        periodic : bool or sequence of bools, optional
+            Whether each dimension wraps around.
+        """
+        def inner_exchange_halos(arr, periodic):
+            arr.exchange_halos(periodic)
+        self.context.apply(inner_exchange_halos, args=(self.key, periodic),
+                           targets=self.targets)
+
+    def expose(self):
+        """Expose the local sections in MPI windows for one-sided access.
 
-        if any(0 in localshape for localshape in self.get_localshapes()):
-            raise NotImplementedError("Reduction not implemented for empty LocalArrays")
+        Code applied on the engines can then read and accumulate into
+        arbitrary elements by global index, without the cooperation of
+        their owners.  Free the windows when done, or use the result as a
+        context manager.
+
+        Returns
+        -------
+        distarray.dist.rma.Window
+            A handle whose `key` refers to a `distarray.local.rma.Window`
+            on every engine.
+        """
+        from distarray.dist.rma import Window
+        return Window(self)
+
+    def _reduce(self, local_reduce_name, axes=None, dtype=None, out=None,
+                **reducer_kwargs):
 
         if out is not None:
             _raise_nie()
@@ -283,21 +321,64 @@ class DistArray(object):
         out_dist = self.distribution.reduce(axes=axes)
         ddpr = out_dist.get_dim_data_per_rank()
 
-        def _local_reduce(local_name, larr, out_comm, ddpr, dtype, axes):
+        def _local_reduce(local_name, larr, out_comm, ddpr, dtype, axes,
+                          reducer_kwargs):
+            from functools import partial
             import distarray.local.localarray as la
-            local_reducer = getattr(la, local_name)
+            local_reducer = partial(getattr(la, local_name), **reducer_kwargs)
             res = proxyize(la.local_reduction(out_comm, local_reducer, larr,  # noqa
                                               ddpr, dtype, axes))
             return res
 
         local_reduce_args = (local_reduce_name, self.key, out_dist.comm, ddpr,
-                             dtype, normalize_reduction_axes(axes, self.ndim))
+                             dtype, normalize_reduction_axes(axes, self.ndim),
+                             reducer_kwargs)
         out_key = self.context.apply(_local_reduce, local_reduce_args,
                                      targets=self.targets)[0]
 
         return DistArray.from_localarrays(key=out_key, distribution=out_dist,
                                           dtype=dtype)
 
+    def reduce(self, ufunc, axis=None, dtype=None, out=None, identity=None):
+        """Reduce array elements over the given axis with a binary function.
+
+        Parameters
+        ----------
+        ufunc : NumPy ufunc or callable
+            An associative and commutative binary operation, such as
+            `numpy.multiply` or `numpy.logical_and`.  A callable ``f(x, y)``
+            must combine two ndarrays elementwise, like a ufunc.
+        axis : None, int, or tuple of ints, optional
+            Axis or axes along which to reduce.  By default, reduce over all
+            axes.
+        dtype : NumPy dtype, optional
+            The dtype of the result.  By default, the dtype NumPy's
+            ``ufunc.reduce`` gives, or this DistArray's dtype for callables.
+        identity : scalar, optional
+            Value contributed by engines whose local section is empty along
+            `axis`.  Defaults to the identity of `ufunc`, when it has one.
+
+        Returns
+        -------
+        DistArray
+        """
+        if dtype is None:
+            if isinstance(ufunc, np.ufunc):
+                dtype = ufunc.reduce(np.ones((1,), dtype=self.dtype)).dtype
+            else:
+                dtype = self.dtype
+        if isinstance(ufunc, np.ufunc):
+            return self._reduce('ufunc_reducer', axis, np.dtype(dtype), out,
+                                ufunc=ufunc, identity=identity)
+
+        # Python callables are pushed to the engines and passed by name.
+        ufunc_key, = self.context._key_and_push(ufunc, targets=self.targets)
+        try:
+            return self._reduce('ufunc_reducer', axis, np.dtype(dtype), out,
+                                ufunc=ufunc_key, identity=identity)
+        finally:
+            self.context.delete_key(ufunc_key, self.targets)
+
     def sum(self, axis=None, dtype=None, out=None):
         """Return the sum of array elements over the given axis."""
         return self._reduce('sum_reducer', axis, dtype, out)
@@ -314,6 +395,82 @@ class DistArray(object):
         """Return the standard deviation of array elements over the given axis."""
         return self._reduce('std_reducer', axis, dtype, out)
 
+    def quantile(self, q, axis=None):
+        """Return the `q`-th quantile of array elements over the given axis.
+
+        Computed by parallel selection, in O(log n) rounds of small
+        collectives, without sorting or gathering the array.  Values are
+        interpolated linearly, as NumPy's default method.
+
+        Parameters
+        ----------
+        q : float
+            Quantile to compute, between 0 and 1 inclusive.
+        axis : None, int, or tuple of ints, optional
+            Axis or axes along which to compute the quantile.  By default,
+            over all axes.
+
+        Returns
+        -------
+        DistArray
+        """
+        if not isinstance(q, numbers.Real):
+            raise TypeError("q must be a scalar.")
+        if not 0 <= q <= 1:
+            raise ValueError("Quantiles must be in the range [0, 1]")
+        if self.dtype.kind == 'c':
+            raise TypeError("a must be an array of real numbers")
+        dtype = self.dtype if self.dtype.kind == 'f' else np.dtype(float)
+        return self._reduce('quantile_reducer', axis, dtype, q=q)
+
+    def percentile(self, q, axis=None):
+        """Return the `q`-th percentile of array elements over the given
+        axis, with `q` between 0 and 100.  See `quantile`."""
+        if not isinstance(q, numbers.Real):
+            raise TypeError("q must be a scalar.")
+        if not 0 <= q <= 100:
+            raise ValueError("Percentiles must be in the range [0, 100]")
+        return self.quantile(q / 100, axis)
+
+    def median(self, axis=None):
+        """Return the median of array elements over the given axis.  See
+        `quantile`."""
+        return self.quantile(0.5, axis)
+
+    def describe(self, axis=None):
+        """Return summary statistics of array elements over the given axis.
+
+        The count, mean and variance are computed with a single sweep over
+        each local array and a single collective.  The minimum and maximum
+        keep the dtype of the array, and the mean of a complex array is
+        complex.
+
+        Returns
+        -------
+        dict of DistArray
+            Keyed by 'count', 'mean', 'var', 'min' and 'max'.
+        """
+        out_dist = self.distribution.reduce(axes=axis)
+        ddpr = out_dist.get_dim_data_per_rank()
+
+        def _local_describe(larr, out_comm, ddpr, axes):
+            import distarray.local.localarray as la
+            stats = la.local_describe(out_comm, larr, ddpr, axes)
+            if stats is None:
+                return None
+            return [(name, proxyize(stats[name]), stats[name].dtype)  # noqa
+                    for name in la._DESCRIBE_FIELDS]
+
+        local_describe_args = (self.key, out_dist.comm, ddpr,
+                               normalize_reduction_axes(axis, self.ndim))
+        results = self.context.apply(_local_describe, local_describe_args,
+                                     targets=self.targets)
+        stats = next(r for r in results if r is not None)
+        return dict((name, DistArray.from_localarrays(key=key,
+                                                      distribution=out_dist,
+                                                      dtype=dtype))
+                    for (name, key, dtype) in stats)
+
     def min(self, axis=None, dtype=None, out=None):
         """Return the minimum of array elements over the given axis."""
         return self._reduce('min_reducer', axis, dtype, out)
@@ -322,6 +479,464 @@ class DistArray(object):
         """Return the maximum of array elements over the given axis."""
         return self._reduce('max_reducer', axis, dtype, out)
 
+    def ptp(self, axis=None, dtype=None, out=None):
+        """Return the range (maximum - minimum) of array elements over the
+        given axis."""
+        return self._reduce('ptp_reducer', axis, dtype, out)
+
+    def prod(self, axis=None, dtype=None, out=None):
+        """Return the product of array elements over the given axis."""
+        return self.reduce(np.multiply, axis=axis, dtype=dtype, out=out)
+
+    def any(self, axis=None, out=None):
+        """Test whether any array element over the given axis is True."""
+        return self.reduce(np.logical_or, axis=axis, dtype=bool, out=out)
+
+    def all(self, axis=None, out=None):
+        """Test whether all array elements over the given axis are True."""
+        return self.reduce(np.logical_and, axis=axis, dtype=bool, out=out)
+
+    def argmin(self, axis=None, out=None):
+        """Return the global indices of the minimum values over the given
+        axis.
+
+        With `axis` None, the index is into the flattened array.  Ties go
+        to the first occurrence, as in NumPy.
+        """
+        return self._reduce('argmin_reducer', axis, np.int64, out)
+
+    def argmax(self, axis=None, out=None):
+        """Return the global indices of the maximum values over the given
+        axis.
+
+        With `axis` None, the index is into the flattened array.  Ties go
+        to the first occurrence, as in NumPy.
+        """
+        return self._reduce('argmax_reducer', axis, np.int64, out)
+
+    def topk(self, k, largest=True):
+        """Return the `k` largest (or smallest) elements and their global
+        indices into the flattened array.
+
+        Each engine selects its own `k` best elements, and the candidates
+        are merged pairwise up a tree, so only O(k log P) data moves for P
+        engines.  NaNs count as the largest values, and ties go to the
+        smallest index.
+
+        Parameters
+        ----------
+        k : int
+            Number of elements to return, at most ``self.global_size``.
+        largest : bool, optional
+            If False, return the smallest elements instead.
+
+        Returns
+        -------
+        values : ndarray
+            The `k` best elements, best first.
+        indices : ndarray
+            Their global indices into the flattened array.
+        """
+        if not 0 < k <= self.global_size:
+            raise ValueError("k must be between 1 and the size of the array.")
+
+        def _local_topk(larr, k, largest):
+            import distarray.local.localarray as la
+            return la.local_topk(larr, k, largest)
+
+        results = self.context.apply(_local_topk, (self.key, k, largest),
+                                     targets=self.targets)
+        return next(r for r in results if r is not None)
+
+    def _scan(self, ufunc, axis, dtype):
+        if axis is None:
+            if self.ndim != 1:
+                msg = "Scans over the flattened array are not supported."
+                raise NotImplementedError(msg)
+            axis = 0
+        axis, = normalize_reduction_axes(axis, self.ndim)
+        if dtype is None:
+            dtype = ufunc.accumulate(np.ones((1,), dtype=self.dtype)).dtype
+        dtype = np.dtype(dtype)
+
+        def _local_scan(larr, ufunc, axis, dtype):
+            import distarray.local.localarray as la
+            return proxyize(la.local_scan(larr, ufunc, axis, dtype))  # noqa
+
+        out_key = self.context.apply(_local_scan,
+                                     (self.key, ufunc, axis, dtype),
+                                     targets=self.targets)[0]
+        return DistArray.from_localarrays(key=out_key,
+                                          distribution=self.distribution,
+                                          dtype=dtype)
+
+    def cumsum(self, axis=None, dtype=None):
+        """Return the cumulative sum of array elements along the given axis.
+
+        `axis` may only be None for 1-D arrays.
+        """
+        return self._scan(np.add, axis, dtype)
+
+    def cumprod(self, axis=None, dtype=None):
+        """Return the cumulative product of array elements along the given
+        axis.
+
+        `axis` may only be None for 1-D arrays.
+        """
+        return self._scan(np.multiply, axis, dtype)
+
+    # Transposes and reshapes
+
+    def transpose(self, *axes):
+        """Return the array with its dimensions permuted, as
+        `numpy.transpose`.
+
+        The maps and process grid are permuted along with the dimensions.
+        No data moves between engines unless the permutation changes the
+        order of the distributed dimensions, in which case every engine
+        exchanges its whole block with one other engine.
+        """
+        if len(axes) == 1 and not isinstance(axes[0], numbers.Integral):
+            axes = axes[0]
+        if not axes:
+            axes = tuple(reversed(range(self.ndim)))
+        axes = tuple(normalize_reduction_axes(axes, self.ndim))
+        if sorted(axes) != list(range(self.ndim)):
+            raise ValueError("axes don't match array")
+
+        # Block of old rank r -> new rank at the permuted grid coordinates.
+        ddpr = self.distribution.get_dim_data_per_rank()
+        grid_shape = tuple(self.grid_shape[ax] for ax in axes)
+        out_ddpr = [None] * len(ddpr)
+        sources = [None] * len(ddpr)
+        dests = []
+        for (rank, dim_data) in enumerate(ddpr):
+            out_dim_data = tuple(dict(dim_data[ax]) for ax in axes)
+            coords = tuple(dd['proc_grid_rank'] for dd in out_dim_data)
+            out_rank = int(np.ravel_multi_index(coords, grid_shape))
+            out_ddpr[out_rank] = out_dim_data
+            sources[out_rank] = rank
+            dests.append(out_rank)
+        out_dist = Distribution.from_dim_data_per_rank(self.context, out_ddpr,
+                                                       targets=self.targets)
+
+        def _local_transpose(larr, axes, out_comm, ddpr, sources, dests):
+            import distarray.local.localarray as la
+            return proxyize(la.local_transpose(larr, axes, out_comm,  # noqa
+                                               ddpr, sources, dests))
+
+        out_key = self.context.apply(_local_transpose,
+                                     (self.key, axes, out_dist.comm, out_ddpr,
+                                      sources, dests),
+                                     targets=self.targets)[0]
+        return DistArray.from_localarrays(key=out_key, distribution=out_dist,
+                                          dtype=self.dtype)
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def swapaxes(self, axis1, axis2):
+        """Return the array with `axis1` and `axis2` interchanged."""
+        axes = list(range(self.ndim))
+        axis1, axis2 = normalize_reduction_axes((axis1, axis2), self.ndim)
+        axes[axis1], axes[axis2] = axes[axis2], axes[axis1]
+        return self.transpose(axes)
+
+    def reshape(self, *shape):
+        """Return an array with the same data in C order and a new shape,
+        as `numpy.reshape`.
+
+        The result is block-distributed along its first dimension.  Every
+        engine sends each other engine only the elements of its linear range
+        in the result.
+        """
+        if len(shape) == 1 and not isinstance(shape[0], numbers.Integral):
+            shape = shape[0]
+        shape = list(shape)
+        if shape.count(-1) > 1:
+            raise ValueError("can only specify one unknown dimension")
+        if -1 in shape:
+            known = reduce(operator.mul, (n for n in shape if n != -1), 1)
+            if known == 0 or self.global_size % known:
+                msg = "cannot reshape array of size %d into shape %r"
+                raise ValueError(msg % (self.global_size, tuple(shape)))
+            shape[shape.index(-1)] = self.global_size // known
+        shape = tuple(shape)
+        if reduce(operator.mul, shape, 1) != self.global_size:
+            msg = "cannot reshape array of size %d into shape %r"
+            raise ValueError(msg % (self.global_size, shape))
+
+        out_dist = Distribution.from_shape(self.context, shape,
+                                           targets=self.targets)
+        ddpr = out_dist.get_dim_data_per_rank()
+
+        def _local_reshape(larr, out_comm, ddpr):
+            import distarray.local.localarray as la
+            return proxyize(la.local_reshape(larr, out_comm, ddpr))  # noqa
+
+        out_key = self.context.apply(_local_reshape,
+                                     (self.key, out_dist.comm, ddpr),
+                                     targets=self.targets)[0]
+        return DistArray.from_localarrays(key=out_key, distribution=out_dist,
+                                          dtype=self.dtype)
+
+    def ravel(self):
+        """Return the flattened (C order) array, block-distributed."""
+        return self.reshape(self.global_size)
+
+    def _in_rank_order(self):
+        """Whether the engines hold consecutive runs of the flattened array,
+        in rank order.  Internal.
+        """
+        grid_shape = self.distribution.grid_shape
+        return (all(n == 1 for n in grid_shape[1:]) and
+                (grid_shape[0] == 1 or self.distribution.dist[0] == 'b'))
+
+    def _from_compacted(self, results):
+        """Make DistArrays from the results of compacting on the engines.
+        Internal.
+
+        Every engine's result holds the keys and dtypes of its LocalArrays
+        and their local size.
+        """
+        bounds = [0]
+        for (_, _, size) in results:
+            bounds.append(bounds[-1] + size)
+        distribution = Distribution(self.context, [{'dist_type': 'b',
+                                                    'bounds': bounds}],
+                                    targets=self.targets)
+        keys, dtypes, _ = results[0]
+        return [DistArray.from_localarrays(key, distribution=distribution,
+                                           dtype=dtype)
+                for (key, dtype) in zip(keys, dtypes)]
+
+    def compress(self, condition, balance=False):
+        """Return the elements where the boolean DistArray `condition` is
+        True, as ``self[condition]``.
+
+        Each engine compacts its own selection and an exclusive scan of the
+        selection sizes places it in the result.  Unless the engines hold
+        consecutive runs of the flattened array in rank order, both arrays
+        are first raveled.
+
+        Parameters
+        ----------
+        condition : DistArray
+            Of bools, with the same shape.
+        balance : bool, optional
+            If False, every engine keeps the elements it selected, so the
+            result is block-distributed with uneven blocks and no data
+            moves.  If True, the result is rebalanced into even blocks.
+
+        Returns
+        -------
+        DistArray
+            1-D and block-distributed, in C order.
+        """
+        if condition.dtype != np.bool_:
+            raise TypeError("condition must be a DistArray of bools.")
+        if condition.shape != self.shape:
+            raise IndexError("boolean index did not match indexed array")
+        arr = self
+        if not (self._in_rank_order() and
+                self.distribution.is_compatible(condition.distribution)):
+            arr, condition = self.ravel(), condition.ravel()
+            if not arr.distribution.is_compatible(condition.distribution):
+                msg = "condition must be distributed over the same targets."
+                raise ValueError(msg)
+
+        def _local_compress(larr, mask, out_comm, balance):
+            import distarray.local.localarray as la
+            res = la.local_compress(larr, mask, out_comm, balance)
+            return [proxyize(res)], [res.dtype], res.local_shape[0]  # noqa
+
+        results = self.context.apply(_local_compress,
+                                     (arr.key, condition.key,
+                                      arr.distribution.comm, balance),
+                                     targets=arr.targets)
+        return arr._from_compacted(results)[0]
+
+    def nonzero(self, balance=False):
+        """Return the global indices of the nonzero elements, one DistArray
+        per dimension, as `numpy.nonzero`.
+
+        See `compress` for how the indices are compacted and for `balance`.
+
+        Returns
+        -------
+        tuple of DistArrays
+            1-D and block-distributed.
+        """
+        arr, shape = self, None
+        if not self._in_rank_order():
+            arr, shape = self.ravel(), self.shape
+
+        def _local_nonzero(mask, out_comm, balance, shape):
+            import distarray.local.localarray as la
+            res = la.local_nonzero(mask, out_comm, balance, shape)
+            return ([proxyize(r) for r in res], [r.dtype for r in res],  # noqa
+                    res[0].local_shape[0])
+
+        results = self.context.apply(_local_nonzero,
+                                     (arr.key, arr.distribution.comm,
+                                      balance, shape),
+                                     targets=arr.targets)
+        return tuple(arr._from_compacted(results))
+
+    def _check_index_array(self, indices):
+        """Validate a DistArray of flat indices into this array.  Internal.
+        """
+        if indices.dtype.kind not in 'iu':
+            raise TypeError("indices must be a DistArray of ints.")
+        if indices.targets != self.targets:
+            msg = "indices must be distributed over the same targets."
+            raise ValueError(msg)
+
+    def _group_by_owner(self, indices):
+        """Group index tuples by the target that owns them.  Internal.
+
+        `indices` has shape ``(K, ndim)``, or ``(K,)`` for 1-D arrays.
+        Returns K and, for every target involved, the target, the positions
+        of its indices in `indices` and their local indices there, as an
+        array of shape ``(ndim, k)``.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if self.ndim == 1 and indices.ndim == 1:
+            indices = indices[:, np.newaxis]
+        if indices.ndim != 2 or indices.shape[1] != self.ndim:
+            msg = "indices must have shape (K, %d)." % self.ndim
+            raise IndexError(msg)
+        indices = np.where(indices < 0, indices + np.array(self.shape),
+                           indices)
+        ranks, local = owning_ranks_and_local_indices(
+            self.distribution.get_dim_data_per_rank(), indices.T)
+        local = np.array(local, dtype=np.int64).reshape(self.ndim, -1)
+        groups = []
+        for rank in np.unique(ranks):
+            positions = np.flatnonzero(ranks == rank)
+            groups.append((self.targets[rank], positions,
+                           local[:, positions]))
+        return len(indices), groups
+
+    def take(self, indices):
+        """Return the elements at the given global indices.
+
+        `indices` is either a DistArray of ints indexing the flattened
+        array, as `numpy.take`, or a client-side array of K index tuples.
+
+        With a DistArray, every engine sends the indices it holds to the
+        engines that own them in one all-to-all exchange, and the owners
+        answer in a second one.  With index tuples, the client groups them
+        by owning engine and sends one request to each engine involved, all
+        in a single round trip.
+
+        Parameters
+        ----------
+        indices : DistArray or array_like
+            A DistArray of ints on the same targets, or an array of shape
+            ``(K, ndim)``, or ``(K,)`` for 1-D arrays.
+
+        Returns
+        -------
+        DistArray or ndarray
+            Distributed like `indices`, or the K elements, in order.
+        """
+        if not isinstance(indices, DistArray):
+            return self._take_tuples(indices)
+
+        self._check_index_array(indices)
+        ddpr = self.distribution.get_dim_data_per_rank()
+
+        def _local_take(larr, ddpr, comm, indices):
+            import distarray.local.localarray as la
+            res = la.local_take(larr, ddpr, comm, indices)
+            return proxyize(res)  # noqa
+
+        out_key = self.context.apply(_local_take,
+                                     (self.key, ddpr,
+                                      self.distribution.comm, indices.key),
+                                     targets=self.targets)[0]
+        return DistArray.from_localarrays(key=out_key,
+                                          distribution=indices.distribution,
+                                          dtype=self.dtype)
+
+    def _take_tuples(self, indices):
+        """`take` with client-side index tuples.  Internal."""
+        count, groups = self._group_by_owner(indices)
+
+        def _local_take_tuples(larr, local):
+            return larr.ndarray[tuple(local)]
+
+        pending = [self.context.apply(_local_take_tuples, (self.key, local),
+                                      targets=[target], block=False)
+                   for (target, _, local) in groups]
+        result = np.empty(count, dtype=self.dtype)
+        for ((_, positions, _), answer) in zip(groups, pending):
+            result[positions] = answer.get()[0]
+        return result
+
+    def put(self, indices, values, ufunc=None):
+        """Set the elements at the given global indices.
+
+        See `take` for the forms of `indices` and how they are sent to the
+        engines.
+
+        Parameters
+        ----------
+        indices : DistArray or array_like
+            A DistArray of ints on the same targets, indexing the flattened
+            array as `numpy.put`, or an array of K index tuples.
+        values : DistArray, array_like or scalar
+            With DistArray `indices`, a DistArray distributed like them or
+            a scalar; otherwise K values or a scalar.
+        ufunc : NumPy ufunc, optional
+            If given, combine the values into the array with ``ufunc.at``,
+            so that repeated indices accumulate, e.g. ``numpy.add``.
+            Otherwise, which value is stored for a repeated index is
+            unspecified.
+        """
+        if not isinstance(indices, DistArray):
+            return self._put_tuples(indices, values, ufunc)
+
+        self._check_index_array(indices)
+        values_arg = values
+        if isinstance(values, DistArray):
+            if not values.distribution.is_compatible(indices.distribution):
+                msg = "values must be distributed like indices."
+                raise ValueError(msg)
+            values_arg = values.key
+        ddpr = self.distribution.get_dim_data_per_rank()
+
+        def _local_put(larr, ddpr, comm, indices, values, ufunc):
+            import distarray.local.localarray as la
+            la.local_put(larr, ddpr, comm, indices, values, ufunc)
+
+        self.context.apply(_local_put,
+                           (self.key, ddpr, self.distribution.comm,
+                            indices.key, values_arg, ufunc),
+                           targets=self.targets)
+
+    def _put_tuples(self, indices, values, ufunc):
+        """`put` with client-side index tuples.  Internal."""
+        count, groups = self._group_by_owner(indices)
+        values = np.broadcast_to(np.asarray(values, dtype=self.dtype),
+                                 (count,))
+
+        def _local_put_tuples(larr, local, values, ufunc):
+            if ufunc is None:
+                larr.ndarray[tuple(local)] = values
+            else:
+                ufunc.at(larr.ndarray, tuple(local), values)
+
+        pending = [self.context.apply(_local_put_tuples,
+                                      (self.key, local, values[positions],
+                                       ufunc),
+                                      targets=[target], block=False)
+                   for (target, positions, local) in groups]
+        for answer in pending:
+            answer.get()
+
     def get_ndarrays(self):
         """Pull the local ndarrays from the engines.
 
@@ -411,6 +1026,9 @@ class DistArray(object):
     def __xor__(self, other, *args, **kwargs):
         return self._binary_op_from_ufunc(other, distarray.dist.bitwise_xor, '__rxor__', *args, **kwargs)
 
+    def __matmul__(self, other):
+        return distarray.dist.dot(self, other)
+
     # Binary - right versions
 
     def __radd__(self, other, *args, **kwargs):
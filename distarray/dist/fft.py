@@ -0,0 +1,156 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Emulate numpy.fft for block-distributed DistArrays.
+
+Every process only ever transforms dimensions that it holds whole; the
+distributed dimensions are made whole one after the other by global
+transposes (slab decomposition with one distributed dimension, pencil
+decomposition with two).  Each transpose moves the distribution onto a
+neighbouring dimension, so by default the result is returned in this
+*transposed layout*, e.g. a ``('b', 'n')`` array gives a ``('n', 'b')``
+result.  Transforming a result in the transposed layout moves the
+distribution back, so ``ifftn(fftn(a))`` is distributed like `a`.
+"""
+
+from __future__ import absolute_import
+
+from distarray.dist.distarray import DistArray
+from distarray.dist.maps import Distribution
+from distarray.dist.functions import _block_bounds, _check_block
+from distarray.metadata_utils import _start_stop_block
+
+
+__all__ = ['fftn', 'ifftn', 'rfftn']
+
+
+def _plan(distribution, shape, transposed):
+    """The global transposes that make every distributed dimension whole,
+    the transposes that restore the original layout unless `transposed`,
+    and the global dim data of the result, for a result of `shape`."""
+    grid_shape = distribution.grid_shape
+    split = [axis for (axis, n) in enumerate(grid_shape) if n > 1]
+    if len(split) == len(grid_shape):
+        msg = ("fftn requires at least one undistributed dimension "
+               "(given a process grid of %r).")
+        raise ValueError(msg % (grid_shape,))
+    if split and split != list(range(split[0], split[-1] + 1)):
+        msg = ("fftn requires the distributed dimensions to be adjacent "
+               "(given a process grid of %r).")
+        raise ValueError(msg % (grid_shape,))
+
+    bounds = []
+    for (axis, dist_map) in enumerate(distribution.maps):
+        if axis in split:
+            bounds.append(_block_bounds(dist_map))
+        else:
+            bounds.append([(0, shape[axis])])
+    original = list(bounds)
+
+    # Move the distribution onto the next dimension if it is whole, onto
+    # the previous one otherwise.
+    if split and split[-1] + 1 < len(shape):
+        order, step = reversed(split), 1
+    else:
+        order, step = split, -1
+    transposes = []
+    for src in order:
+        dst = src + step
+        dst_bounds = [_start_stop_block(shape[dst], grid_shape[src], rank)
+                      for rank in range(grid_shape[src])]
+        transposes.append((src, src, dst, bounds[src], dst_bounds))
+        bounds[src], bounds[dst] = [(0, shape[src])], dst_bounds
+
+    untransposes = []
+    if not transposed:
+        untransposes = [(grid_dim, dst, src, dst_bounds, src_bounds)
+                        for (grid_dim, src, dst, src_bounds, dst_bounds)
+                        in reversed(transposes)]
+        bounds = original
+
+    global_dim_data = []
+    for (size, axis_bounds) in zip(shape, bounds):
+        if len(axis_bounds) > 1:
+            global_dim_data.append(
+                {'dist_type': 'b',
+                 'bounds': [0] + [stop for (_, stop) in axis_bounds]})
+        else:
+            global_dim_data.append({'dist_type': 'n', 'size': size})
+    return transposes, untransposes, global_dim_data
+
+
+def _fftn(a, kind, transposed, norm):
+    _check_block(a)
+    shape = list(a.shape)
+    if kind == 'rfft':
+        if a.distribution.grid_shape[-1] > 1:
+            msg = "rfftn requires an undistributed last dimension."
+            raise ValueError(msg)
+        shape[-1] = shape[-1] // 2 + 1
+    transposes, untransposes, global_dim_data = _plan(a.distribution, shape,
+                                                      transposed)
+    out_dist = Distribution(a.context, global_dim_data, targets=a.targets)
+    ddpr = out_dist.get_dim_data_per_rank()
+
+    def _local_fftn(larr, transposes, untransposes, out_comm, ddpr, kind,
+                    norm):
+        import distarray.local.fft
+        res = distarray.local.fft.fftn(larr, transposes, untransposes,
+                                       out_comm, ddpr, kind, norm)
+        return proxyize(res), res.dtype  # noqa
+
+    res = a.context.apply(_local_fftn,
+                          (a.key, transposes, untransposes, out_dist.comm,
+                           ddpr, kind, norm),
+                          targets=a.targets)
+    return DistArray.from_localarrays(res[0][0], distribution=out_dist,
+                                      dtype=res[0][1])
+
+
+def fftn(a, transposed=True, norm=None):
+    """N-dimensional discrete Fourier transform, as `numpy.fft.fftn`.
+
+    Parameters
+    ----------
+    a : DistArray
+        Block-distributed, with at least one undistributed dimension and the
+        distributed dimensions adjacent, e.g. ``('b', 'n')`` (slabs) or
+        ``('b', 'b', 'n')`` (pencils).
+    transposed : bool, optional
+        Return the result in the transposed layout (the default), which
+        saves the global transposes back to the layout of `a`.
+    norm : {None, 'ortho'}, optional
+        As for `numpy.fft.fftn`.
+
+    Returns
+    -------
+    DistArray
+        Complex, with the shape of `a`.
+    """
+    return _fftn(a, 'fft', transposed, norm)
+
+
+def ifftn(a, transposed=True, norm=None):
+    """N-dimensional inverse discrete Fourier transform, as
+    `numpy.fft.ifftn`.
+
+    See `fftn` for the parameters; for a result of `fftn` in the transposed
+    layout, the result of `ifftn` in the transposed layout is distributed
+    like the input of `fftn`.
+    """
+    return _fftn(a, 'ifft', transposed, norm)
+
+
+def rfftn(a, transposed=True, norm=None):
+    """N-dimensional discrete Fourier transform of real input, as
+    `numpy.fft.rfftn`.
+
+    The last dimension of `a` must be undistributed; it is transformed
+    first and has ``n // 2 + 1`` elements in the result.  See `fftn` for
+    the parameters.
+    """
+    return _fftn(a, 'rfft', transposed, norm)
@@ -14,6 +14,8 @@ import numpy
 
 from distarray.error import ContextError
 from distarray.dist.distarray import DistArray
+from distarray.dist.maps import Distribution
+from distarray.metadata_utils import _start_stop_block, dim_data_bounds
 
 
 __all__ = []  # unary_names and binary_names added to __all__ below.
@@ -34,6 +36,11 @@ binary_names = ('add', 'arctan2', 'bitwise_and', 'bitwise_or', 'bitwise_xor',
 for func_name in unary_names + binary_names:
     __all__.append(func_name)
 
+__all__ += ['sort', 'argsort', 'dot', 'apply_stencil', 'convolve',
+            'laplacian', 'gradient', 'diff', 'concatenate', 'stack',
+            'histogram', 'bincount', 'digitize', 'unique', 'value_counts',
+            'cov', 'corrcoef']
+
 
 def unary_proxy(name):
     def proxy_func(a, *args, **kwargs):
@@ -115,6 +122,821 @@ def determine_context(*args):
 
     return contexts[0]
 
+
+def _sample_sort(a, return_indices):
+    """Sort `a` along axis 0 with a parallel sample sort."""
+    if a.ndim not in (1, 2):
+        raise ValueError("Only 1-D and 2-D DistArrays can be sorted.")
+    if a.ndim == 2 and a.distribution.grid_shape[1] != 1:
+        msg = "2-D DistArrays must not be distributed along axis 1."
+        raise ValueError(msg)
+
+    dist = ('b', 'n')[:a.ndim]
+    out_dist = Distribution.from_shape(a.context, a.shape, dist,
+                                       targets=a.targets)
+    ddpr = out_dist.get_dim_data_per_rank()
+
+    def _local_sort(larr, out_comm, ddpr, return_indices):
+        import distarray.local.localarray as la
+        res = la.local_sort(larr, out_comm, ddpr, return_indices)
+        return proxyize(res), res.dtype  # noqa
+
+    res = a.context.apply(_local_sort,
+                          (a.key, out_dist.comm, ddpr, return_indices),
+                          targets=a.targets)
+    return DistArray.from_localarrays(res[0][0], distribution=out_dist,
+                                      dtype=res[0][1])
+
+
+def sort(a):
+    """Return a sorted copy of a DistArray.
+
+    1-D DistArrays are sorted entirely; 2-D DistArrays, which must not be
+    distributed along axis 1, are sorted along axis 0.  Uses a parallel
+    sample sort, so no engine ever holds more than a few local sections.
+
+    Returns
+    -------
+    DistArray
+        Block-distributed along axis 0 over the targets of `a`.
+    """
+    return _sample_sort(a, return_indices=False)
+
+
+def argsort(a):
+    """Return the global indices that would sort a DistArray.
+
+    See `sort` for the supported DistArrays.  Ties are ordered by index, as
+    with ``numpy.argsort(a, axis=0, kind='mergesort')``.
+
+    Returns
+    -------
+    DistArray of int64
+        Block-distributed along axis 0 over the targets of `a`.
+    """
+    return _sample_sort(a, return_indices=True)
+
+
+def _block_bounds(dist_map):
+    """The (start, stop) bounds of a block or undistributed map."""
+    if dist_map.dist == 'n':
+        return [(0, dist_map.size)]
+    return list(dist_map.bounds)
+
+
+def _check_block(*arrays):
+    for arr in arrays:
+        if any(d not in ('b', 'n') for d in arr.distribution.dist):
+            msg = "Only block-distributed DistArrays are supported (given %r)."
+            raise ValueError(msg % (arr.distribution.dist,))
+
+
+def _summa_panels(a_bounds, b_bounds):
+    """Split the inner dimension into panels owned by a single process
+    column of `a` and a single process row of `b`."""
+    edges = sorted(set(e for bounds in (a_bounds, b_bounds)
+                       for bound in bounds for e in bound))
+    panels = []
+    for start, stop in zip(edges[:-1], edges[1:]):
+        a_owner = next(i for (i, (lo, hi)) in enumerate(a_bounds)
+                       if lo <= start < hi)
+        b_owner = next(i for (i, (lo, hi)) in enumerate(b_bounds)
+                       if lo <= start < hi)
+        panels.append((start, stop, a_owner, b_owner))
+    return panels
+
+
+def _summa(a, b, dtype):
+    if a.distribution.grid_shape != b.distribution.grid_shape:
+        msg = "dot requires DistArrays on the same process grid."
+        raise ValueError(msg)
+    a_bounds = _block_bounds(a.distribution[1])
+    b_bounds = _block_bounds(b.distribution[0])
+    panels = _summa_panels(a_bounds, b_bounds)
+
+    row_bounds = _block_bounds(a.distribution[0])
+    col_bounds = _block_bounds(b.distribution[1])
+    global_dim_data = (
+        {'dist_type': 'b', 'bounds': [0] + [hi for (lo, hi) in row_bounds]},
+        {'dist_type': 'b', 'bounds': [0] + [hi for (lo, hi) in col_bounds]},
+    )
+    out_dist = Distribution(a.context, global_dim_data, targets=a.targets)
+    ddpr = out_dist.get_dim_data_per_rank()
+
+    def _local_summa(a, b, out_comm, ddpr, panels, dtype):
+        import distarray.local.localarray as la
+        return proxyize(la.local_summa(a, b, out_comm, ddpr,  # noqa
+                                       panels, dtype))
+
+    out_key = a.context.apply(_local_summa,
+                              (a.key, b.key, out_dist.comm, ddpr, panels,
+                               dtype),
+                              targets=a.targets)[0]
+    return DistArray.from_localarrays(out_key, distribution=out_dist,
+                                      dtype=dtype)
+
+
+def _matvec(mat, vec, dtype, vec_first):
+    axis = 0 if vec_first else 1
+    out_dist = mat.distribution.reduce(axes=(axis,))
+    ddpr = out_dist.get_dim_data_per_rank()
+    # The range of the inner dimension on each rank, unless the vector
+    # already lines up with it.
+    bounds = [dim_data_bounds(dim_data)[axis]
+              for dim_data in mat.distribution.get_dim_data_per_rank()]
+    aligned = all(dim_data[0]['dist_type'] in ('b', 'n') and
+                  dim_data_bounds(dim_data)[0] == bound
+                  for (dim_data, bound) in
+                  zip(vec.distribution.get_dim_data_per_rank(), bounds))
+
+    def _local_matvec(mat, vec, out_comm, ddpr, dtype, bounds, vec_first):
+        import distarray.local.localarray as la
+        res = la.local_matvec(mat, vec, out_comm, ddpr, dtype, bounds,
+                              vec_first)
+        return None if res is None else proxyize(res)  # noqa
+
+    res = mat.context.apply(_local_matvec,
+                            (mat.key, vec.key, out_dist.comm, ddpr, dtype,
+                             None if aligned else bounds, vec_first),
+                            targets=mat.targets)
+    out_key = next(key for key in res if key is not None)
+    return DistArray.from_localarrays(out_key, distribution=out_dist,
+                                      dtype=dtype)
+
+
+def _inner(a, b, dtype):
+    if not a.distribution.is_compatible(b.distribution):
+        raise ValueError("distributions not compatible.")
+    out_dist = a.distribution.reduce(axes=None)
+    ddpr = out_dist.get_dim_data_per_rank()
+
+    def _local_inner(a, b, out_comm, ddpr, dtype):
+        import distarray.local.localarray as la
+        res = la.local_inner(a, b, out_comm, ddpr, dtype)
+        return None if res is None else proxyize(res)  # noqa
+
+    res = a.context.apply(_local_inner,
+                          (a.key, b.key, out_dist.comm, ddpr, dtype),
+                          targets=a.targets)
+    out_key = next(key for key in res if key is not None)
+    return DistArray.from_localarrays(out_key, distribution=out_dist,
+                                      dtype=dtype)
+
+
+def dot(a, b):
+    """Dot product of two DistArrays.
+
+    * 2-D by 2-D: matrix multiplication with the SUMMA algorithm.  Both
+      arrays must be block-distributed on the same process grid; panels of
+      `a` and `b` are broadcast along the rows and columns of the grid and
+      multiplied locally with ``numpy.dot``.
+    * 2-D by 1-D, or 1-D by 2-D: matrix-vector product.  The matrix must be
+      block-distributed; each engine receives only the piece of the vector
+      matching its block (nothing, if the vector is distributed like the
+      inner dimension), and the partial products are summed with a single
+      reduction.
+    * 1-D by 1-D: inner product of two identically distributed vectors,
+      summed with a single reduction.
+
+    Both arrays must be on the same targets.
+
+    Returns
+    -------
+    DistArray
+    """
+    determine_context(a, b)
+    if a.shape[-1] != b.shape[0]:
+        msg = "shapes %r and %r not aligned."
+        raise ValueError(msg % (a.shape, b.shape))
+    if a.targets != b.targets:
+        raise ValueError("dot requires DistArrays on the same targets.")
+    dtype = numpy.result_type(a.dtype, b.dtype)
+
+    if a.ndim == 1 and b.ndim == 1:
+        return _inner(a, b, dtype)
+    elif a.ndim == 2 and b.ndim == 2:
+        _check_block(a, b)
+        return _summa(a, b, dtype)
+    elif a.ndim == 2 and b.ndim == 1:
+        _check_block(a)
+        return _matvec(a, b, dtype, vec_first=False)
+    elif a.ndim == 1 and b.ndim == 2:
+        _check_block(b)
+        return _matvec(b, a, dtype, vec_first=True)
+    else:
+        msg = "dot is only supported for 1-D and 2-D DistArrays."
+        raise ValueError(msg)
+
+
+def _per_axis(value, ndim):
+    if numpy.isscalar(value):
+        return (value,) * ndim
+    if len(value) != ndim:
+        msg = "Expected a scalar or %d values (given %r)."
+        raise ValueError(msg % (ndim, value))
+    return tuple(value)
+
+
+def _stencil_call(a, func_name, *args):
+    """Call `distarray.local.stencil.<func_name>(larr, *args)` on the
+    engines; the result is distributed like `a`."""
+    _check_block(a)
+
+    def _local_stencil(func_name, larr, args):
+        import distarray.local.stencil as stencil
+        res = getattr(stencil, func_name)(larr, *args)
+        return proxyize(res), res.dtype  # noqa
+
+    res = a.context.apply(_local_stencil, (func_name, a.key, args),
+                          targets=a.targets)
+    return DistArray.from_localarrays(res[0][0], distribution=a.distribution,
+                                      dtype=res[0][1])
+
+
+def apply_stencil(a, weights, periodic=False, cval=0.0):
+    """Apply a stencil to every element of a block-distributed DistArray.
+
+    ``out[i] = sum(weights[k] * a[i + k - c])``, where ``c`` is the centre
+    of `weights`.  Neighbouring values are exchanged through ghost cells
+    while the interior of each local section is computed.
+
+    Parameters
+    ----------
+    a : DistArray
+        Every dimension must be block-distributed or undistributed.
+    weights : array_like
+        Same number of dimensions as `a`, with an odd length along each.
+    periodic : bool or sequence of bools, optional
+        Whether each dimension wraps around.
+    cval : scalar, optional
+        Value of the elements beyond a non-periodic boundary.
+
+    Returns
+    -------
+    DistArray
+        Distributed like `a`.
+    """
+    weights = numpy.asarray(weights)
+    if weights.ndim != a.ndim:
+        msg = "weights must have %d dimensions (given %d)."
+        raise ValueError(msg % (a.ndim, weights.ndim))
+    if any(n % 2 == 0 for n in weights.shape):
+        msg = "weights must have an odd length along every dimension."
+        raise ValueError(msg)
+    return _stencil_call(a, 'apply_stencil', weights, periodic, cval)
+
+
+def convolve(a, kernel, periodic=False, cval=0.0):
+    """Convolve a DistArray with `kernel`, keeping the shape of `a`.
+
+    Like `apply_stencil` with `kernel` flipped along every dimension.
+    """
+    kernel = numpy.asarray(kernel)
+    flipped = kernel[(slice(None, None, -1),) * kernel.ndim]
+    return apply_stencil(a, flipped, periodic, cval)
+
+
+def laplacian(a, spacing=1.0, periodic=False, cval=0.0):
+    """The discrete Laplacian of a DistArray, with the (2*ndim + 1)-point
+    stencil.
+
+    Parameters
+    ----------
+    spacing : scalar or sequence of scalars, optional
+        The grid spacing, for every dimension or per dimension.
+
+    See `apply_stencil` for the other parameters.
+    """
+    spacing = _per_axis(spacing, a.ndim)
+    weights = numpy.zeros((3,) * a.ndim)
+    center = (1,) * a.ndim
+    for axis, h in enumerate(spacing):
+        for side in (0, 2):
+            index = list(center)
+            index[axis] = side
+            weights[tuple(index)] = 1.0 / h**2
+        weights[center] -= 2.0 / h**2
+    return apply_stencil(a, weights, periodic, cval)
+
+
+def gradient(a, spacing=1.0, periodic=False):
+    """The gradient of a DistArray, as in `numpy.gradient`.
+
+    Central differences are used in the interior and one-sided differences
+    at non-periodic boundaries.
+
+    Returns
+    -------
+    DistArray or list of DistArray
+        One DistArray per dimension, or a single DistArray for 1-D arrays.
+    """
+    spacing = _per_axis(spacing, a.ndim)
+    result = [_stencil_call(a, 'gradient', axis, h, periodic)
+              for (axis, h) in enumerate(spacing)]
+    return result[0] if a.ndim == 1 else result
+
+
+def diff(a, n=1, axis=-1):
+    """The n-th discrete difference of a DistArray along `axis`, as in
+    `numpy.diff`.
+
+    The result is block-distributed like `a`, without the last element
+    along `axis`.
+    """
+    axis = axis % a.ndim
+    for _ in range(n):
+        _check_block(a)
+        global_dim_data = []
+        for (i, dist_map) in enumerate(a.distribution.maps):
+            bounds = [0] + [stop for (_, stop) in _block_bounds(dist_map)]
+            if i == axis:
+                bounds = [min(b, dist_map.size - 1) for b in bounds]
+            global_dim_data.append({'dist_type': 'b', 'bounds': bounds})
+        out_dist = Distribution(a.context, global_dim_data, targets=a.targets)
+        ddpr = out_dist.get_dim_data_per_rank()
+
+        def _local_diff(larr, axis, out_comm, ddpr):
+            import distarray.local.stencil as stencil
+            res = stencil.diff(larr, axis, out_comm, ddpr)
+            return proxyize(res), res.dtype  # noqa
+
+        res = a.context.apply(_local_diff, (a.key, axis, out_dist.comm, ddpr),
+                              targets=a.targets)
+        a = DistArray.from_localarrays(res[0][0], distribution=out_dist,
+                                       dtype=res[0][1])
+    return a
+
+
+def _concatenate_in_place(arrays, axis, targets, offsets):
+    """Concatenate DistArrays on disjoint targets by reusing their local
+    sections as the blocks of the result, if their layouts allow it.
+
+    Returns None if they do not: the inputs must share the dtype and the
+    maps of every other dimension, have no ghost cells, and each input's
+    blocks must land on its own targets in the process grid of the result.
+    """
+    a0 = arrays[0]
+    if sum(len(a.targets) for a in arrays) != len(targets):
+        return None
+    for a in arrays:
+        if a.dtype != a0.dtype:
+            return None
+        for (i, (m, m0)) in enumerate(zip(a.distribution.maps,
+                                          a0.distribution.maps)):
+            if getattr(m, 'comm_padding', 0) or \
+                    getattr(m, 'boundary_padding', 0):
+                return None
+            if i != axis and not m.is_compatible(m0):
+                return None
+
+    grid_shape = list(a0.grid_shape)
+    grid_shape[axis] = sum(a.grid_shape[axis] for a in arrays)
+    out_ddpr = [None] * len(targets)
+    keys = [None] * len(targets)
+    grid_offset = 0
+    for (a, offset) in zip(arrays, offsets):
+        ddpr = a.distribution.get_dim_data_per_rank()
+        for (rank, dim_data) in enumerate(ddpr):
+            dim_data = [dict(dd) for dd in dim_data]
+            coords = [dd['proc_grid_rank'] for dd in dim_data]
+            coords[axis] += grid_offset
+            out_rank = int(numpy.ravel_multi_index(coords, grid_shape))
+            if targets[out_rank] != a.targets[rank]:
+                return None
+            start, stop = dim_data_bounds(dim_data)[axis]
+            dim_data[axis] = {'dist_type': 'b',
+                              'size': offsets[-1],
+                              'proc_grid_size': grid_shape[axis],
+                              'proc_grid_rank': coords[axis],
+                              'start': start + offset,
+                              'stop': stop + offset}
+            out_ddpr[out_rank] = tuple(dim_data)
+            keys[out_rank] = a.key
+        grid_offset += a.grid_shape[axis]
+
+    context = a0.context
+    out_dist = Distribution.from_dim_data_per_rank(context, out_ddpr,
+                                                   targets=targets)
+
+    def _local_reuse(keys, out_comm, ddpr):
+        from distarray.utils import get_from_dotted_name
+        import distarray.local.localarray as la
+        rank = out_comm.Get_rank()
+        larr = get_from_dotted_name(keys[rank])
+        distribution = la.maps.Distribution(comm=out_comm,
+                                            dim_data=ddpr[rank])
+        res = la.LocalArray(distribution, dtype=larr.dtype, buf=larr.ndarray)
+        return proxyize(res)  # noqa
+
+    out_key = context.apply(_local_reuse, (keys, out_dist.comm, out_ddpr),
+                            targets=targets)[0]
+    return DistArray.from_localarrays(out_key, distribution=out_dist,
+                                      dtype=a0.dtype)
+
+
+def concatenate(arrays, axis=0):
+    """Join a sequence of block-distributed DistArrays along an existing
+    axis, as `numpy.concatenate`.
+
+    No data moves between engines when
+
+    * the inputs are on the same targets, share the layout of the other
+      dimensions, and are not distributed along `axis`: every engine joins
+      its own sections; or
+    * the inputs are on disjoint targets, e.g. a growing array and a new
+      batch, and their blocks can be appended as new blocks along `axis`:
+      the local sections of the inputs become those of the result, which
+      then shares memory with the inputs.
+
+    Otherwise the result is block-distributed over all the targets of the
+    inputs and every engine receives only the parts of the inputs that fall
+    into its section.
+    """
+    arrays = list(arrays)
+    if not arrays:
+        raise ValueError("need at least one array to concatenate")
+    context = determine_context(*arrays)
+    _check_block(*arrays)
+    a0 = arrays[0]
+    if any(a.ndim != a0.ndim for a in arrays):
+        msg = "all the input arrays must have the same number of dimensions"
+        raise ValueError(msg)
+    if not -a0.ndim <= axis < a0.ndim:
+        msg = "axis %d is out of bounds for array of dimension %d"
+        raise ValueError(msg % (axis, a0.ndim))
+    axis = axis % a0.ndim
+    for a in arrays:
+        if any(n != n0 for (i, (n, n0)) in enumerate(zip(a.shape, a0.shape))
+               if i != axis):
+            msg = ("all the input array dimensions except for the "
+                   "concatenation axis must match exactly")
+            raise ValueError(msg)
+
+    dtype = numpy.result_type(*[a.dtype for a in arrays])
+    offsets = [0]
+    for a in arrays:
+        offsets.append(offsets[-1] + a.shape[axis])
+    shape = list(a0.shape)
+    shape[axis] = offsets[-1]
+    targets = sorted(set(t for a in arrays for t in a.targets))
+
+    result = _concatenate_in_place(arrays, axis, targets, offsets)
+    if result is not None:
+        return result
+
+    same_layout = all(a.targets == a0.targets and
+                      a.grid_shape == a0.grid_shape and
+                      all(m.is_compatible(m0) for (i, (m, m0)) in
+                          enumerate(zip(a.distribution.maps,
+                                        a0.distribution.maps))
+                          if i != axis)
+                      for a in arrays)
+    if same_layout:
+        global_dim_data = []
+        for (i, (size, dist_map)) in enumerate(zip(shape,
+                                                   a0.distribution.maps)):
+            if dist_map.grid_size == 1:
+                global_dim_data.append({'dist_type': 'n', 'size': size})
+                continue
+            if i == axis:
+                bounds = [_start_stop_block(size, dist_map.grid_size, r)[1]
+                          for r in range(dist_map.grid_size)]
+            else:
+                bounds = [stop for (_, stop) in _block_bounds(dist_map)]
+            global_dim_data.append({'dist_type': 'b', 'bounds': [0] + bounds})
+        out_dist = Distribution(context, global_dim_data, targets=targets)
+    else:
+        out_dist = Distribution.from_shape(context, tuple(shape), a0.dist,
+                                           targets=targets)
+    ddpr = out_dist.get_dim_data_per_rank()
+
+    blocks = []
+    for (a, offset) in zip(arrays, offsets):
+        a_ddpr = a.distribution.get_dim_data_per_rank()
+        for (rank, dim_data) in enumerate(a_ddpr):
+            bounds = dim_data_bounds(dim_data)
+            start, stop = bounds[axis]
+            bounds[axis] = (start + offset, stop + offset)
+            blocks.append((targets.index(a.targets[rank]), a.key, bounds))
+
+    def _local_assemble(blocks, out_comm, ddpr, dtype):
+        import distarray.local.localarray as la
+        return proxyize(la.local_assemble(blocks, out_comm, ddpr,  # noqa
+                                          dtype))
+
+    out_key = context.apply(_local_assemble,
+                            (blocks, out_dist.comm, ddpr, dtype),
+                            targets=targets)[0]
+    return DistArray.from_localarrays(out_key, distribution=out_dist,
+                                      dtype=dtype)
+
+
+def _expand_dims(a, axis):
+    """Insert an undistributed dimension of length one into `a` at `axis`,
+    without copying."""
+    new_dim = {'dist_type': 'n', 'size': 1, 'proc_grid_size': 1,
+               'proc_grid_rank': 0}
+    ddpr = []
+    for dim_data in a.distribution.get_dim_data_per_rank():
+        dim_data = [dict(dd) for dd in dim_data]
+        dim_data.insert(axis, dict(new_dim))
+        ddpr.append(tuple(dim_data))
+    out_dist = Distribution.from_dim_data_per_rank(a.context, ddpr,
+                                                   targets=a.targets)
+
+    def _local_expand_dims(larr, axis, out_comm, ddpr):
+        import numpy
+        import distarray.local.localarray as la
+        distribution = la.maps.Distribution(
+            comm=out_comm, dim_data=ddpr[out_comm.Get_rank()])
+        res = la.LocalArray(distribution, dtype=larr.dtype,
+                            buf=numpy.expand_dims(larr.ndarray, axis))
+        return proxyize(res)  # noqa
+
+    out_key = a.context.apply(_local_expand_dims,
+                              (a.key, axis, out_dist.comm, ddpr),
+                              targets=a.targets)[0]
+    return DistArray.from_localarrays(out_key, distribution=out_dist,
+                                      dtype=a.dtype)
+
+
+def stack(arrays, axis=0):
+    """Join a sequence of block-distributed DistArrays of the same shape
+    along a new axis, as `numpy.stack`.
+
+    See `concatenate`; the new axis is undistributed in every input.
+    """
+    arrays = list(arrays)
+    if not arrays:
+        raise ValueError("need at least one array to stack")
+    if any(a.shape != arrays[0].shape for a in arrays):
+        raise ValueError("all input arrays must have the same shape")
+    ndim = arrays[0].ndim + 1
+    if not -ndim <= axis < ndim:
+        msg = "axis %d is out of bounds for array of dimension %d"
+        raise ValueError(msg % (axis, ndim))
+    axis = axis % ndim
+    return concatenate([_expand_dims(a, axis) for a in arrays], axis)
+
+
+def _check_weights_like(a, weights):
+    if weights is not None and not a.distribution.is_compatible(
+            weights.distribution):
+        msg = "weights must be a DistArray distributed like the input."
+        raise ValueError(msg)
+
+
+def histogram(a, bins=10, range=None, weights=None, density=False):
+    """Compute the histogram of a DistArray, as `numpy.histogram`.
+
+    Every engine bins its own section and the counts are summed on the
+    engines, so only the histogram is sent to the client.  Without `range`,
+    the bin edges span the global minimum and maximum of `a`.
+
+    Parameters
+    ----------
+    a : DistArray
+    bins : int or sequence of scalars, optional
+        The number of equal-width bins, or the bin edges.
+    range : (float, float), optional
+    weights : DistArray, optional
+        Distributed like `a`.
+    density : bool, optional
+
+    Returns
+    -------
+    hist : ndarray
+    bin_edges : ndarray
+    """
+    if isinstance(bins, str):
+        raise ValueError("Bin estimators (%r) are not supported." % bins)
+    _check_weights_like(a, weights)
+    weights_key = None if weights is None else weights.key
+
+    def _local_histogram(larr, bins, range, weights):
+        import distarray.local.localarray as la
+        return la.local_histogram(larr, bins, range, weights)
+
+    results = a.context.apply(_local_histogram,
+                              (a.key, bins, range, weights_key),
+                              targets=a.targets)
+    hist, edges = next(r for r in results if r is not None)
+    if density:
+        hist = hist / numpy.diff(edges) / hist.sum()
+    return hist, edges
+
+
+def bincount(x, weights=None, minlength=0):
+    """Count the occurrences of each value in a 1-D DistArray of
+    non-negative ints, as `numpy.bincount`.
+
+    Every engine counts its own section and the counts are summed on the
+    engines, so only the result is sent to the client.
+
+    Returns
+    -------
+    ndarray
+    """
+    if x.ndim != 1:
+        raise ValueError("object too deep for desired array")
+    _check_weights_like(x, weights)
+    weights_key = None if weights is None else weights.key
+
+    def _local_bincount(larr, weights, minlength):
+        import distarray.local.localarray as la
+        return la.local_bincount(larr, weights, minlength)
+
+    results = x.context.apply(_local_bincount,
+                              (x.key, weights_key, minlength),
+                              targets=x.targets)
+    return next(r for r in results if r is not None)
+
+
+def digitize(a, bins, right=False):
+    """Return the indices of the bins to which each value of a DistArray
+    belongs, as `numpy.digitize`.
+
+    Returns
+    -------
+    DistArray
+        Distributed like `a`.
+    """
+    bins = numpy.asarray(bins)
+
+    def _local_digitize(larr, bins, right):
+        import numpy
+        import distarray.local.localarray as la
+        res = la.LocalArray(larr.distribution, buf=numpy.digitize(
+            larr.ndarray, bins, right))
+        return proxyize(res), res.dtype  # noqa
+
+    res = a.context.apply(_local_digitize, (a.key, bins, right),
+                          targets=a.targets)
+    return DistArray.from_localarrays(res[0][0], distribution=a.distribution,
+                                      dtype=res[0][1])
+
+
+# Results of `unique` with at most this many values are gathered to the
+# client by default.
+_UNIQUE_GATHER_SIZE = 2 ** 16
+
+
+def _unique_counts(a, gather):
+    """Return the unique values of `a` and their counts.  Internal.
+
+    See `unique` for the meaning of `gather`.  Gathered results are sorted
+    by value.
+    """
+    max_gather = {True: None, False: -1, None: _UNIQUE_GATHER_SIZE}[gather]
+
+    def _local_unique(larr, out_comm, max_gather):
+        import distarray.local.localarray as la
+        values, counts = la.local_unique(larr, out_comm)
+        size = values.global_shape[0]
+        if max_gather is None or size <= max_gather:
+            return values.ndarray, counts.ndarray
+        return (proxyize(values), proxyize(counts),  # noqa
+                values.dtype, values.local_shape[0])
+
+    results = a.context.apply(_local_unique,
+                              (a.key, a.distribution.comm, max_gather),
+                              targets=a.targets)
+    if len(results[0]) == 2:
+        values = numpy.concatenate([r[0] for r in results])
+        counts = numpy.concatenate([r[1] for r in results])
+        order = numpy.argsort(values, kind='mergesort')
+        return values[order], counts[order]
+
+    bounds = [0]
+    for result in results:
+        bounds.append(bounds[-1] + result[3])
+    distribution = Distribution(a.context, [{'dist_type': 'b',
+                                             'bounds': bounds}],
+                                targets=a.targets)
+    values_key, counts_key, dtype, _ = results[0]
+    values = DistArray.from_localarrays(values_key,
+                                        distribution=distribution,
+                                        dtype=dtype)
+    counts = DistArray.from_localarrays(counts_key,
+                                        distribution=distribution,
+                                        dtype=numpy.dtype(numpy.int64))
+    return values, counts
+
+
+def unique(a, return_counts=False, gather=None):
+    """Find the unique values of a DistArray, as `numpy.unique`.
+
+    Every engine finds the unique values of its own section, then the
+    (value, count) pairs are hash-partitioned across the engines with a
+    single all-to-all exchange, so each value is merged on exactly one
+    engine.
+
+    Parameters
+    ----------
+    a : DistArray
+    return_counts : bool, optional
+        If True, also return the number of times each value occurs.
+    gather : bool, optional
+        If True, return ndarrays sorted by value.  If False, return 1-D
+        block-distributed DistArrays, each engine holding the values it owns
+        in sorted order; the values are not sorted across engines.  By
+        default, the result is gathered when it is small.
+
+    Returns
+    -------
+    unique : ndarray or DistArray
+    unique_counts : ndarray or DistArray, optional
+    """
+    values, counts = _unique_counts(a, gather)
+    return (values, counts) if return_counts else values
+
+
+def value_counts(a, gather=None):
+    """Count the occurrences of each unique value of a DistArray.
+
+    Parameters
+    ----------
+    a : DistArray
+    gather : bool, optional
+        As for `unique`.  Gathered results are sorted by decreasing count,
+        ties by value.
+
+    Returns
+    -------
+    values : ndarray or DistArray
+    counts : ndarray or DistArray
+    """
+    values, counts = _unique_counts(a, gather)
+    if isinstance(values, numpy.ndarray):
+        order = numpy.argsort(-counts, kind='mergesort')
+        values, counts = values[order], counts[order]
+    return values, counts
+
+
+def _gram(a):
+    """The number of rows, the column means and the centered Gram matrix
+    of `a`.  Internal."""
+    if a.ndim not in (1, 2) or (a.ndim == 2 and
+                                a.distribution.grid_shape[1] != 1):
+        msg = "a must be 1-D, or 2-D and distributed by rows only."
+        raise ValueError(msg)
+    if numpy.issubdtype(a.dtype, numpy.complexfloating):
+        raise TypeError("Complex DistArrays are not supported.")
+
+    def _local_gram(larr):
+        import distarray.local.localarray as la
+        return la.local_gram(larr)
+
+    return a.context.apply(_local_gram, (a.key,), targets=a.targets)[0]
+
+
+def cov(a, ddof=1):
+    """Covariance matrix of the columns of a DistArray, as
+    ``numpy.cov(a, rowvar=False, ddof=ddof)``.
+
+    Every engine computes the means and the centered Gram matrix of its
+    rows with one BLAS product; the engines merge them pairwise in a single
+    Allreduce, so the data are read once and only the result is sent to
+    the client.
+
+    Parameters
+    ----------
+    a : DistArray
+        Of shape ``(N, M)``, observations in rows and variables in columns,
+        distributed by rows only; or 1-D, for a single variable.
+    ddof : int, optional
+        Must be less than the number of observations.
+
+    Returns
+    -------
+    ndarray
+        Of shape ``(M, M)``, or 0-d for a 1-D `a`.
+    """
+    count, _, gram = _gram(a)
+    if count - ddof <= 0:
+        msg = "ddof (%d) must be less than the number of observations (%d)."
+        raise ValueError(msg % (ddof, count))
+    result = gram / (count - ddof)
+    return result if a.ndim == 2 else result[0, 0]
+
+
+def corrcoef(a):
+    """Correlation coefficients of the columns of a DistArray, as
+    ``numpy.corrcoef(a, rowvar=False)``.
+
+    See `cov`.
+
+    Returns
+    -------
+    ndarray
+        Of shape ``(M, M)``, or 0-d for a 1-D `a`.
+    """
+    _, _, gram = _gram(a)
+    stddev = numpy.sqrt(numpy.diag(gram))
+    result = numpy.clip(gram / stddev[:, None] / stddev[None, :], -1, 1)
+    return result if a.ndim == 2 else result[0, 0]
+
+
 # Define the functions dynamically at the module level.
 for name in unary_names:
     globals()[name] = unary_proxy(name)
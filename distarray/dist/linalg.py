@@ -0,0 +1,279 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Linear algebra for DistArrays.
+
+The iterative solvers `cg` and `bicgstab` keep their vectors and scalars on
+the engines (see `distarray.local.linalg`).  The linear operator is either
+a `distarray.dist.sparse.CSRMatrix`, in which case the whole solve runs on
+the engines in a single call, or any callable taking and returning
+DistArrays.  With a callable, the client applies the operator and forwards
+each product to the engines without waiting; it only asks whether the
+iteration has finished every `check_every` products.
+
+`tsqr`, `lstsq` and `svd` factor 2-D arrays distributed by rows, with a
+binary tree of small QR factorizations over the engines; the tall factors
+stay distributed and only the small ones come back to the client.
+"""
+
+from __future__ import absolute_import
+
+from distarray.dist.distarray import DistArray
+from distarray.dist.maps import Distribution
+from distarray.dist.sparse import CSRMatrix
+
+
+__all__ = ['cg', 'bicgstab', 'tsqr', 'lstsq', 'svd']
+
+
+def _solve(method, A, b, x0, tol, maxiter, check_every):
+    """Solve ``A x = b`` with the engine-side solver `method`."""
+    context, targets = b.context, b.targets
+    if x0 is None:
+        x0 = context.zeros(b.distribution, dtype=b.dtype)
+    if not x0.distribution.is_compatible(b.distribution):
+        raise ValueError("x0 must be distributed like b.")
+    if maxiter is None:
+        maxiter = 10 * b.global_size
+
+    if isinstance(A, CSRMatrix):
+        if not (b.distribution.is_compatible(A.distribution) and
+                b.distribution.is_compatible(A.col_distribution)):
+            msg = "b must be distributed like the rows and columns of A."
+            raise ValueError(msg)
+
+        def _local_solve(method, matrix, b, x0, tol, maxiter):
+            from distarray.local import linalg
+            solver = linalg.make_solver(method, b, x0, matrix.dot(x0), tol,
+                                        maxiter)
+            linalg.solve(solver, matrix.dot)
+            return proxyize(solver.x), solver.x.dtype, solver.report()  # noqa
+
+        res = context.apply(_local_solve,
+                            (method, A.key, b.key, x0.key, tol, maxiter),
+                            targets=targets)
+        x_key, dtype, report = res[0]
+        x = DistArray.from_localarrays(x_key, distribution=b.distribution,
+                                       dtype=dtype)
+        return x, report
+
+    ax = A(x0)
+    if not ax.distribution.is_compatible(b.distribution):
+        raise ValueError("A(x0) must be distributed like b.")
+
+    def _local_make_solver(method, b, x0, ax, tol, maxiter):
+        from distarray.local import linalg
+        solver = linalg.make_solver(method, b, x0, ax, tol, maxiter)
+        return (proxyize(solver), proxyize(solver.x), solver.x.dtype,  # noqa
+                proxyize(solver.operand), solver.operand.dtype)  # noqa
+
+    res = context.apply(_local_make_solver,
+                        (method, b.key, x0.key, ax.key, tol, maxiter),
+                        targets=targets)
+    solver_key, x_key, dtype, operand_key, operand_dtype = res[0]
+    operand = DistArray.from_localarrays(operand_key,
+                                         distribution=b.distribution,
+                                         dtype=operand_dtype)
+
+    def _local_step(solver, product):
+        solver.step(product)
+
+    def _local_done(solver):
+        return solver.done
+
+    # Keep the products alive until their steps have run.
+    pending = []
+    while True:
+        product = A(operand)
+        pending.append((product,
+                        context.apply(_local_step, (solver_key, product.key),
+                                      targets=targets, block=False)))
+        if len(pending) == check_every:
+            for (_, result) in pending:
+                result.get()
+            pending = []
+            if context.apply(_local_done, (solver_key,),
+                             targets=targets)[0]:
+                break
+
+    def _local_report(solver):
+        return solver.report()
+
+    report = context.apply(_local_report, (solver_key,),
+                           targets=targets)[0]
+    context.delete_key(solver_key, targets)
+    x = DistArray.from_localarrays(x_key, distribution=b.distribution,
+                                   dtype=dtype)
+    return x, report
+
+
+def cg(A, b, x0=None, tol=1e-5, maxiter=None, check_every=10):
+    """Solve ``A x = b`` by conjugate gradients, for a Hermitian positive
+    definite `A`.
+
+    Each iteration takes one product with `A`, and its two inner products
+    are summed with a single Allreduce (the Chronopoulos-Gear variant).
+
+    Parameters
+    ----------
+    A : CSRMatrix or callable
+        The operator: a square CSRMatrix distributed like `b`, or a callable
+        returning the product of `A` and a DistArray distributed like `b`.
+    b : DistArray
+        1-D and block-distributed.
+    x0 : DistArray, optional
+        The initial guess, distributed like `b`.  Defaults to zeros.
+    tol : float, optional
+        The tolerance on the norm of the residual, relative to the norm of
+        `b`.
+    maxiter : int, optional
+        The maximum number of iterations.  Defaults to ten times the size
+        of `b`.
+    check_every : int, optional
+        With a callable `A`, the number of products between two checks for
+        convergence by the client.  The products in between are not
+        waited for; those after convergence are ignored.
+
+    Returns
+    -------
+    x : DistArray
+        The solution, distributed like `b`.
+    info : dict
+        The convergence report: whether the iteration ``'converged'``, the
+        number of ``'iterations'`` and the final ``'residual'`` norm.
+    """
+    return _solve('cg', A, b, x0, tol, maxiter, check_every)
+
+
+def bicgstab(A, b, x0=None, tol=1e-5, maxiter=None, check_every=10):
+    """Solve ``A x = b`` by biconjugate gradients stabilized.
+
+    Each iteration takes two products with `A`; the inner products after
+    each of them are summed with a single Allreduce.  See `cg` for the
+    parameters and the result; `A` need not be Hermitian.
+    """
+    return _solve('bicgstab', A, b, x0, tol, maxiter, check_every)
+
+
+def _check_rows(a, name='a'):
+    if a.ndim != 2 or a.distribution.grid_shape[1] != 1:
+        msg = "%s must be 2-D and distributed by rows only."
+        raise ValueError(msg % name)
+
+
+def _row_result_distribution(a, ncols):
+    """The distribution of a result with `ncols` columns and the rows of
+    `a`, which is distributed by rows."""
+    if ncols == a.shape[1]:
+        return a.distribution
+    ddpr = []
+    for (rows, cols) in a.distribution.get_dim_data_per_rank():
+        cols = dict(cols, size=ncols)
+        ddpr.append((rows, cols))
+    return Distribution.from_dim_data_per_rank(a.context, ddpr,
+                                               targets=a.targets)
+
+
+def _factor(name, a):
+    """Run the engine-side factorization `name` of `a`, whose tall factor
+    has ``min(a.shape)`` columns."""
+    _check_rows(a)
+    out_dist = _row_result_distribution(a, min(a.shape))
+
+    def _local_factor(name, larr, out_comm, ddpr):
+        import distarray.local.linalg
+        res = getattr(distarray.local.linalg, name)(larr, out_comm, ddpr)
+        return (proxyize(res[0]), res[0].dtype) + tuple(res[1:])  # noqa
+
+    res = a.context.apply(_local_factor,
+                          (name, a.key, out_dist.comm,
+                           out_dist.get_dim_data_per_rank()),
+                          targets=a.targets)
+    tall = DistArray.from_localarrays(res[0][0], distribution=out_dist,
+                                      dtype=res[0][1])
+    return (tall,) + res[0][2:]
+
+
+def tsqr(a):
+    """Tall-skinny QR factorization of a 2-D DistArray distributed by rows.
+
+    Each engine factors its rows with `numpy.linalg.qr`, and the R factors
+    are combined in a binary tree over the engines; Q is formed on the
+    engines without gathering `a`.
+
+    Parameters
+    ----------
+    a : DistArray
+        Of shape ``(M, N)``, with an undistributed second dimension.
+
+    Returns
+    -------
+    q : DistArray
+        Of shape ``(M, K)`` with ``K = min(M, N)``, with orthonormal columns
+        and the distribution of `a` if ``K == N``.
+    r : ndarray
+        Of shape ``(K, N)``, upper triangular.
+    """
+    return _factor('tsqr', a)
+
+
+def svd(a):
+    """Thin singular value decomposition of a 2-D DistArray distributed by
+    rows, as ``numpy.linalg.svd(a, full_matrices=False)``.
+
+    The R factor of `a` (see `tsqr`) is decomposed on one engine, and U is
+    formed on the engines.
+
+    Returns
+    -------
+    u : DistArray
+        Of shape ``(M, K)``, distributed like `a` if ``K == N``.
+    s : ndarray
+        The ``K`` singular values, in descending order.
+    vt : ndarray
+        Of shape ``(K, N)``.
+    """
+    return _factor('svd', a)
+
+
+def lstsq(a, b):
+    """Least-squares solution of ``a x = b``, as `numpy.linalg.lstsq`.
+
+    Neither Q nor `a` is gathered: the R factor of the columns of `a` and
+    `b` side by side holds everything needed.
+
+    Parameters
+    ----------
+    a : DistArray
+        Of shape ``(M, N)``, with an undistributed second dimension.
+    b : DistArray
+        Of shape ``(M,)`` or ``(M, K)``, with the rows distributed like the
+        rows of `a`.
+
+    Returns
+    -------
+    x, residuals, rank, s : ndarray, ndarray, int, ndarray
+        As for `numpy.linalg.lstsq`.
+    """
+    _check_rows(a)
+    if b.ndim == 2:
+        _check_rows(b, 'b')
+    if (b.ndim not in (1, 2) or b.shape[0] != a.shape[0] or
+            b.targets != a.targets or
+            not a.distribution.maps[0].is_compatible(b.distribution.maps[0])):
+        raise ValueError("b must have the rows of a, distributed alike.")
+
+    def _local_lstsq(a, b, comm):
+        from distarray.local.linalg import lstsq
+        return lstsq(a, b, comm)
+
+    x, residuals, rank, s = a.context.apply(
+        _local_lstsq, (a.key, b.key, a.distribution.comm),
+        targets=a.targets)[0]
+    if b.ndim == 1:
+        x, residuals = x[:, 0], residuals[:1]
+    return x, residuals, rank, s
@@ -37,6 +37,8 @@ from distarray.metadata_utils import (normalize_dist,
                                       make_grid_shape,
                                       positivify,
                                       _start_stop_block,
+                                      _weighted_block_bounds,
+                                      normalize_weights,
                                       normalize_dim_dict,
                                       normalize_reduction_axes)
 
@@ -117,11 +119,17 @@ def map_from_global_dim_dict(global_dim_dict):
     return map_class.from_global_dim_dict(global_dim_dict)
 
 
-def map_from_sizes(size, dist_type, grid_size):
+def map_from_sizes(size, dist_type, grid_size, weights=None):
     """ Returns an instance of the appropriate subclass of MapBase.
+
+    `weights`, the per-index costs to balance, only apply to block maps.
     """
     map_class = choose_map(dist_type)
-    return map_class(size, grid_size)
+    if weights is None:
+        return map_class(size, grid_size)
+    if dist_type != 'b':
+        raise ValueError("Only block-distributed dimensions can have weights.")
+    return map_class(size, grid_size, weights)
 
 
 # ---------------------------------------------------------------------------
@@ -191,6 +199,7 @@ class NoDistMap(MapBase):
             msg = "grid_size for NoDistMap must be 1 (given %s)"
             raise ValueError(msg % grid_size)
         self.size = size
+        self.grid_size = grid_size
 
     def owners(self, idx):
         return [0] if 0 <= idx < self.size else []
@@ -245,11 +254,20 @@ class BlockMap(MapBase):
 
         return self
 
-    def __init__(self, size, grid_size):
+    def __init__(self, size, grid_size, weights=None):
+        """Split `size` indices into `grid_size` blocks: even blocks, or
+        blocks with nearly equal sums of `weights` (one per index) if given.
+        """
         self.size = size
         self.grid_size = grid_size
-        self.bounds = [_start_stop_block(size, grid_size, grid_rank)
-                       for grid_rank in range(grid_size)]
+        if weights is None:
+            self.bounds = [_start_stop_block(size, grid_size, grid_rank)
+                           for grid_rank in range(grid_size)]
+        else:
+            if len(weights) != size:
+                msg = "weights (length %d) do not match the size (%d)."
+                raise ValueError(msg % (len(weights), size))
+            self.bounds = _weighted_block_bounds(weights, grid_size)
         self.boundary_padding = self.comm_padding = 0
 
     def owners(self, idx):
@@ -439,7 +457,21 @@ class Distribution(object):
 
     @classmethod
     def from_shape(cls, context, shape, dist=None, grid_shape=None,
-                   targets=None):
+                   targets=None, halo=None, weights=None):
+        """ Create a Distribution from a `shape` and optional arguments.
+
+        `halo` is the width of the ghost-cell layer allocated around each
+        local section, either an int for every dimension or one int per
+        dimension.  Only block-distributed dimensions can have a halo; the
+        ghost cells are filled by `DistArray.exchange_halos`.
+
+        `weights` are per-index costs that the blocks of block-distributed
+        dimensions balance, instead of splitting them evenly: a dict
+        mapping dimensions to 1-D weights, a sequence with 1-D weights or
+        None per dimension, or an array of the whole `shape`, which is
+        summed over the other dimensions for each block-distributed
+        dimension.  See also `from_cost`.
+        """
 
         # special case when dist is all 'n's.
         if (dist is not None) and all(d == 'n' for d in dist):
@@ -477,10 +509,67 @@ class Distribution(object):
         self.rank_from_coords = np.arange(nelts).reshape(self.grid_shape)
 
         # List of `ClientMap` objects, one per dimension.
+        weights = normalize_weights(weights, self.shape, self.dist)
         self.maps = [map_from_sizes(*args)
-                     for args in zip(self.shape, self.dist, self.grid_shape)]
+                     for args in zip(self.shape, self.dist, self.grid_shape,
+                                     weights)]
+
+        if halo is not None:
+            if np.isscalar(halo):
+                halo = (halo,) * self.ndim
+            if len(halo) != self.ndim:
+                msg = "halo (%r) does not match the number of dimensions."
+                raise ValueError(msg % (halo,))
+            for (m, width) in zip(self.maps, halo):
+                if not width:
+                    continue
+                if m.dist != 'b':
+                    msg = "Only block-distributed dimensions can have a halo."
+                    raise ValueError(msg)
+                m.comm_padding = m.boundary_padding = int(width)
         return self
 
+    @classmethod
+    def from_cost(cls, context, shape, cost, dist=None, grid_shape=None,
+                  targets=None, halo=None, samples=64):
+        """ Create a Distribution whose blocks balance the estimated `cost`
+        of computing each element.
+
+        The cost is sampled on a grid of up to `samples` evenly spaced
+        indices per dimension, averaged over the other dimensions for every
+        block-distributed dimension and interpolated between the sampled
+        indices; the resulting per-index weights are passed to
+        `from_shape`.
+
+        Parameters
+        ----------
+        cost : callable
+            Called with the global indices of an element, one int per
+            dimension, and returning its (relative, non-negative) cost.
+        samples : int, optional
+            The number of sampled indices per dimension.
+
+        See `from_shape` for the other parameters.
+        """
+        dist_tuple = normalize_dist({0: 'b'} if dist is None else dist,
+                                    len(shape))
+        sampled_indices = [
+            np.unique(np.linspace(0, size - 1, min(size, samples)).round()
+                      .astype(int))
+            for size in shape]
+        sampled = np.vectorize(cost, otypes=[float])(*np.ix_(*sampled_indices))
+        weights = {}
+        for (axis, dist_type) in enumerate(dist_tuple):
+            if dist_type != 'b' or not shape[axis]:
+                continue
+            others = tuple(a for a in range(len(shape)) if a != axis)
+            weights[axis] = np.interp(np.arange(shape[axis]),
+                                      sampled_indices[axis],
+                                      sampled.mean(axis=others))
+        return cls.from_shape(context, shape, dist=dist,
+                              grid_shape=grid_shape, targets=targets,
+                              halo=halo, weights=weights)
+
     def __init__(self, context, global_dim_data, targets=None):
         """Make a Distribution from a global_dim_data structure.
 
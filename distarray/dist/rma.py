@@ -0,0 +1,60 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Client-side handles for one-sided access windows over DistArrays.
+
+See `distarray.local.rma` for the engine side.
+"""
+
+from __future__ import absolute_import
+
+
+__all__ = ['Window']
+
+
+class Window(object):
+    """Handle for the `distarray.local.rma.Window` objects exposing a
+    DistArray on its engines.
+
+    Create it with `DistArray.expose`.  Pass `key` to `Context.apply` to
+    receive the engine-side Window in the applied function, and call its
+    ``get`` and ``accumulate`` methods there.  The handle is also a context
+    manager that frees the windows on exit.
+    """
+
+    def __init__(self, darr):
+        self.darr = darr
+        self.context = darr.context
+        self.targets = darr.targets
+        ddpr = darr.distribution.get_dim_data_per_rank()
+
+        def _local_expose(larr, ddpr, comm):
+            from distarray.local.rma import Window
+            return proxyize(Window(larr, ddpr, comm))  # noqa
+
+        self.key = self.context.apply(_local_expose,
+                                      (darr.key, ddpr,
+                                       darr.distribution.comm),
+                                      targets=self.targets)[0]
+
+    def free(self):
+        """Free the windows on the engines."""
+        if self.key is None:
+            return
+
+        def _local_free(win):
+            win.free()
+
+        self.context.apply(_local_free, (self.key,), targets=self.targets)
+        self.context.delete_key(self.key, self.targets)
+        self.key = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.free()
@@ -0,0 +1,171 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Distributed sparse matrices.
+
+A `CSRMatrix` is distributed by blocks of rows, each held by one engine in
+compressed sparse row form (see `distarray.local.sparse`).  It multiplies
+block-distributed DistArray vectors; the vector entries each engine needs
+from the others are worked out once, when the matrix is built, so repeated
+products (as in iterative solvers or power iterations) only move those
+entries.
+"""
+
+from __future__ import absolute_import
+
+from distarray.dist.distarray import DistArray
+from distarray.dist.maps import Distribution
+
+
+__all__ = ['CSRMatrix']
+
+
+def _check_vector_distribution(distribution, size, name):
+    if distribution.shape != (size,) or distribution.dist != ('b',):
+        msg = "%s must be a 1-D block distribution of size %d."
+        raise ValueError(msg % (name, size))
+
+
+class CSRMatrix(object):
+    """A row-block distributed sparse matrix in CSR form.
+
+    Create it with `from_coo`.
+
+    Attributes
+    ----------
+    shape : (int, int)
+    dtype : numpy.dtype
+    nnz : int
+        The number of stored entries.
+    distribution : Distribution
+        The 1-D block distribution of the rows, and of the results of `dot`.
+    col_distribution : Distribution
+        The 1-D block distribution of the vectors `dot` accepts.
+    """
+
+    def __init__(self, key, shape, dtype, nnz, distribution,
+                 col_distribution):
+        self.key = key
+        self.shape = shape
+        self.dtype = dtype
+        self.nnz = nnz
+        self.distribution = distribution
+        self.col_distribution = col_distribution
+        self.context = distribution.context
+        self.targets = distribution.targets
+
+    def __del__(self):
+        try:
+            self.context.delete_key(self.key, self.targets)
+        except Exception:
+            pass
+
+    def __repr__(self):
+        return '<CSRMatrix(shape=%r, nnz=%r, targets=%r)>' % \
+            (self.shape, self.nnz, self.targets)
+
+    @classmethod
+    def from_coo(cls, rows, cols, data, shape=None, distribution=None,
+                 col_distribution=None):
+        """Build a matrix from COO triplets held in DistArrays.
+
+        Repeated entries are summed.
+
+        Parameters
+        ----------
+        rows, cols : DistArray
+            The row and column index of each entry.
+        data : DistArray
+            The value of each entry.  `rows`, `cols` and `data` must be
+            distributed alike, in any way.
+        shape : (int, int), optional
+            Defaults to one more than the largest row and column index.
+        distribution : Distribution, optional
+            The 1-D block distribution of the rows.  Defaults to even
+            blocks over the targets of `rows`.
+        col_distribution : Distribution, optional
+            The 1-D block distribution of the vectors the matrix multiplies,
+            on the same targets as `distribution`.  Defaults to even blocks.
+
+        Returns
+        -------
+        CSRMatrix
+        """
+        if not (rows.distribution.is_compatible(cols.distribution) and
+                rows.distribution.is_compatible(data.distribution)):
+            msg = "rows, cols and data must be distributed alike."
+            raise ValueError(msg)
+        context = rows.context
+
+        if shape is None:
+            def _local_extent(rows, cols, comm):
+                from distarray.local.mpiutils import MPI
+                extent = [int(a.ndarray.max()) + 1 if a.ndarray.size else 0
+                          for a in (rows, cols)]
+                return comm.allreduce(extent[0], op=MPI.MAX), \
+                    comm.allreduce(extent[1], op=MPI.MAX)
+            shape = context.apply(_local_extent,
+                                  (rows.key, cols.key,
+                                   rows.distribution.comm),
+                                  targets=rows.targets)[0]
+        shape = tuple(int(n) for n in shape)
+
+        if distribution is None:
+            distribution = Distribution.from_shape(context, (shape[0],),
+                                                   targets=rows.targets)
+        if col_distribution is None:
+            col_distribution = Distribution.from_shape(
+                context, (shape[1],), targets=distribution.targets)
+        _check_vector_distribution(distribution, shape[0], "distribution")
+        _check_vector_distribution(col_distribution, shape[1],
+                                   "col_distribution")
+        if not (rows.targets == distribution.targets ==
+                col_distribution.targets):
+            msg = "The triplets and distributions must share their targets."
+            raise ValueError(msg)
+
+        def _local_from_coo(rows, cols, data, shape, row_ddpr, col_ddpr,
+                            comm):
+            from distarray.local.sparse import from_coo
+            res = from_coo(rows, cols, data, shape, row_ddpr, col_ddpr, comm)
+            return proxyize(res), res.nnz  # noqa
+
+        res = context.apply(_local_from_coo,
+                            (rows.key, cols.key, data.key, shape,
+                             distribution.get_dim_data_per_rank(),
+                             col_distribution.get_dim_data_per_rank(),
+                             distribution.comm),
+                            targets=distribution.targets)
+        return cls(res[0][0], shape, data.dtype, sum(nnz for (_, nnz) in res),
+                   distribution, col_distribution)
+
+    def dot(self, x):
+        """The product of the matrix and the vector `x`.
+
+        Parameters
+        ----------
+        x : DistArray
+            Distributed like `col_distribution`.
+
+        Returns
+        -------
+        DistArray
+            Distributed like the rows of the matrix.
+        """
+        if not x.distribution.is_compatible(self.col_distribution):
+            msg = "x must be distributed like the columns of the matrix."
+            raise ValueError(msg)
+
+        def _local_dot(matrix, x):
+            res = matrix.dot(x)
+            return proxyize(res), res.dtype  # noqa
+
+        res = self.context.apply(_local_dot, (self.key, x.key),
+                                 targets=self.targets)
+        return DistArray.from_localarrays(res[0][0],
+                                          distribution=self.distribution,
+                                          dtype=res[0][1])
@@ -293,6 +293,50 @@ class TestVectorizeDecorator(TestCase):
         db = da_fn(da, da, 6)
         assert_array_equal(db.toarray(), a)
 
+    def test_vectorize_balanced(self):
+        """Does work stealing give the same result?"""
+
+        context = Context()
+
+        a = numpy.arange(30).reshape(5, 6)
+        da = context.fromndarray(a)
+
+        def fn(a, b, c=0):
+            return a**2 + b + c
+
+        db = vectorize(fn, balanced=True, chunks=3)(da, da, c=6)
+        assert_array_equal(db.toarray(), numpy.vectorize(fn)(a, a, c=6))
+
+    def test_vectorize_balanced_dtype(self):
+        """Does the result take the dtype of the function's output?"""
+
+        context = Context()
+
+        a = numpy.arange(3)
+        da = context.fromndarray(a)
+
+        def fn(a):
+            return a / 2.0
+
+        db = vectorize(fn, balanced=True)(da)
+        self.assertEqual(db.dtype, numpy.dtype('float64'))
+        assert_array_equal(db.toarray(), a / 2.0)
+
+    def test_vectorize_balanced_distributions(self):
+        """Are differently distributed inputs rejected?"""
+
+        context = Context()
+
+        a = numpy.arange(16).reshape(4, 4)
+        da = context.fromndarray(a)
+        db = context.fromndarray(a, Distribution.from_shape(context, (4, 4),
+                                                            ('c', 'c')))
+        def fn(a, b):
+            return a + b
+
+        with self.assertRaises(ValueError):
+            vectorize(fn, balanced=True)(da, db)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
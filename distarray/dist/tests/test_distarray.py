@@ -429,6 +429,16 @@ class TestReduceMethods(ContextTestCase):
         np_sum = self.arr.sum(axis=0, dtype=int)
         assert_allclose(da_sum.tondarray(), np_sum)
 
+    def test_sum_dtype_accumulates(self):
+        # 2**24 + 1 is not representable in float32.
+        arr = numpy.ones((4, 4), dtype=numpy.float32)
+        arr[::2] = 2**24
+        dist = Distribution.from_shape(self.context, arr.shape, ('b', 'b'),
+                                       (2, 2))
+        darr = self.context.fromndarray(arr, dist)
+        da_sum = darr.sum(axis=0, dtype='float64')
+        assert_array_equal(da_sum.tondarray(), [2**25 + 2] * 4)
+
     def test_mean_axis_none(self):
         np_mean = self.arr.mean(axis=None)
         da_mean = self.darr.mean(axis=None)
@@ -476,6 +486,16 @@ class TestReduceMethods(ContextTestCase):
         da_var = self.darr.var(dtype=int)
         self.assertEqual(da_var.toarray(), np_var)
 
+    def test_var_float32_dtype(self):
+        # Accumulated in float32, 2**24 + 1 rounds to 2**24.
+        arr = 2.0**24 + numpy.arange(8) % 2
+        darr = self.context.fromndarray(arr)
+        da_var = darr.var(dtype=numpy.float32)
+        self.assertEqual(da_var.dtype, numpy.float32)
+        assert_allclose(da_var.tondarray(), arr.var(dtype=numpy.float32))
+        assert_allclose(darr.std(dtype=numpy.float32).tondarray(),
+                        arr.std(dtype=numpy.float32))
+
     def test_std(self):
         np_std = self.arr.std()
         da_std = self.darr.std()
@@ -496,6 +516,48 @@ class TestReduceMethods(ContextTestCase):
         da_std = self.darr.std(axis=1)
         assert_allclose(da_std.tondarray(), np_std)
 
+    def test_var_large_offset(self):
+        arr = 1e9 + numpy.arange(40, dtype=float).reshape(8, 5)
+        dist = Distribution.from_shape(self.context, arr.shape, ('c', 'b'))
+        darr = self.context.fromndarray(arr, dist)
+        assert_allclose(darr.var().tondarray(), arr.var())
+        assert_allclose(darr.var(axis=0).tondarray(), arr.var(axis=0))
+        assert_allclose(darr.std(axis=1).tondarray(), arr.std(axis=1))
+
+    def test_describe(self):
+        stats = self.darr.describe()
+        self.assertEqual(stats['count'].tondarray(), self.arr.size)
+        assert_allclose(stats['mean'].tondarray(), self.arr.mean())
+        assert_allclose(stats['var'].tondarray(), self.arr.var())
+        self.assertEqual(stats['min'].tondarray(), self.arr.min())
+        self.assertEqual(stats['max'].tondarray(), self.arr.max())
+
+    def test_describe_axis_1(self):
+        stats = self.darr.describe(axis=1)
+        assert_array_equal(stats['count'].tondarray(), [4, 4, 4, 4])
+        assert_allclose(stats['mean'].tondarray(), self.arr.mean(axis=1))
+        assert_allclose(stats['var'].tondarray(), self.arr.var(axis=1))
+        assert_array_equal(stats['min'].tondarray(), self.arr.min(axis=1))
+        assert_array_equal(stats['max'].tondarray(), self.arr.max(axis=1))
+
+    def test_describe_large_integers(self):
+        arr = 2 ** 62 + numpy.arange(12, dtype=numpy.int64)
+        darr = self.context.fromndarray(arr)
+        stats = darr.describe()
+        self.assertEqual(stats['min'].dtype, numpy.dtype(numpy.int64))
+        self.assertEqual(stats['min'].tondarray(), arr.min())
+        self.assertEqual(stats['max'].tondarray(), arr.max())
+
+    def test_describe_complex(self):
+        arr = numpy.arange(3) * (1 - 2j) + 1j
+        darr = self.context.fromndarray(arr)
+        stats = darr.describe()
+        assert_allclose(stats['mean'].tondarray(), arr.mean())
+        assert_allclose(stats['var'].tondarray(), arr.var())
+        self.assertEqual(stats['min'].tondarray(), arr.min())
+        self.assertEqual(stats['max'].tondarray(), arr.max())
+        assert_allclose(darr.var().tondarray(), arr.var())
+
     def test_min(self):
         np_min = self.arr.min()
         da_min = self.darr.min()
@@ -539,8 +601,498 @@ class TestReduceMethods(ContextTestCase):
                                        dist=('b',),
                                        targets=self.context.targets[:2])
         darr = self.context.ones(dist)
-        self.assertRaises(NotImplementedError, darr.min, ())
-        self.assertRaises(NotImplementedError, darr.sum, (), {'axis':0})
+        self.assertEqual(darr.min().tondarray(), 1)
+        self.assertEqual(darr.max().tondarray(), 1)
+        self.assertEqual(darr.sum(axis=0).tondarray(), 1)
+        self.assertEqual(darr.mean().tondarray(), 1)
+        self.assertEqual(darr.var().tondarray(), 0)
+        self.assertEqual(darr.reduce(numpy.multiply).tondarray(), 1)
+
+    def test_reduce_multiply(self):
+        np_prod = numpy.multiply.reduce(self.arr + 1, axis=0)
+        da_prod = (self.darr + 1).reduce(numpy.multiply, axis=0)
+        assert_array_equal(da_prod.tondarray(), np_prod)
+
+    def test_reduce_maximum_axis_none(self):
+        da_max = self.darr.reduce(numpy.maximum)
+        self.assertEqual(da_max.tondarray(), self.arr.max())
+
+    def test_reduce_logical_and(self):
+        np_all = numpy.logical_and.reduce(self.arr, axis=1)
+        da_all = self.darr.reduce(numpy.logical_and, axis=1)
+        self.assertEqual(da_all.dtype, numpy.bool_)
+        assert_array_equal(da_all.tondarray(), np_all)
+
+    def test_reduce_bitwise_or(self):
+        np_or = numpy.bitwise_or.reduce(self.arr, axis=0)
+        da_or = self.darr.reduce(numpy.bitwise_or, axis=0)
+        assert_array_equal(da_or.tondarray(), np_or)
+
+    def test_reduce_python_combiner(self):
+        def absmax(x, y):
+            return numpy.where(abs(x) > abs(y), x, y)
+        arr = numpy.arange(-7, 9).reshape(4, 4)
+        dist = Distribution.from_shape(self.context, arr.shape, ('b', 'b'),
+                                       (2, 2))
+        darr = self.context.fromndarray(arr, dist)
+        self.assertEqual(darr.reduce(absmax).tondarray(), 8)
+        assert_array_equal(darr.reduce(absmax, axis=1).tondarray(),
+                           [-7, -3, 4, 8])
+
+    def test_prod(self):
+        arr = numpy.arange(1, 17).reshape(4, 4)
+        darr = self.context.fromndarray(arr, self.darr.distribution)
+        assert_array_equal(darr.prod(axis=0).tondarray(), arr.prod(axis=0))
+        self.assertEqual(darr.prod(dtype=float).tondarray(),
+                         arr.prod(dtype=float))
+
+    def test_any_all(self):
+        self.assertTrue(self.darr.any().tondarray())
+        self.assertFalse(self.darr.all().tondarray())
+        assert_array_equal(self.darr.all(axis=1).tondarray(),
+                           self.arr.all(axis=1))
+        assert_array_equal(self.darr.any(axis=0).tondarray(),
+                           self.arr.any(axis=0))
+
+    def test_ptp(self):
+        arr = numpy.array([[3, -1, 4, 1], [5, 9, -2, 6],
+                           [5, 3, 5, 8], [-9, 7, 9, 3]])
+        darr = self.context.fromndarray(arr, self.darr.distribution)
+        self.assertEqual(darr.ptp().tondarray(), arr.ptp())
+        assert_array_equal(darr.ptp(axis=0).tondarray(), arr.ptp(axis=0))
+        assert_array_equal(darr.ptp(axis=1).tondarray(), arr.ptp(axis=1))
+
+    def test_argmin_argmax(self):
+        arr = numpy.array([[3, -1, 4, 1], [5, 9, -2, 6],
+                           [5, 3, 5, 8], [-9, 7, 9, 3]])
+        darr = self.context.fromndarray(arr, self.darr.distribution)
+        self.assertEqual(darr.argmin().tondarray(), arr.argmin())
+        self.assertEqual(darr.argmax().tondarray(), arr.argmax())
+        for axis in (0, 1):
+            assert_array_equal(darr.argmin(axis=axis).tondarray(),
+                               arr.argmin(axis=axis))
+            assert_array_equal(darr.argmax(axis=axis).tondarray(),
+                               arr.argmax(axis=axis))
+
+    def test_argmax_ties_first_occurrence(self):
+        arr = numpy.zeros((4, 4))
+        arr[1, 3] = arr[3, 0] = 1.0
+        darr = self.context.fromndarray(arr, self.darr.distribution)
+        self.assertEqual(darr.argmax().tondarray(), 7)
+        self.assertEqual(darr.argmin().tondarray(), 0)
+
+    def test_argmin_nan(self):
+        arr = numpy.arange(16, dtype=float).reshape(4, 4)
+        arr[2, 3] = numpy.nan
+        darr = self.context.fromndarray(arr, self.darr.distribution)
+        self.assertEqual(darr.argmin().tondarray(), arr.argmin())
+
+    def test_argmin_cyclic(self):
+        arr = numpy.array([4, 2, 7, 1, 9, 1, 3, 8])
+        dist = Distribution.from_shape(self.context, arr.shape, ('c',))
+        darr = self.context.fromndarray(arr, dist)
+        self.assertEqual(darr.argmin().tondarray(), arr.argmin())
+        self.assertEqual(darr.argmax().tondarray(), arr.argmax())
+
+
+class TestQuantileMethods(ContextTestCase):
+    """Test median, percentile and quantile"""
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestQuantileMethods, cls).setUpClass()
+        # Many duplicates, and uneven blocks along axis 0.
+        cls.arr = numpy.random.RandomState(0).randint(0, 10, size=(21, 3))
+        dist = Distribution.from_shape(cls.context, cls.arr.shape, ('b', 'n'))
+        cls.darr = cls.context.fromndarray(cls.arr, dist)
+
+    def test_median(self):
+        assert_allclose(self.darr.median().tondarray(),
+                        numpy.median(self.arr))
+        assert_allclose(self.darr.median(axis=0).tondarray(),
+                        numpy.median(self.arr, axis=0))
+
+    def test_percentile(self):
+        for q in (0, 10, 33.3, 50, 99, 100):
+            assert_allclose(self.darr.percentile(q).tondarray(),
+                            numpy.percentile(self.arr, q))
+            assert_allclose(self.darr.percentile(q, axis=0).tondarray(),
+                            numpy.percentile(self.arr, q, axis=0))
+
+    def test_quantile_distributed_columns(self):
+        arr = numpy.random.RandomState(1).normal(size=(7, 6))
+        dist = Distribution.from_shape(self.context, arr.shape, ('c', 'b'),
+                                       (2, 2))
+        darr = self.context.fromndarray(arr, dist)
+        for axis in (None, 0, 1):
+            result = darr.quantile(0.3, axis=axis)
+            assert_allclose(result.tondarray(),
+                            numpy.quantile(arr, 0.3, axis=axis))
+
+    def test_quantile_many_rounds(self):
+        arr = numpy.random.RandomState(2).normal(size=2001)
+        darr = self.context.fromndarray(arr)
+        for q in (0.0, 0.01, 0.5, 0.77, 1.0):
+            assert_allclose(darr.quantile(q).tondarray(),
+                            numpy.quantile(arr, q))
+
+    def test_median_nan(self):
+        arr = numpy.array([1.0, 3.0, numpy.nan, 2.0, 5.0])
+        darr = self.context.fromndarray(arr)
+        self.assertTrue(numpy.isnan(darr.median().tondarray()))
+
+    def test_quantile_range(self):
+        with self.assertRaises(ValueError):
+            self.darr.quantile(1.5)
+        with self.assertRaises(ValueError):
+            self.darr.percentile(-1)
+
+    def test_quantile_complex(self):
+        darr = self.context.fromndarray(numpy.arange(4) * 1j)
+        with self.assertRaises(TypeError):
+            darr.quantile(0.5)
+        with self.assertRaises(TypeError):
+            darr.median()
+
+
+class TestTopK(ContextTestCase):
+    """Test topk"""
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestTopK, cls).setUpClass()
+        cls.arr = numpy.random.RandomState(0).permutation(60).reshape(6, 10)
+        dist = Distribution.from_shape(cls.context, cls.arr.shape,
+                                       ('c', 'b'), (2, 2))
+        cls.darr = cls.context.fromndarray(cls.arr, dist)
+
+    def test_largest(self):
+        values, indices = self.darr.topk(7)
+        assert_array_equal(values, numpy.arange(59, 52, -1))
+        assert_array_equal(self.arr.ravel()[indices], values)
+
+    def test_smallest(self):
+        values, indices = self.darr.topk(5, largest=False)
+        assert_array_equal(values, numpy.arange(5))
+        assert_array_equal(self.arr.ravel()[indices], values)
+
+    def test_k_exceeds_local_size(self):
+        arr = numpy.array([3.0, numpy.nan, 1.0, 4.0, 1.0, 5.0])
+        darr = self.context.fromndarray(arr)
+        values, indices = darr.topk(6)
+        assert_array_equal(indices, [1, 5, 3, 0, 2, 4])
+        values, indices = darr.topk(3, largest=False)
+        assert_array_equal(values, [1.0, 1.0, 3.0])
+        assert_array_equal(indices, [2, 4, 0])
+
+    def test_bad_k(self):
+        with self.assertRaises(ValueError):
+            self.darr.topk(0)
+        with self.assertRaises(ValueError):
+            self.darr.topk(61)
+
+
+class TestMaskSelection(ContextTestCase):
+    """Test boolean-mask indexing, compress and nonzero"""
+
+    def fromndarray(self, arr, dist, grid_shape=None):
+        distribution = Distribution.from_shape(self.context, arr.shape, dist,
+                                               grid_shape)
+        return self.context.fromndarray(arr, distribution)
+
+    def test_getitem_mask_rows(self):
+        arr = numpy.random.RandomState(0).normal(size=(9, 4))
+        darr = self.fromndarray(arr, ('b', 'n'))
+        result = darr[darr > 0.5]
+        self.assertEqual(result.ndim, 1)
+        assert_array_equal(result.tondarray(), arr[arr > 0.5])
+
+    def test_compress_unordered_layout(self):
+        arr = numpy.arange(35).reshape(5, 7)
+        darr = self.fromndarray(arr, ('c', 'b'), (2, 2))
+        for balance in (False, True):
+            result = darr.compress(darr % 3 == 0, balance=balance)
+            assert_array_equal(result.tondarray(), arr[arr % 3 == 0])
+
+    def test_compress_balance(self):
+        # Only the first engine selects anything.
+        arr = numpy.arange(20)
+        darr = self.context.fromndarray(arr)
+        result = darr.compress(darr < 6, balance=False)
+        self.assertEqual(result.distribution.dist, ('b',))
+        self.assertEqual(result.distribution[0].bounds[0], (0, 5))
+        result = darr.compress(darr < 6, balance=True)
+        self.assertEqual(result.distribution[0].bounds,
+                         [(0, 2), (2, 4), (4, 6), (6, 6)])
+        assert_array_equal(result.tondarray(), numpy.arange(6))
+
+    def test_nonzero(self):
+        arr = numpy.random.RandomState(1).randint(0, 3, size=(6, 5))
+        for (dist, grid_shape) in [(('b', 'n'), None),
+                                   (('b', 'c'), (2, 2))]:
+            darr = self.fromndarray(arr, dist, grid_shape)
+            for balance in (False, True):
+                result = darr.nonzero(balance=balance)
+                self.assertEqual(len(result), 2)
+                for (indices, expected) in zip(result, arr.nonzero()):
+                    assert_array_equal(indices.tondarray(), expected)
+
+    def test_mask_shape_mismatch(self):
+        darr = self.context.fromndarray(numpy.arange(8))
+        mask = self.context.fromndarray(numpy.ones(6, dtype=bool))
+        with self.assertRaises(IndexError):
+            darr[mask]
+
+
+class TestDistributedIndexing(ContextTestCase):
+    """Test take and put with DistArray indices"""
+
+    def setUp(self):
+        self.arr = numpy.arange(42.0).reshape(6, 7)
+        dist = Distribution.from_shape(self.context, self.arr.shape,
+                                       ('b', 'c'), (2, 2))
+        self.darr = self.context.fromndarray(self.arr, dist)
+        self.indices = numpy.random.RandomState(0).randint(-42, 42, size=15)
+        self.dindices = self.context.fromndarray(self.indices)
+
+    def test_take(self):
+        result = self.darr.take(self.dindices)
+        self.assertEqual(result.distribution, self.dindices.distribution)
+        assert_array_equal(result.tondarray(), self.arr.take(self.indices))
+
+    def test_take_2d_indices(self):
+        indices = self.indices[:12].reshape(3, 4) % 42
+        dist = Distribution.from_shape(self.context, indices.shape,
+                                       ('n', 'b'))
+        dindices = self.context.fromndarray(indices, dist)
+        assert_array_equal(self.darr.take(dindices).tondarray(),
+                           self.arr.take(indices))
+
+    def test_put(self):
+        values = numpy.arange(15.0) + 100
+        self.darr.put(self.dindices, self.context.fromndarray(values))
+        # Repeated indices may store any of their values.
+        result = self.darr.tondarray()
+        for index in set(self.indices):
+            self.assertIn(result.flat[index],
+                          values[self.indices == index])
+        untouched = numpy.ones(42, dtype=bool)
+        untouched[self.indices] = False
+        assert_array_equal(result.ravel()[untouched],
+                           self.arr.ravel()[untouched])
+
+    def test_put_ufunc(self):
+        self.darr.put(self.dindices, 1.0, ufunc=numpy.add)
+        expected = self.arr.copy()
+        numpy.add.at(expected.ravel(), self.indices, 1.0)
+        assert_array_equal(self.darr.tondarray(), expected)
+
+    def test_out_of_bounds(self):
+        dindices = self.context.fromndarray(numpy.array([0, 5, 42, 1]))
+        with self.assertRaises(Exception):
+            self.darr.take(dindices)
+
+    def test_take_tuples(self):
+        indices = numpy.array([[5, 6], [0, 0], [-1, 2], [3, 3], [0, 0]])
+        result = self.darr.take(indices)
+        assert_array_equal(result, self.arr[tuple(indices.T)])
+
+    def test_take_tuples_1d(self):
+        darr = self.context.fromndarray(numpy.arange(10) * 2)
+        assert_array_equal(darr.take([9, 0, 4, -2]), [18, 0, 8, 16])
+
+    def test_put_tuples(self):
+        indices = numpy.array([[5, 6], [1, 4], [-1, 0]])
+        self.darr.put(indices, [1.5, 2.5, 3.5])
+        expected = self.arr.copy()
+        expected[tuple(indices.T)] = [1.5, 2.5, 3.5]
+        assert_array_equal(self.darr.tondarray(), expected)
+
+    def test_put_tuples_ufunc(self):
+        indices = numpy.array([[2, 2], [2, 2], [4, 1]])
+        self.darr.put(indices, 10, ufunc=numpy.add)
+        expected = self.arr.copy()
+        numpy.add.at(expected, tuple(indices.T), 10)
+        assert_array_equal(self.darr.tondarray(), expected)
+
+    def test_tuples_bad_shape(self):
+        with self.assertRaises(IndexError):
+            self.darr.take([1, 2, 3])
+        with self.assertRaises(IndexError):
+            self.darr.take([[6, 0]])
+
+
+class TestScanMethods(ContextTestCase):
+    """Test cumulative methods"""
+
+    def check_scan(self, arr, dist, grid_shape=None):
+        distribution = Distribution.from_shape(self.context, arr.shape, dist,
+                                               grid_shape)
+        darr = self.context.fromndarray(arr, distribution)
+        for axis in range(arr.ndim):
+            assert_allclose(darr.cumsum(axis=axis).tondarray(),
+                            arr.cumsum(axis=axis))
+            assert_allclose(darr.cumprod(axis=axis).tondarray(),
+                            arr.cumprod(axis=axis))
+
+    def test_block_1d(self):
+        arr = numpy.arange(1, 11)
+        self.check_scan(arr, ('b',))
+        darr = self.context.fromndarray(arr)
+        assert_array_equal(darr.cumsum().tondarray(), arr.cumsum())
+
+    def test_block_block(self):
+        arr = numpy.arange(1, 31, dtype=float).reshape(5, 6) / 7
+        self.check_scan(arr, ('b', 'b'), (2, 2))
+
+    def test_block_nodist(self):
+        arr = numpy.arange(24).reshape(8, 3)
+        self.check_scan(arr, ('b', 'n'))
+
+    def test_more_processes_than_elements(self):
+        arr = numpy.arange(1, 4)
+        self.check_scan(arr, ('b',))
+
+    def test_cyclic(self):
+        arr = numpy.arange(1, 12)
+        self.check_scan(arr, ('c',))
+
+    def test_cyclic_more_processes_than_elements(self):
+        arr = numpy.arange(1, 7).reshape(3, 2)
+        self.check_scan(arr, ('c', 'n'))
+
+    def test_cyclic_block(self):
+        arr = numpy.arange(1, 25, dtype=float).reshape(4, 6) / 5
+        self.check_scan(arr, ('c', 'b'), (2, 2))
+
+    def test_dtype(self):
+        arr = numpy.ones(8, dtype=numpy.int8)
+        darr = self.context.fromndarray(arr)
+        result = darr.cumsum(dtype=float)
+        self.assertEqual(result.dtype, numpy.dtype(float))
+        assert_allclose(result.tondarray(), numpy.arange(1, 9))
+        self.assertEqual(darr.cumsum().dtype, arr.cumsum().dtype)
+
+    def test_flattened_not_supported(self):
+        darr = self.context.ones(Distribution.from_shape(self.context,
+                                                         (4, 4)))
+        with self.assertRaises(NotImplementedError):
+            darr.cumsum()
+
+
+class TestHaloExchange(ContextTestCase):
+
+    def test_exchange_halos_periodic(self):
+        arr = numpy.arange(24).reshape(4, 6)
+        distribution = Distribution.from_shape(self.context, arr.shape,
+                                               ('b', 'b'), (2, 2), halo=1)
+        darr = self.context.fromndarray(arr, distribution)
+        assert_array_equal(darr.tondarray(), arr)
+        darr.exchange_halos(periodic=True)
+
+        def padded(larr):
+            return larr.padded_ndarray, larr.distribution[0].start, \
+                larr.distribution[1].start
+
+        for (buf, row, col) in self.context.apply(padded, (darr.key,),
+                                                  targets=darr.targets):
+            rows = numpy.arange(row - 1, row + 3) % 4
+            cols = numpy.arange(col - 1, col + 4) % 6
+            assert_array_equal(buf, arr[numpy.ix_(rows, cols)])
+
+    def test_halo_on_cyclic_dimension(self):
+        with self.assertRaises(ValueError):
+            Distribution.from_shape(self.context, (8,), ('c',), halo=1)
+
+
+class TestExpose(ContextTestCase):
+
+    def test_get_and_accumulate(self):
+        arr = numpy.arange(24.0).reshape(4, 6)
+        distribution = Distribution.from_shape(self.context, arr.shape,
+                                               ('b', 'b'), (2, 2), halo=1)
+        darr = self.context.fromndarray(arr, distribution)
+
+        def corners(win):
+            indices = [(0, 0), (0, -1), (-1, 0), (-1, -1)]
+            values = win.get(indices)
+            win.comm.Barrier()
+            win.accumulate(indices, 1.0)
+            return values
+
+        with darr.expose() as win:
+            results = self.context.apply(corners, (win.key,),
+                                         targets=darr.targets)
+        for values in results:
+            assert_array_equal(values, [0, 5, 18, 23])
+        expected = arr.copy()
+        expected[[0, 0, -1, -1], [0, -1, 0, -1]] += len(darr.targets)
+        assert_array_equal(darr.tondarray(), expected)
+        self.assertIsNone(win.key)
+
+
+class TestShapeMethods(ContextTestCase):
+
+    def fromndarray(self, arr, dist, grid_shape=None):
+        distribution = Distribution.from_shape(self.context, arr.shape, dist,
+                                               grid_shape)
+        return self.context.fromndarray(arr, distribution)
+
+    def test_transpose_metadata_only(self):
+        arr = numpy.arange(24).reshape(6, 4)
+        darr = self.fromndarray(arr, ('b', 'n'))
+        result = darr.T
+        self.assertEqual(result.distribution.dist, ('n', 'b'))
+        self.assertEqual(result.grid_shape, (1, 4))
+        assert_array_equal(result.tondarray(), arr.T)
+
+    def test_transpose_with_exchange(self):
+        arr = numpy.arange(60).reshape(3, 4, 5)
+        darr = self.fromndarray(arr, ('b', 'c', 'n'), (2, 2, 1))
+        for axes in [(1, 0, 2), (2, 1, 0), (0, 2, 1)]:
+            result = darr.transpose(axes)
+            self.assertEqual(result.shape, arr.transpose(axes).shape)
+            assert_array_equal(result.tondarray(), arr.transpose(axes))
+        assert_array_equal(darr.transpose(1, 2, 0).tondarray(),
+                           arr.transpose(1, 2, 0))
+
+    def test_swapaxes(self):
+        arr = numpy.arange(24).reshape(4, 6)
+        darr = self.fromndarray(arr, ('b', 'b'), (2, 2))
+        assert_array_equal(darr.swapaxes(0, -1).tondarray(), arr.T)
+
+    def test_transpose_bad_axes(self):
+        darr = self.fromndarray(numpy.arange(6).reshape(2, 3), ('b', 'n'))
+        with self.assertRaises(ValueError):
+            darr.transpose(0, 0)
+
+    def test_reshape_contiguous_sections(self):
+        arr = numpy.arange(24.0).reshape(8, 3)
+        darr = self.fromndarray(arr, ('b', 'n'))
+        result = darr.reshape(4, -1)
+        self.assertEqual(result.shape, (4, 6))
+        assert_array_equal(result.tondarray(), arr.reshape(4, 6))
+
+    def test_reshape_scattered_sections(self):
+        arr = numpy.arange(35).reshape(5, 7)
+        for dist in [('b', 'b'), ('c', 'b'), ('n', 'b')]:
+            darr = self.fromndarray(arr, dist)
+            result = darr.reshape((7, 5))
+            assert_array_equal(result.tondarray(), arr.reshape(7, 5))
+
+    def test_ravel(self):
+        arr = numpy.arange(30).reshape(2, 3, 5)
+        darr = self.fromndarray(arr, ('b', 'b', 'n'), (2, 2, 1))
+        result = darr.ravel()
+        self.assertEqual(result.distribution.dist, ('b',))
+        assert_array_equal(result.tondarray(), arr.ravel())
+
+    def test_reshape_bad_size(self):
+        darr = self.fromndarray(numpy.arange(12), ('b',))
+        with self.assertRaises(ValueError):
+            darr.reshape(5, -1)
+        with self.assertRaises(ValueError):
+            darr.reshape(5, 3)
 
 
 class TestFromLocalArrays(ContextTestCase):
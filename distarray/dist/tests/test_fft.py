@@ -0,0 +1,95 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Tests for distarray.dist.fft.
+
+Many of these tests require a 4-engine cluster to be running locally.
+"""
+
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from distarray.testing import ContextTestCase
+from distarray.dist.maps import Distribution
+from distarray.dist import fft
+
+
+class TestFFT(ContextTestCase):
+
+    def fromndarray(self, arr, dist, grid_shape=None):
+        distribution = Distribution.from_shape(self.context, arr.shape, dist,
+                                               grid_shape)
+        return self.context.fromndarray(arr, distribution)
+
+    def random(self, shape):
+        return np.random.RandomState(0).normal(size=shape)
+
+    def test_fftn_slab(self):
+        arr = self.random((8, 6))
+        darr = self.fromndarray(arr, ('b', 'n'))
+        result = fft.fftn(darr)
+        self.assertEqual(result.distribution.dist, ('n', 'b'))
+        assert_allclose(result.tondarray(), np.fft.fftn(arr))
+
+    def test_fftn_not_transposed(self):
+        arr = self.random((8, 6))
+        darr = self.fromndarray(arr, ('b', 'n'))
+        result = fft.fftn(darr, transposed=False)
+        self.assertEqual(result.distribution.dist, ('b', 'n'))
+        assert_allclose(result.tondarray(), np.fft.fftn(arr))
+
+    def test_fftn_pencil(self):
+        arr = self.random((4, 6, 5))
+        darr = self.fromndarray(arr, ('b', 'b', 'n'), (2, 2, 1))
+        result = fft.fftn(darr)
+        self.assertEqual(result.distribution.dist, ('n', 'b', 'b'))
+        self.assertEqual(result.distribution.grid_shape, (1, 2, 2))
+        assert_allclose(result.tondarray(), np.fft.fftn(arr))
+
+    def test_fftn_uneven_blocks(self):
+        arr = self.random((9, 5))
+        darr = self.fromndarray(arr, ('b', 'n'))
+        assert_allclose(fft.fftn(darr).tondarray(), np.fft.fftn(arr))
+        arr = self.random((5, 3, 3))
+        darr = self.fromndarray(arr, ('b', 'b', 'n'), (2, 2, 1))
+        assert_allclose(fft.fftn(darr).tondarray(), np.fft.fftn(arr))
+
+    def test_ifftn_round_trip(self):
+        arr = self.random((4, 6, 5))
+        darr = self.fromndarray(arr, ('b', 'b', 'n'), (2, 2, 1))
+        result = fft.ifftn(fft.fftn(darr))
+        self.assertEqual(result.distribution.dist, ('b', 'b', 'n'))
+        assert_allclose(result.tondarray(), arr, atol=1e-12)
+
+    def test_ifftn(self):
+        arr = self.random((6, 8)) + 1j * self.random((6, 8))
+        darr = self.fromndarray(arr, ('b', 'n'))
+        assert_allclose(fft.ifftn(darr, norm='ortho').tondarray(),
+                        np.fft.ifftn(arr, norm='ortho'))
+
+    def test_rfftn(self):
+        arr = self.random((8, 7))
+        darr = self.fromndarray(arr, ('b', 'n'))
+        result = fft.rfftn(darr)
+        self.assertEqual(result.shape, (8, 4))
+        assert_allclose(result.tondarray(), np.fft.rfftn(arr))
+
+    def test_no_undistributed_dimension(self):
+        darr = self.fromndarray(self.random((4, 4)), ('b', 'b'), (2, 2))
+        with self.assertRaises(ValueError):
+            fft.fftn(darr)
+
+    def test_rfftn_distributed_last_dimension(self):
+        darr = self.fromndarray(self.random((4, 8)), ('n', 'b'))
+        with self.assertRaises(ValueError):
+            fft.rfftn(darr)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -14,9 +14,10 @@ import unittest
 import warnings
 
 import numpy as np
-from numpy.testing import assert_allclose
+from numpy.testing import assert_allclose, assert_array_equal
 
 from distarray.testing import ContextTestCase
+from distarray.dist.maps import Distribution
 import distarray.dist.functions as functions
 
 
@@ -121,6 +122,323 @@ binary_ops = ('add', 'arctan2', 'divide', 'floor_divide', 'fmod', 'hypot',
               'greater_equal', 'mod', 'bitwise_and', 'bitwise_or',
               'bitwise_xor', 'left_shift', 'right_shift',)
 
+class TestSort(ContextTestCase):
+    """Test the distributed sample sort."""
+
+    def check_sort(self, arr, dist=None, grid_shape=None):
+        distribution = Distribution.from_shape(self.context, arr.shape, dist,
+                                               grid_shape)
+        darr = self.context.fromndarray(arr, distribution)
+        result = functions.sort(darr)
+        self.assertEqual(result.distribution.dist[0], 'b')
+        assert_array_equal(result.tondarray(), np.sort(arr, axis=0))
+        assert_array_equal(functions.argsort(darr).tondarray(),
+                           np.argsort(arr, axis=0, kind='mergesort'))
+
+    def test_1d(self):
+        self.check_sort(np.random.RandomState(0).permutation(100))
+
+    def test_1d_float_duplicates(self):
+        arr = np.random.RandomState(1).randint(0, 5, size=57) / 2.0
+        self.check_sort(arr)
+
+    def test_1d_cyclic(self):
+        arr = np.random.RandomState(2).normal(size=41)
+        self.check_sort(arr, ('c',))
+
+    def test_1d_already_sorted(self):
+        self.check_sort(np.arange(30))
+
+    def test_fewer_elements_than_engines(self):
+        self.check_sort(np.array([3, 1]))
+
+    def test_2d_block_rows(self):
+        arr = np.random.RandomState(3).randint(-50, 50, size=(23, 3))
+        self.check_sort(arr, ('b', 'n'))
+
+    def test_balanced_output(self):
+        arr = np.zeros(40)
+        arr[:4] = np.arange(4)
+        distribution = Distribution.from_shape(self.context, arr.shape)
+        darr = self.context.fromndarray(arr, distribution)
+        result = functions.sort(darr)
+        sizes = [len(local) for local in result.get_ndarrays()]
+        self.assertEqual(sizes, [10, 10, 10, 10])
+
+    def test_2d_distributed_columns(self):
+        distribution = Distribution.from_shape(self.context, (4, 4),
+                                               ('b', 'b'), (2, 2))
+        darr = self.context.zeros(distribution)
+        with self.assertRaises(ValueError):
+            functions.sort(darr)
+
+
+class TestDot(ContextTestCase):
+    """Test distributed matrix products."""
+
+    def fromndarray(self, arr, dist=None, grid_shape=None):
+        distribution = Distribution.from_shape(self.context, arr.shape, dist,
+                                               grid_shape)
+        return self.context.fromndarray(arr, distribution)
+
+    def test_summa(self):
+        a = np.arange(35, dtype=float).reshape(5, 7)
+        b = np.arange(21, dtype=float).reshape(7, 3) - 10
+        da = self.fromndarray(a, ('b', 'b'), (2, 2))
+        db = self.fromndarray(b, ('b', 'b'), (2, 2))
+        result = functions.dot(da, db)
+        self.assertEqual(result.shape, (5, 3))
+        assert_allclose(result.tondarray(), np.dot(a, b))
+
+    def test_matmul_operator(self):
+        a = np.random.RandomState(0).normal(size=(6, 6))
+        da = self.fromndarray(a, ('b', 'b'), (2, 2))
+        assert_allclose((da @ da).tondarray(), a @ a)
+
+    def test_summa_mixed_dtypes_block_rows(self):
+        a = np.arange(24).reshape(8, 3)
+        b = np.linspace(0, 1, 6).reshape(3, 2)
+        da = self.fromndarray(a, ('b', 'n'))
+        db = self.fromndarray(b, ('b', 'n'))
+        result = functions.dot(da, db)
+        self.assertEqual(result.dtype, np.dtype(float))
+        assert_allclose(result.tondarray(), np.dot(a, b))
+
+    def test_matvec(self):
+        a = np.arange(30, dtype=float).reshape(6, 5)
+        v = np.arange(5, dtype=float) - 2
+        da = self.fromndarray(a, ('b', 'b'), (2, 2))
+        dv = self.fromndarray(v, ('c',))
+        assert_allclose(functions.dot(da, dv).tondarray(), np.dot(a, v))
+        w = np.arange(6, dtype=float)
+        dw = self.fromndarray(w)
+        assert_allclose(functions.dot(dw, da).tondarray(), np.dot(w, a))
+
+    def test_matvec_aligned(self):
+        """A vector distributed like the columns needs no exchange."""
+        a = np.arange(32, dtype=float).reshape(4, 8)
+        v = np.arange(8, dtype=float) - 2
+        da = self.fromndarray(a, ('n', 'b'))
+        dv = self.fromndarray(v, ('b',))
+        assert_allclose(functions.dot(da, dv).tondarray(), np.dot(a, v))
+
+    def test_inner(self):
+        a = np.arange(10)
+        b = np.arange(10) * 0.5
+        result = functions.dot(self.fromndarray(a), self.fromndarray(b))
+        self.assertEqual(result.ndim, 0)
+        assert_allclose(result.tondarray(), np.dot(a, b))
+
+    def test_not_aligned(self):
+        da = self.fromndarray(np.ones((4, 4)), ('b', 'b'), (2, 2))
+        db = self.fromndarray(np.ones((3, 4)), ('b', 'b'), (2, 2))
+        with self.assertRaises(ValueError):
+            functions.dot(da, db)
+
+    def test_cyclic_matrix(self):
+        da = self.fromndarray(np.ones((4, 4)), ('c', 'c'), (2, 2))
+        with self.assertRaises(ValueError):
+            functions.dot(da, da)
+
+
+def reference_stencil(arr, weights, periodic=False, cval=0.0):
+    """Apply a stencil with NumPy, for comparison."""
+    radii = [n // 2 for n in weights.shape]
+    if periodic:
+        padded = np.pad(arr, [(r, r) for r in radii], mode='wrap')
+    else:
+        padded = np.pad(arr, [(r, r) for r in radii], mode='constant',
+                        constant_values=cval)
+    out = np.zeros(arr.shape, dtype=np.result_type(arr, weights))
+    for k in zip(*np.nonzero(weights)):
+        out += weights[k] * padded[tuple(slice(ki, ki + n) for (ki, n) in
+                                         zip(k, arr.shape))]
+    return out
+
+
+class TestStencils(ContextTestCase):
+    """Test stencil operators."""
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestStencils, cls).setUpClass()
+        cls.arr = np.random.RandomState(0).normal(size=(8, 10))
+        cls.distribution = Distribution.from_shape(cls.context, (8, 10),
+                                                   ('b', 'b'), (2, 2))
+        cls.darr = cls.context.fromndarray(cls.arr, cls.distribution)
+
+    def test_laplacian(self):
+        weights = np.array([[0, 1, 0], [1, -4, 1], [0, 1, 0]], dtype=float)
+        assert_allclose(functions.laplacian(self.darr).tondarray(),
+                        reference_stencil(self.arr, weights))
+        assert_allclose(
+            functions.laplacian(self.darr, periodic=True).tondarray(),
+            reference_stencil(self.arr, weights, periodic=True))
+
+    def test_apply_stencil_with_corners(self):
+        weights = np.arange(9, dtype=float).reshape(3, 3)
+        result = functions.apply_stencil(self.darr, weights, cval=2.0)
+        assert_allclose(result.tondarray(),
+                        reference_stencil(self.arr, weights, cval=2.0))
+        result = functions.apply_stencil(self.darr, weights, periodic=True)
+        assert_allclose(result.tondarray(),
+                        reference_stencil(self.arr, weights, periodic=True))
+
+    def test_wide_stencil_with_halo(self):
+        distribution = Distribution.from_shape(self.context, (8, 10),
+                                               ('b', 'b'), (2, 2), halo=2)
+        darr = self.context.fromndarray(self.arr, distribution)
+        weights = np.zeros((5, 1))
+        weights[:, 0] = [1, -2, 3, -4, 5]
+        result = functions.apply_stencil(darr, weights, periodic=True)
+        assert_allclose(result.tondarray(),
+                        reference_stencil(self.arr, weights, periodic=True))
+
+    def test_convolve(self):
+        arr = np.arange(12.0)
+        darr = self.context.fromndarray(arr)
+        kernel = np.array([1.0, 2.0, 4.0])
+        assert_allclose(functions.convolve(darr, kernel).tondarray(),
+                        np.convolve(arr, kernel, mode='same'))
+
+    def test_gradient(self):
+        gy, gx = functions.gradient(self.darr, spacing=(0.5, 2.0))
+        ny, nx = np.gradient(self.arr, 0.5, 2.0)
+        assert_allclose(gy.tondarray(), ny)
+        assert_allclose(gx.tondarray(), nx)
+
+    def test_gradient_1d(self):
+        arr = np.arange(9.0) ** 2
+        darr = self.context.fromndarray(arr)
+        assert_allclose(functions.gradient(darr).tondarray(),
+                        np.gradient(arr))
+
+    def test_diff(self):
+        for axis in (0, 1):
+            result = functions.diff(self.darr, axis=axis)
+            self.assertEqual(result.shape, np.diff(self.arr, axis=axis).shape)
+            assert_allclose(result.tondarray(), np.diff(self.arr, axis=axis))
+        arr = np.arange(10) ** 3
+        darr = self.context.fromndarray(arr)
+        assert_array_equal(functions.diff(darr, n=2).tondarray(),
+                           np.diff(arr, n=2))
+
+    def test_even_weights(self):
+        with self.assertRaises(ValueError):
+            functions.apply_stencil(self.darr, np.ones((2, 3)))
+
+
+class TestConcatenate(ContextTestCase):
+    """Test concatenate and stack."""
+
+    def fromndarray(self, arr, dist, grid_shape=None, targets=None):
+        distribution = Distribution.from_shape(self.context, arr.shape, dist,
+                                               grid_shape, targets=targets)
+        return self.context.fromndarray(arr, distribution)
+
+    def test_undistributed_axis(self):
+        a = np.arange(12).reshape(3, 4)
+        b = np.arange(8).reshape(2, 4) * 10
+        da = self.fromndarray(a, ('n', 'b'))
+        db = self.fromndarray(b, ('n', 'b'))
+        result = functions.concatenate([da, db])
+        self.assertEqual(result.distribution.dist, ('n', 'b'))
+        self.assertEqual(result.targets, da.targets)
+        assert_array_equal(result.tondarray(), np.concatenate([a, b]))
+
+    def test_append_blocks_on_new_targets(self):
+        a = np.arange(10).reshape(5, 2)
+        b = np.arange(6).reshape(3, 2) + 100
+        da = self.fromndarray(a, ('b', 'n'), targets=[0, 1])
+        db = self.fromndarray(b, ('b', 'n'), targets=[2, 3])
+        result = functions.concatenate([da, db], axis=0)
+        self.assertEqual(result.targets, [0, 1, 2, 3])
+        self.assertEqual(result.distribution[0].bounds,
+                         [(0, 3), (3, 5), (5, 7), (7, 8)])
+        assert_array_equal(result.tondarray(), np.concatenate([a, b]))
+
+    def test_redistribute(self):
+        a = np.arange(20.0).reshape(4, 5)
+        b = np.arange(15).reshape(3, 5)
+        da = self.fromndarray(a, ('b', 'b'), (2, 2))
+        db = self.fromndarray(b, ('b', 'n'))
+        for axis, arrays in [(0, [a, b, a]), (1, [a, a.T[:4]])]:
+            darrays = [da, db, da] if axis == 0 else \
+                [da, self.fromndarray(a.T[:4], ('b', 'n'), targets=[1, 2])]
+            result = functions.concatenate(darrays, axis=axis)
+            self.assertEqual(result.dtype, np.float64)
+            assert_array_equal(result.tondarray(),
+                               np.concatenate(arrays, axis=axis))
+
+    def test_stack(self):
+        a = np.arange(6).reshape(2, 3)
+        da = self.fromndarray(a, ('b', 'n'), targets=[0, 1])
+        db = self.fromndarray(a + 10, ('b', 'n'), targets=[2, 3])
+        for axis in (0, 1, -1):
+            assert_array_equal(functions.stack([da, db], axis).tondarray(),
+                               np.stack([a, a + 10], axis))
+
+    def test_mismatched_shapes(self):
+        da = self.fromndarray(np.zeros((2, 3)), ('b', 'n'))
+        db = self.fromndarray(np.zeros((2, 4)), ('b', 'n'))
+        with self.assertRaises(ValueError):
+            functions.concatenate([da, db], axis=0)
+        with self.assertRaises(ValueError):
+            functions.stack([da, db])
+
+
+class TestHistogram(ContextTestCase):
+    """Test histogram, bincount and digitize."""
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestHistogram, cls).setUpClass()
+        cls.arr = np.random.RandomState(0).normal(size=(6, 7))
+        distribution = Distribution.from_shape(cls.context, cls.arr.shape,
+                                               ('b', 'c'), (2, 2))
+        cls.darr = cls.context.fromndarray(cls.arr, distribution)
+
+    def test_histogram(self):
+        for kwargs in [{}, {'bins': 4}, {'bins': 5, 'range': (-1, 1)},
+                       {'bins': [-3, -1, 0, 0.5, 3]},
+                       {'bins': 6, 'density': True}]:
+            hist, edges = functions.histogram(self.darr, **kwargs)
+            expected_hist, expected_edges = np.histogram(self.arr, **kwargs)
+            assert_allclose(hist, expected_hist)
+            assert_allclose(edges, expected_edges)
+
+    def test_histogram_weights(self):
+        weights = self.darr * 2
+        hist, edges = functions.histogram(self.darr, 3, weights=weights)
+        expected = np.histogram(self.arr, 3, weights=self.arr * 2)
+        assert_allclose(hist, expected[0])
+        assert_allclose(edges, expected[1])
+
+    def test_bincount(self):
+        # 9 elements over 4 engines, so one section is empty.
+        arr = np.array([3, 0, 1, 3, 3, 7, 1, 0, 2])
+        darr = self.context.fromndarray(arr)
+        assert_array_equal(functions.bincount(darr), np.bincount(arr))
+        assert_array_equal(functions.bincount(darr, minlength=12),
+                           np.bincount(arr, minlength=12))
+        weights = self.context.fromndarray(np.linspace(0, 1, 9))
+        assert_allclose(functions.bincount(darr, weights),
+                        np.bincount(arr, np.linspace(0, 1, 9)))
+
+    def test_bincount_negative(self):
+        darr = self.context.fromndarray(np.array([1, -1, 2, 3]))
+        with self.assertRaises(Exception):
+            functions.bincount(darr)
+
+    def test_digitize(self):
+        bins = [-1, 0, 1]
+        for right in (False, True):
+            result = functions.digitize(self.darr, bins, right)
+            self.assertEqual(result.distribution, self.darr.distribution)
+            assert_array_equal(result.tondarray(),
+                               np.digitize(self.arr, bins, right))
+
+
 binary_special_methods = ('__lt__', '__le__', '__eq__', '__ne__', '__gt__',
                           '__ge__', '__add__', '__sub__', '__mul__',
                           '__floordiv__', '__mod__', '__pow__', '__radd__',
@@ -138,5 +456,88 @@ add_checkers(TestDistArrayUfuncs, unary_ops, 'check_unary_op')
 add_checkers(TestSpecialMethods, binary_special_methods, 'check_op')
 
 
+
+class TestUnique(ContextTestCase):
+    """Test unique and value_counts."""
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestUnique, cls).setUpClass()
+        cls.arr = np.random.RandomState(0).randint(0, 20, size=(9, 7))
+        distribution = Distribution.from_shape(cls.context, cls.arr.shape,
+                                               ('b', 'b'), (2, 2))
+        cls.darr = cls.context.fromndarray(cls.arr, distribution)
+
+    def test_unique_gathered(self):
+        values, counts = np.unique(self.arr, return_counts=True)
+        assert_array_equal(functions.unique(self.darr), values)
+        result = functions.unique(self.darr, return_counts=True)
+        assert_array_equal(result[0], values)
+        assert_array_equal(result[1], counts)
+
+    def test_unique_distributed(self):
+        values, counts = functions.unique(self.darr, return_counts=True,
+                                          gather=False)
+        self.assertEqual(values.distribution, counts.distribution)
+        self.assertEqual(values.targets, self.darr.targets)
+        values, counts = values.tondarray(), counts.tondarray()
+        order = np.argsort(values)
+        expected = np.unique(self.arr, return_counts=True)
+        assert_array_equal(values[order], expected[0])
+        assert_array_equal(counts[order], expected[1])
+
+    def test_unique_floats(self):
+        arr = np.array([0.0, -0.0, 1.5, np.inf, 1.5, -2.0, 0.0])
+        darr = self.context.fromndarray(arr)
+        assert_array_equal(functions.unique(darr), np.unique(arr))
+
+    def test_value_counts(self):
+        arr = np.array([3, 1, 3, 2, 3, 1, 7, 7, 7, 7])
+        darr = self.context.fromndarray(arr)
+        values, counts = functions.value_counts(darr)
+        assert_array_equal(values, [7, 3, 1, 2])
+        assert_array_equal(counts, [4, 3, 2, 1])
+
+
+
+class TestCovariance(ContextTestCase):
+    """Test cov and corrcoef."""
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestCovariance, cls).setUpClass()
+        rng = np.random.RandomState(0)
+        cls.arr = rng.rand(37, 4) + 1e6
+        cls.arr[:, 3] = 2 * cls.arr[:, 0] + 0.1 * rng.rand(37)
+        distribution = Distribution.from_shape(cls.context, cls.arr.shape,
+                                               ('b', 'n'))
+        cls.darr = cls.context.fromndarray(cls.arr, distribution)
+
+    def test_cov(self):
+        assert_allclose(functions.cov(self.darr),
+                        np.cov(self.arr, rowvar=False), rtol=1e-8)
+        assert_allclose(functions.cov(self.darr, ddof=0),
+                        np.cov(self.arr, rowvar=False, ddof=0), rtol=1e-8)
+
+    def test_cov_1d(self):
+        darr = self.context.fromndarray(self.arr[:, 0])
+        assert_allclose(functions.cov(darr), np.cov(self.arr[:, 0]))
+
+    def test_corrcoef(self):
+        assert_allclose(functions.corrcoef(self.darr),
+                        np.corrcoef(self.arr, rowvar=False), rtol=1e-8)
+
+    def test_column_distributed(self):
+        distribution = Distribution.from_shape(self.context, (8, 8),
+                                               ('n', 'b'))
+        darr = self.context.zeros(distribution)
+        with self.assertRaises(ValueError):
+            functions.cov(darr)
+
+    def test_cov_too_few_observations(self):
+        with self.assertRaises(ValueError):
+            functions.cov(self.darr, ddof=37)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,156 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Tests for distarray.dist.linalg.
+
+Many of these tests require a 4-engine cluster to be running locally.
+"""
+
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from distarray.testing import ContextTestCase
+from distarray.dist import linalg
+from distarray.dist.maps import Distribution
+from distarray.dist.sparse import CSRMatrix
+
+
+class TestKrylovSolvers(ContextTestCase):
+
+    n = 30
+
+    def matrix(self, shift=0.0):
+        """A tridiagonal matrix, symmetric positive definite unless
+        `shift` is nonzero, as a CSRMatrix and a dense ndarray."""
+        i = np.arange(self.n)
+        rows = np.concatenate((i, i[1:], i[:-1]))
+        cols = np.concatenate((i, i[1:] - 1, i[:-1] + 1))
+        data = np.concatenate((3.0 * np.ones(self.n),
+                               -np.ones(self.n - 1) - shift,
+                               -np.ones(self.n - 1) + shift))
+        dense = np.zeros((self.n, self.n))
+        dense[rows, cols] = data
+        distribution = Distribution.from_shape(self.context, rows.shape)
+        triplets = [self.context.fromndarray(arr, distribution)
+                    for arr in (rows, cols, data)]
+        return CSRMatrix.from_coo(*triplets), dense
+
+    def rhs(self, matrix):
+        b = np.random.RandomState(0).rand(self.n)
+        return b, self.context.fromndarray(b, matrix.distribution)
+
+    def test_cg(self):
+        matrix, dense = self.matrix()
+        b, db = self.rhs(matrix)
+        x, info = linalg.cg(matrix, db, tol=1e-10)
+        self.assertTrue(info['converged'])
+        self.assertLessEqual(info['residual'], 1e-10 * np.linalg.norm(b))
+        assert_allclose(dense.dot(x.tondarray()), b, rtol=1e-8)
+
+    def test_bicgstab(self):
+        matrix, dense = self.matrix(shift=0.5)
+        b, db = self.rhs(matrix)
+        x, info = linalg.bicgstab(matrix, db, tol=1e-10)
+        self.assertTrue(info['converged'])
+        assert_allclose(dense.dot(x.tondarray()), b, rtol=1e-8)
+
+    def test_callable_operator(self):
+        for (solve, shift) in ((linalg.cg, 0.0), (linalg.bicgstab, 0.5)):
+            matrix, dense = self.matrix(shift)
+            b, db = self.rhs(matrix)
+            x0 = self.context.fromndarray(np.ones(self.n),
+                                          matrix.distribution)
+            x, info = solve(matrix.dot, db, x0=x0, tol=1e-10, check_every=3)
+            self.assertTrue(info['converged'])
+            assert_allclose(dense.dot(x.tondarray()), b, rtol=1e-8)
+
+    def test_callable_elementwise_operator(self):
+        diagonal = np.arange(1.0, self.n + 1)
+        distribution = Distribution.from_shape(self.context, (self.n,))
+        d = self.context.fromndarray(diagonal, distribution)
+        b = self.context.fromndarray(np.ones(self.n), distribution)
+        x, info = linalg.cg(lambda v: d * v, b, tol=1e-12)
+        self.assertTrue(info['converged'])
+        assert_allclose(x.tondarray(), 1 / diagonal)
+
+    def test_maxiter(self):
+        matrix, _ = self.matrix(shift=0.5)
+        _, db = self.rhs(matrix)
+        x, info = linalg.bicgstab(matrix, db, tol=1e-15, maxiter=3)
+        self.assertFalse(info['converged'])
+        self.assertEqual(info['iterations'], 3)
+
+    def test_misdistributed_rhs(self):
+        matrix, _ = self.matrix()
+        b = self.context.fromndarray(np.ones(self.n),
+                                     Distribution.from_shape(self.context,
+                                                             (self.n,),
+                                                             ('c',)))
+        with self.assertRaises(ValueError):
+            linalg.cg(matrix, b)
+
+
+class TestTallSkinny(ContextTestCase):
+
+    def fromndarray(self, arr, dist=('b', 'n')):
+        distribution = Distribution.from_shape(self.context, arr.shape,
+                                               dist[:arr.ndim])
+        return self.context.fromndarray(arr, distribution)
+
+    def random(self, *shape):
+        return np.random.RandomState(0).rand(*shape)
+
+    def test_tsqr(self):
+        a = self.random(41, 5)
+        da = self.fromndarray(a)
+        q, r = linalg.tsqr(da)
+        self.assertTrue(q.distribution.is_compatible(da.distribution))
+        self.assertEqual(r.shape, (5, 5))
+        q = q.tondarray()
+        assert_allclose(q.dot(r), a, atol=1e-12)
+        assert_allclose(q.T.dot(q), np.eye(5), atol=1e-12)
+
+    def test_tsqr_wide(self):
+        a = self.random(3, 5)
+        q, r = linalg.tsqr(self.fromndarray(a))
+        self.assertEqual((q.shape, r.shape), ((3, 3), (3, 5)))
+        assert_allclose(q.tondarray().dot(r), a, atol=1e-12)
+
+    def test_tsqr_column_distributed(self):
+        with self.assertRaises(ValueError):
+            linalg.tsqr(self.fromndarray(self.random(8, 8), ('n', 'b')))
+
+    def test_svd(self):
+        a = self.random(41, 5)
+        u, s, vt = linalg.svd(self.fromndarray(a))
+        u = u.tondarray()
+        assert_allclose((u * s).dot(vt), a, atol=1e-12)
+        assert_allclose(s, np.linalg.svd(a, compute_uv=False))
+
+    def test_lstsq(self):
+        rng = np.random.RandomState(0)
+        a, coef = rng.rand(41, 3), np.array([1.0, -2.0, 3.0])
+        b = a.dot(coef) + 1e-3 * rng.rand(41)
+        x, residuals, rank, s = linalg.lstsq(self.fromndarray(a),
+                                             self.fromndarray(b))
+        self.assertEqual(x.shape, (3,))
+        self.assertEqual(rank, 3)
+        residual = b - a.dot(x)
+        assert_allclose(a.T.dot(residual), 0, atol=1e-12)
+        assert_allclose(residuals, [residual.dot(residual)])
+
+    def test_lstsq_misdistributed_rhs(self):
+        a = self.fromndarray(self.random(12, 3))
+        b = self.fromndarray(self.random(12), ('c',))
+        with self.assertRaises(ValueError):
+            linalg.lstsq(a, b)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -140,6 +140,49 @@ class TestDistributionCreation(ContextTestCase):
                                                           dist=('n', 'n'))
         self.context.ones(distribution)
 
+    def test_global_dim_data_with_n_dist(self):
+        global_dim_data = ({'dist_type': 'n', 'size': 3},
+                           {'dist_type': 'b', 'bounds': [0, 1, 2, 4, 5]})
+        distribution = client_map.Distribution(self.context, global_dim_data)
+        self.assertEqual(distribution.dist, ('n', 'b'))
+        self.assertEqual(distribution.grid_shape, (1, 4))
+        self.context.ones(distribution)
+
+    def test_weights(self):
+        # Rows 24-31 cost three times as much as the others.
+        weights = [1] * 24 + [3] * 8
+        distribution = client_map.Distribution.from_shape(
+            self.context, (32, 5), dist=('b', 'n'), weights={0: weights})
+        self.assertEqual(distribution.maps[0].bounds,
+                         [(0, 12), (12, 24), (24, 28), (28, 32)])
+        darr = self.context.ones(distribution)
+        self.assertEqual(darr.sum().tondarray(), 160)
+
+    def test_weights_on_cyclic_dimension(self):
+        with self.assertRaises(ValueError):
+            client_map.Distribution.from_shape(self.context, (8,), ('c',),
+                                               weights={0: [1] * 8})
+
+    def test_from_cost(self):
+        distribution = client_map.Distribution.from_cost(
+            self.context, (40, 6), lambda i, j: 1 if i < 20 else 3,
+            dist=('b', 'n'), samples=10)
+        sizes = [stop - start for (start, stop) in distribution.maps[0].bounds]
+        self.assertEqual(sum(sizes), 40)
+        self.assertTrue(sizes[0] > sizes[-1])
+        self.context.ones(distribution)
+
+    def test_whole_shape_weights(self):
+        """Does a cost array of the whole shape weight only the
+        block-distributed dimension?"""
+        cost = [[1] * 5] * 24 + [[3] * 5] * 8
+        distribution = client_map.Distribution.from_shape(
+            self.context, (32, 5), weights=cost)
+        self.assertEqual(distribution.dist, ('b', 'n'))
+        self.assertEqual(distribution.maps[0].bounds,
+                         [(0, 12), (12, 24), (24, 28), (28, 32)])
+        self.context.ones(distribution)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,87 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Tests for distarray.dist.sparse.
+
+Many of these tests require a 4-engine cluster to be running locally.
+"""
+
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from distarray.testing import ContextTestCase
+from distarray.dist.maps import Distribution
+from distarray.dist.sparse import CSRMatrix
+
+
+class TestCSRMatrix(ContextTestCase):
+
+    def triplets(self, n):
+        """The COO triplets of the 1-D Laplacian with periodic boundary,
+        in shuffled order, and the dense matrix."""
+        i = np.arange(n)
+        rows = np.concatenate((i, i, i))
+        cols = np.concatenate((i, (i - 1) % n, (i + 1) % n))
+        data = np.concatenate((2.0 * np.ones(n), -np.ones(n), -np.ones(n)))
+        order = np.random.RandomState(0).permutation(len(rows))
+        dense = np.zeros((n, n))
+        dense[rows, cols] = data
+        return rows[order], cols[order], data[order], dense
+
+    def distribute(self, *arrays):
+        distribution = Distribution.from_shape(self.context,
+                                               arrays[0].shape, ('c',))
+        return [self.context.fromndarray(arr, distribution)
+                for arr in arrays]
+
+    def test_dot(self):
+        rows, cols, data, dense = self.triplets(10)
+        matrix = CSRMatrix.from_coo(*self.distribute(rows, cols, data))
+        self.assertEqual(matrix.shape, (10, 10))
+        self.assertEqual(matrix.nnz, 30)
+
+        x = np.random.RandomState(1).rand(10)
+        dx = self.context.fromndarray(x, matrix.col_distribution)
+        for _ in range(3):
+            dx = matrix.dot(dx)
+            x = dense.dot(x)
+            assert_allclose(dx.tondarray(), x)
+
+    def test_rectangular_with_duplicates(self):
+        rows = np.array([0, 3, 3, 5, 1])
+        cols = np.array([7, 0, 0, 2, 7])
+        data = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+        dense = np.zeros((6, 8))
+        np.add.at(dense, (rows, cols), data)
+        matrix = CSRMatrix.from_coo(*self.distribute(rows, cols, data),
+                                    shape=(6, 8))
+        self.assertEqual(matrix.nnz, 4)
+        x = np.arange(8.0)
+        dx = self.context.fromndarray(x, matrix.col_distribution)
+        y = matrix.dot(dx)
+        self.assertEqual(y.distribution.shape, (6,))
+        assert_allclose(y.tondarray(), dense.dot(x))
+
+    def test_dot_misdistributed_vector(self):
+        rows, cols, data, _ = self.triplets(8)
+        matrix = CSRMatrix.from_coo(*self.distribute(rows, cols, data))
+        x = self.context.fromndarray(np.ones(8), Distribution.from_shape(
+            self.context, (8,), ('c',)))
+        with self.assertRaises(ValueError):
+            matrix.dot(x)
+
+    def test_column_out_of_bounds(self):
+        arrays = self.distribute(np.array([0, 1]), np.array([0, 4]),
+                                 np.ones(2))
+        with self.assertRaises(Exception):
+            CSRMatrix.from_coo(*arrays, shape=(2, 4))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
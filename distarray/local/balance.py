@@ -0,0 +1,202 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Dynamic load balancing of elementwise functions by work stealing.
+
+`balanced_vectorize` applies a vectorized function to the local blocks of
+LocalArrays that share a distribution, as applying it to each whole block
+would, but splits every block into chunks.  A rank computes its own chunks
+from the front; once it has none left it asks the other ranks, nearest
+first, for chunks from the back of theirs, and sends the results back to
+their owner.  Requests are answered between chunks, so a rank whose
+elements are costly is relieved by the others, and the runtime follows the
+total cost instead of the cost of the most expensive block.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from distarray.local.localarray import LocalArray
+from distarray.local.mpiutils import MPI
+
+
+# Message tags: a request for a chunk, the reply (the chunk's inputs, or
+# None if the owner has none left), and the result of a stolen chunk.
+_REQUEST, _REPLY, _RESULT = 1, 2, 3
+
+
+def _victims(rank, size):
+    """ The ranks other than `rank`, nearest first.  Internal."""
+    order = []
+    for distance in range(1, size):
+        for victim in ((rank + distance) % size, (rank - distance) % size):
+            if victim != rank and victim not in order:
+                order.append(victim)
+    return order
+
+
+class _Stealer(object):
+    """ The state of one rank in `balanced_vectorize`.  Internal."""
+
+    def __init__(self, func, comm, args, kwargs, chunks):
+        self.func, self.comm = func, comm
+        self.args, self.kwargs = args, kwargs
+        self.arg_slots = [i for (i, arg) in enumerate(args)
+                          if isinstance(arg, LocalArray)]
+        self.kwarg_slots = sorted(name for (name, arg) in kwargs.items()
+                                  if isinstance(arg, LocalArray))
+        arrays = ([args[i] for i in self.arg_slots] +
+                  [kwargs[name] for name in self.kwarg_slots])
+        self.template = arrays[0]
+        self.flat = [arr.ndarray.reshape(-1) for arr in arrays]
+        size = self.template.ndarray.size
+        edges = np.linspace(0, size, min(chunks, size) + 1).astype(int)
+        self.bounds = list(zip(edges[:-1], edges[1:]))
+        self.todo = deque(range(len(self.bounds)))
+        self.results = {}
+        self.lent = 0
+        self.sends = []
+
+    def inputs(self, chunk):
+        start, stop = self.bounds[chunk]
+        return [flat[start:stop] for flat in self.flat]
+
+    def compute(self, pieces):
+        """ Call the function on the pieces of the arrays of a chunk, in
+        place of the LocalArrays among the arguments."""
+        args, kwargs = list(self.args), dict(self.kwargs)
+        for (i, piece) in zip(self.arg_slots, pieces):
+            args[i] = piece
+        for (name, piece) in zip(self.kwarg_slots,
+                                 pieces[len(self.arg_slots):]):
+            kwargs[name] = piece
+        return self.func(*args, **kwargs)
+
+    def store(self, chunk, result):
+        self.results[chunk] = np.asarray(result)
+
+    def send(self, message, dest, tag):
+        self.sends.append(self.comm.isend(message, dest=dest, tag=tag))
+
+    def serve(self, status):
+        """ Receive the request or result that `status` describes."""
+        source, tag = status.Get_source(), status.Get_tag()
+        message = self.comm.recv(source=source, tag=tag)
+        if tag == _REQUEST:
+            reply = None
+            if self.todo:
+                chunk = self.todo.pop()
+                reply = (chunk, self.inputs(chunk))
+                self.lent += 1
+            self.send(reply, source, _REPLY)
+        else:
+            self.store(*message)
+            self.lent -= 1
+
+    def run(self):
+        comm, status = self.comm, MPI.Status()
+
+        # Own chunks, answering the requests that came in meanwhile.
+        while self.todo:
+            while comm.Iprobe(source=MPI.ANY_SOURCE, tag=MPI.ANY_TAG,
+                              status=status):
+                self.serve(status)
+            if self.todo:
+                chunk = self.todo.popleft()
+                self.store(chunk, self.compute(self.inputs(chunk)))
+
+        # Steal from the other ranks until none has chunks left.
+        stolen = 0
+        victims = deque(_victims(comm.Get_rank(), comm.Get_size()))
+        while victims:
+            self.send(None, victims[0], _REQUEST)
+            while True:
+                comm.Probe(source=MPI.ANY_SOURCE, tag=MPI.ANY_TAG,
+                           status=status)
+                if status.Get_tag() == _REPLY:
+                    break
+                self.serve(status)
+            reply = comm.recv(source=victims[0], tag=_REPLY)
+            if reply is None:
+                victims.popleft()
+            else:
+                chunk, pieces = reply
+                self.send((chunk, self.compute(pieces)), victims[0],
+                          _RESULT)
+                stolen += 1
+
+        # Wait for the results of the chunks stolen from this rank.
+        while self.lent:
+            comm.Probe(source=MPI.ANY_SOURCE, tag=MPI.ANY_TAG, status=status)
+            self.serve(status)
+
+        # Every rank sends its last request before entering the barrier, so
+        # once it completes nothing more is asked of this one.
+        barrier = comm.Ibarrier()
+        while not barrier.Test():
+            if comm.Iprobe(source=MPI.ANY_SOURCE, tag=MPI.ANY_TAG,
+                           status=status):
+                self.serve(status)
+        MPI.Request.Waitall(self.sends)
+        return stolen
+
+    def output(self):
+        """ The results as a LocalArray distributed like the inputs.
+
+        Every rank allocates it with the dtype that the results of all
+        ranks promote to, so ranks without elements agree with the others.
+        """
+        local = [result.dtype for result in self.results.values()]
+        local = np.result_type(*local).str if local else None
+        dtypes = [d for d in self.comm.allgather(local) if d is not None]
+        dtype = np.result_type(*dtypes) if dtypes else self.template.dtype
+        out = LocalArray(self.template.distribution, dtype=dtype)
+        flat = np.empty(out.ndarray.size, dtype=dtype)
+        for (chunk, result) in self.results.items():
+            start, stop = self.bounds[chunk]
+            flat[start:stop] = result
+        out.ndarray[...] = flat.reshape(out.ndarray.shape)
+        return out
+
+
+def balanced_vectorize(func, comm, args, kwargs, chunks=16):
+    """ Apply the vectorized `func` to LocalArrays, stealing work between
+    the ranks of `comm`.
+
+    Collective over `comm`.
+
+    Parameters
+    ----------
+    func : callable
+        An elementwise function of ndarrays, such as the result of
+        `numpy.vectorize`.
+    comm : MPI Comm instance
+        A communicator of the ranks holding the LocalArrays.
+    args : sequence
+        The positional arguments of `func`.  The LocalArrays among them must
+        share a distribution; their pieces are passed in their place.  The other arguments are passed unchanged, and must be the
+        same on every rank.
+    kwargs : dict
+        The keyword arguments of `func`, as `args`.
+    chunks : int, optional
+        The number of chunks each local block is split into.
+
+    Returns
+    -------
+    (LocalArray, int)
+        The result, distributed like the LocalArrays among the arguments
+        and with the same dtype on every rank, and the number of chunks
+        this rank computed for other ranks.
+    """
+    comm = comm.Dup()
+    try:
+        stealer = _Stealer(func, comm, args, kwargs, chunks)
+        stolen = stealer.run()
+        return stealer.output(), stolen
+    finally:
+        comm.Free()
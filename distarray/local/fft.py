@@ -0,0 +1,143 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Multi-dimensional FFTs of block-distributed LocalArrays.
+
+One-dimensional FFTs (`numpy.fft`) are only ever taken along dimensions that
+are whole on every process.  A distributed dimension is made whole by a
+global transpose: within each line of the process grid along that dimension,
+an ``Alltoallv`` gathers it while splitting a neighbouring, already
+transformed dimension over the same processes.  With one distributed
+dimension this is the slab decomposition, with two the pencil decomposition.
+
+The transposes are planned on the client (see `distarray.dist.fft`); each is
+a tuple ``(grid_dim, src, dst, src_bounds, dst_bounds)``: the processes along
+dimension `grid_dim` of the process grid own `src` in blocks `src_bounds`
+and `dst` whole beforehand, and `src` whole and `dst` in blocks `dst_bounds`
+afterwards.
+"""
+
+from __future__ import division
+
+import numpy as np
+
+from distarray.externals.six.moves import range, zip
+
+from distarray.local import maps
+from distarray.local.localarray import LocalArray
+
+
+def _axis_slice(ndim, axis, start, stop):
+    index = [slice(None)] * ndim
+    index[axis] = slice(start, stop)
+    return tuple(index)
+
+
+def transpose(comm, data, src, dst, src_bounds, dst_bounds):
+    """ Make dimension `src` of `data` whole and split dimension `dst`.
+
+    Parameters
+    ----------
+    comm : MPI Comm instance
+        The processes along one line of the process grid, in grid order.
+    data : ndarray
+        The local block: dimension `src` is the block ``src_bounds[rank]``
+        and dimension `dst` is whole.
+    src, dst : int
+    src_bounds, dst_bounds : sequence of (start, stop) pairs
+        One pair per process of `comm`.
+
+    Returns
+    -------
+    ndarray
+        The local block, with dimension `src` whole and dimension `dst` the
+        block ``dst_bounds[rank]``.
+    """
+    rank = comm.Get_rank()
+    pieces = [np.ascontiguousarray(data[_axis_slice(data.ndim, dst, lo, hi)])
+              for (lo, hi) in dst_bounds]
+    send_counts = [piece.size for piece in pieces]
+    sendbuf = np.concatenate([piece.ravel() for piece in pieces])
+
+    dst_size = dst_bounds[rank][1] - dst_bounds[rank][0]
+    recv_shapes = []
+    for (lo, hi) in src_bounds:
+        shape = list(data.shape)
+        shape[src] = hi - lo
+        shape[dst] = dst_size
+        recv_shapes.append(shape)
+    recv_counts = [int(np.prod(shape)) for shape in recv_shapes]
+    recvbuf = np.empty(sum(recv_counts), dtype=data.dtype)
+    comm.Alltoallv([sendbuf, send_counts], [recvbuf, recv_counts])
+
+    received = np.split(recvbuf, np.cumsum(recv_counts)[:-1])
+    return np.concatenate([piece.reshape(shape) for (piece, shape)
+                           in zip(received, recv_shapes)], axis=src)
+
+
+def _global_transpose(larr, data, grid_dim, src, dst, src_bounds,
+                      dst_bounds):
+    """ `transpose` over the line of `larr`'s process grid along `grid_dim`.
+    Internal.
+    """
+    remain = [i == grid_dim for i in range(larr.ndim)]
+    comm = larr.distribution.comm.Sub(remain)
+    try:
+        return transpose(comm, data, src, dst, src_bounds, dst_bounds)
+    finally:
+        comm.Free()
+
+
+def fftn(larr, transposes, untransposes, out_comm, ddpr, kind='fft',
+         norm=None):
+    """ N-dimensional FFT of a block-distributed LocalArray.
+
+    Parameters
+    ----------
+    larr : LocalArray
+    transposes : sequence of tuples
+        The global transposes (see the module docstring).  The `src`
+        dimension of each is transformed once it has been made whole; the
+        dimensions that no transpose makes whole are transformed first.
+    untransposes : sequence of tuples
+        Further global transposes applied to the result.
+    out_comm : MPI Comm instance
+        The communicator of the result.
+    ddpr : sequence of dim-data tuples
+        The dim-data of the result for every rank of `out_comm`.
+    kind : {'fft', 'ifft', 'rfft'}, optional
+        With 'rfft', the last dimension, which must not be distributed, is
+        transformed first with `numpy.fft.rfft`.
+    norm : {None, 'ortho'}, optional
+        As for `numpy.fft`.
+
+    Returns
+    -------
+    LocalArray
+    """
+    transform = np.fft.ifft if kind == 'ifft' else np.fft.fft
+    data = larr.ndarray
+    distributed = set(t[1] for t in transposes)
+    local_axes = [axis for axis in range(larr.ndim) if axis not in distributed]
+    if kind == 'rfft':
+        data = np.fft.rfft(data, axis=-1, norm=norm)
+        local_axes.remove(larr.ndim - 1)
+    for axis in local_axes:
+        data = transform(data, axis=axis, norm=norm)
+
+    for (grid_dim, src, dst, src_bounds, dst_bounds) in transposes:
+        data = _global_transpose(larr, data, grid_dim, src, dst, src_bounds,
+                                 dst_bounds)
+        data = transform(data, axis=src, norm=norm)
+    for (grid_dim, src, dst, src_bounds, dst_bounds) in untransposes:
+        data = _global_transpose(larr, data, grid_dim, src, dst, src_bounds,
+                                 dst_bounds)
+
+    distribution = maps.Distribution(comm=out_comm,
+                                     dim_data=ddpr[out_comm.Get_rank()])
+    return LocalArray(distribution, dtype=data.dtype,
+                      buf=np.ascontiguousarray(data))
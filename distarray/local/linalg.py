@@ -0,0 +1,378 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Linear algebra on the local sections of distributed arrays.
+
+The Krylov solvers keep all of their vectors on the engines.  A solver asks
+for one product with the operator at a time: its `operand` is the vector to
+multiply next, and `step` takes the product and advances the iteration.
+The inner products that follow each product are computed together and
+summed with a single ``Allreduce``, so every rank knows the scalars of the
+recurrences and decides on convergence by itself.  The products can come
+from an operator on the engines (see `solve`) or from a client-side
+operator on DistArrays (see `distarray.dist.linalg`).
+
+The factorizations of 2-D arrays distributed by rows (`tsqr`, `svd`,
+`lstsq`) factor the local rows with `numpy.linalg.qr` and combine the small
+R factors in a binary tree of point-to-point messages.  Q is then formed
+locally by sending the combination factors back down the tree.
+"""
+
+from __future__ import division
+
+import numpy as np
+
+from distarray.local import maps
+from distarray.local.localarray import LocalArray
+from distarray.local.mpiutils import MPI
+
+
+def _fused_vdot(comm, pairs):
+    """ The inner products ``vdot(a, b)`` of the ndarrays in `pairs`,
+    summed over the ranks of `comm` with a single Allreduce.  Internal.
+    """
+    local = np.array([np.vdot(a, b) for (a, b) in pairs])
+    result = np.empty_like(local)
+    comm.Allreduce(local, result, op=MPI.SUM)
+    return result
+
+
+class _KrylovSolver(object):
+    """ State shared by the Krylov solvers.  Internal.
+
+    Parameters
+    ----------
+    b : LocalArray
+        The right-hand side.
+    x : LocalArray
+        The initial guess, distributed like `b`; updated in place.
+    ax : LocalArray
+        The product of the operator and the initial guess.
+    tol : float
+        The tolerance on the residual norm, relative to the norm of `b`.
+    maxiter : int
+        The maximum number of iterations.
+    """
+
+    def __init__(self, b, x, ax, tol, maxiter):
+        self.comm = b.comm
+        self.x = x
+        self.r = b.ndarray - ax.ndarray
+        self.tol = tol
+        self.maxiter = maxiter
+        self.iterations = 0
+        self.residual = None
+        self.converged = False
+        self.done = False
+
+    def _stop(self, residual):
+        """ Record `residual`, the norm of the current residual, and stop
+        the iteration if it is small enough or the iterations are spent.
+        """
+        self.residual = float(residual)
+        self.converged = self.residual <= self.threshold
+        self.done = self.converged or self.iterations >= self.maxiter
+        return self.done
+
+    def report(self):
+        """ The outcome of the iteration so far, as a dict. """
+        return {'converged': self.converged,
+                'iterations': self.iterations,
+                'residual': self.residual}
+
+
+class CGSolver(_KrylovSolver):
+    """ Conjugate gradients for Hermitian positive definite operators.
+
+    This is the Chronopoulos-Gear variant, in which the two inner products
+    of an iteration only depend on the product of the operator and the
+    residual, and so need a single Allreduce.  The residual norm that
+    decides convergence is available one product after the update that
+    produced it.  See `_KrylovSolver` for the parameters.
+    """
+
+    def __init__(self, b, x, ax, tol, maxiter):
+        super(CGSolver, self).__init__(b, x, ax, tol, maxiter)
+        bnorm = np.sqrt(_fused_vdot(self.comm, [(b.ndarray, b.ndarray)])[0])
+        self.threshold = tol * (bnorm.real or 1.0)
+        self.operand = LocalArray(b.distribution, buf=self.r)
+        self.p = np.zeros_like(self.r)
+        self.s = np.zeros_like(self.r)
+        self.alpha = self.gamma = None
+
+    def step(self, w):
+        """ Advance the iteration, given `w`, the product of the operator
+        and `operand`.
+        """
+        if self.done:
+            return
+        w = w.ndarray
+        gamma, delta = _fused_vdot(self.comm, [(self.r, self.r),
+                                               (self.r, w)]).real
+        if self._stop(np.sqrt(gamma)):
+            return
+        if self.gamma is None:
+            beta = 0.0
+            denominator = delta
+        else:
+            beta = gamma / self.gamma
+            denominator = delta - beta * gamma / self.alpha
+        if denominator == 0:
+            self.done = True
+            return
+        self.alpha, self.gamma = gamma / denominator, gamma
+
+        self.p *= beta
+        self.p += self.r
+        self.s *= beta
+        self.s += w
+        self.x.ndarray += self.alpha * self.p
+        self.r -= self.alpha * self.s
+        self.iterations += 1
+
+
+class BiCGSTABSolver(_KrylovSolver):
+    """ Biconjugate gradients stabilized, for general operators.
+
+    An iteration takes two products with the operator, each followed by
+    one Allreduce: three inner products after the first, five after the
+    second, from which the next residual norm and the next ``rho`` follow
+    without further communication.  See `_KrylovSolver` for the
+    parameters.
+    """
+
+    def __init__(self, b, x, ax, tol, maxiter):
+        super(BiCGSTABSolver, self).__init__(b, x, ax, tol, maxiter)
+        bb, rr = _fused_vdot(self.comm, [(b.ndarray, b.ndarray),
+                                         (self.r, self.r)]).real
+        self.threshold = tol * (np.sqrt(bb) or 1.0)
+        self.r0 = self.r.copy()
+        self.rho = self.rr = rr
+        self.p = self.r.copy()
+        self.v = None
+        self.operand = LocalArray(b.distribution, buf=self.p.copy())
+        self._stop(np.sqrt(rr))
+        # Stop at maxiter, not before the first iteration.
+        self.done = self.converged
+
+    def step(self, product):
+        """ Advance the iteration, given `product`, the product of the
+        operator and `operand`.
+        """
+        if self.done:
+            return
+        if self.v is None:
+            self._step_p(product.ndarray)
+        else:
+            self._step_s(product.ndarray)
+
+    def _step_p(self, v):
+        r0v, rv, vv = _fused_vdot(self.comm, [(self.r0, v), (self.r, v),
+                                              (v, v)])
+        if r0v == 0:
+            self.done = True
+            return
+        self.alpha = self.rho / r0v
+        s = self.r - self.alpha * v
+        # The norm of s, by expanding (r - alpha v, r - alpha v), where
+        # rv is (r, v) = r^H v.
+        ss = (self.rr - 2 * (self.alpha * rv).real +
+              abs(self.alpha) ** 2 * vv.real)
+        if np.sqrt(max(ss, 0)) <= self.threshold:
+            self.x.ndarray += self.alpha * self.p
+            self.r = s
+            self.iterations += 1
+            self._stop(np.sqrt(max(ss, 0)))
+            return
+        self.v = v.copy()
+        self.operand.ndarray[...] = s
+
+    def _step_s(self, t):
+        s = self.operand.ndarray
+        ts, tt, r0s, r0t, ss = _fused_vdot(self.comm, [(t, s), (t, t),
+                                                       (self.r0, s),
+                                                       (self.r0, t),
+                                                       (s, s)])
+        omega = ts / tt if tt else 0
+        self.x.ndarray += self.alpha * self.p + omega * s
+        self.r = s - omega * t
+        self.iterations += 1
+        self.rr = max((ss - 2 * (np.conj(omega) * ts).real +
+                       abs(omega) ** 2 * tt).real, 0)
+        if self._stop(np.sqrt(self.rr)):
+            return
+        if omega == 0:
+            self.done = True
+            return
+        rho = r0s - omega * r0t
+        beta = (rho / self.rho) * (self.alpha / omega)
+        self.rho = rho
+        self.p = self.r + beta * (self.p - omega * self.v)
+        self.v = None
+        self.operand.ndarray[...] = self.p
+
+
+_solvers = {'cg': CGSolver, 'bicgstab': BiCGSTABSolver}
+
+
+def make_solver(method, b, x0, ax, tol, maxiter):
+    """ Create a Krylov solver.
+
+    Parameters
+    ----------
+    method : {'cg', 'bicgstab'}
+    b : LocalArray
+        The right-hand side.
+    x0 : LocalArray
+        The initial guess, distributed like `b`; it is copied.
+    ax : LocalArray
+        The product of the operator and `x0`.
+    tol, maxiter
+        See `_KrylovSolver`.
+
+    Returns
+    -------
+    solver
+        With the solution in its `x` attribute.
+    """
+    dtype = np.result_type(b.dtype, x0.dtype, ax.dtype)
+    x = LocalArray(b.distribution, buf=x0.ndarray.astype(dtype))
+    return _solvers[method](b, x, ax, tol, maxiter)
+
+
+def solve(solver, matvec):
+    """ Run `solver` to the end with the operator `matvec`, a function of
+    a LocalArray on every rank.  Collective.
+    """
+    while not solver.done:
+        solver.step(matvec(solver.operand))
+    return solver
+
+
+def _tree_qr(comm, a):
+    """ The upward sweep of a tall-skinny QR factorization of the rows of
+    `a` held by the ranks of `comm`, in rank order.  Internal.
+
+    Every rank factors its rows, then the R factors are combined pairwise
+    in a binary tree: at each level, a rank receives the R factor of its
+    partner, stacks it under its own and factors the stack again.
+
+    Returns the local Q factor, the combinations made by this rank as
+    ``(partner, q, own_rows)`` tuples, the rank it sent its R factor to
+    (None on rank 0), and the R factor of all the rows on rank 0 (None
+    elsewhere).
+    """
+    rank, nprocs = comm.Get_rank(), comm.Get_size()
+    q, r = np.linalg.qr(a)
+    combinations = []
+    step = 1
+    while step < nprocs:
+        if rank % (2 * step):
+            comm.send(r, dest=rank - step)
+            return q, combinations, rank - step, None
+        if rank + step < nprocs:
+            partner = rank + step
+            own_rows = r.shape[0]
+            stacked = np.vstack((r, comm.recv(source=partner)))
+            combined, r = np.linalg.qr(stacked)
+            combinations.append((partner, combined, own_rows))
+        step *= 2
+    return q, combinations, None, r
+
+
+def _tree_q(comm, q, combinations, parent, factor=None):
+    """ The downward sweep of a tall-skinny QR factorization: the local
+    rows of ``Q.dot(factor)``, given the results of `_tree_qr` and `factor`
+    on rank 0.  Internal.
+    """
+    if parent is not None:
+        factor = comm.recv(source=parent)
+    for (partner, combined, own_rows) in reversed(combinations):
+        comm.send(combined[own_rows:].dot(factor), dest=partner)
+        factor = combined[:own_rows].dot(factor)
+    return q.dot(factor)
+
+
+def _row_block(out_comm, ddpr, buf):
+    """ A LocalArray for `buf`, the local rows of a result with the
+    dim-data `ddpr`.  Internal.
+    """
+    rank = out_comm.Get_rank()
+    return LocalArray(maps.Distribution(comm=out_comm, dim_data=ddpr[rank]),
+                      buf=buf)
+
+
+def tsqr(larr, out_comm, ddpr):
+    """ Tall-skinny QR factorization of a 2-D LocalArray distributed by
+    rows.
+
+    Parameters
+    ----------
+    larr : LocalArray
+        With an undistributed second dimension.
+    out_comm : MPI Comm instance
+        The communicator of Q, with the ranks of `larr` in the same order.
+    ddpr : sequence of dim-data tuples
+        The dim-data of Q for every rank.
+
+    Returns
+    -------
+    q : LocalArray
+        The local rows of Q.
+    r : ndarray or None
+        The R factor on rank 0, None elsewhere.
+    """
+    q, combinations, parent, r = _tree_qr(out_comm, larr.ndarray)
+    factor = None if r is None else np.eye(r.shape[0], dtype=r.dtype)
+    q = _tree_q(out_comm, q, combinations, parent, factor)
+    return _row_block(out_comm, ddpr, q), r
+
+
+def svd(larr, out_comm, ddpr):
+    """ Thin singular value decomposition of a 2-D LocalArray distributed
+    by rows, from the SVD of its R factor.  See `tsqr` for the parameters.
+
+    Returns
+    -------
+    u : LocalArray
+        The local rows of U.
+    s, vt : ndarray or None
+        The singular values and the right singular vectors on rank 0, None
+        elsewhere.
+    """
+    q, combinations, parent, r = _tree_qr(out_comm, larr.ndarray)
+    s = vt = factor = None
+    if r is not None:
+        factor, s, vt = np.linalg.svd(r, full_matrices=False)
+    u = _tree_q(out_comm, q, combinations, parent, factor)
+    return _row_block(out_comm, ddpr, u), s, vt
+
+
+def lstsq(a, b, comm):
+    """ Least-squares solution of ``a x = b``, for LocalArrays `a` and
+    `b` with their rows distributed alike, as `numpy.linalg.lstsq`.
+
+    Only R factors are communicated: the R factor of ``[a, b]`` holds the
+    R factor of `a`, ``Q.T b`` and the residuals.
+
+    Returns
+    -------
+    (x, residuals, rank, s) or None
+        On rank 0, None elsewhere; `x` and `residuals` have a column for
+        every column of `b`, even if `b` is 1-D.
+    """
+    n = a.global_shape[1]
+    rhs = b.ndarray.reshape(len(b.ndarray), -1)
+    stacked = np.hstack((a.ndarray, rhs))
+    _, _, _, r = _tree_qr(comm, stacked)
+    if r is None:
+        return None
+    x, _, rank, s = np.linalg.lstsq(r[:n, :n], r[:n, n:], rcond=None)
+    residuals = np.empty(0, dtype=s.dtype)
+    if rank == n and a.global_shape[0] > n:
+        residuals = (abs(r[n:, n:]) ** 2).sum(axis=0)
+    return x, residuals, rank, s
@@ -19,7 +19,9 @@ from distarray.externals import six
 from distarray.externals.six.moves import zip
 
 from distarray.local.mpiutils import MPI
-from distarray.utils import _raise_nie
+from distarray.utils import _raise_nie, get_from_dotted_name
+from distarray.metadata_utils import (_start_stop_block, dim_data_bounds,
+                                     owning_ranks_and_local_indices)
 from distarray.local import format, maps
 from distarray.local.error import InvalidDimensionError, IncompatibleArrayError
 
@@ -82,6 +84,153 @@ class GlobalIndex(object):
             raise IndexError(err)
 
 
+class _HaloExchange(object):
+    """Fills the ghost cells of a padded LocalArray from its Cartesian
+    neighbours.  Internal.
+
+    Ghost regions are described with MPI subarray datatypes over the padded
+    buffer, so nothing is packed by hand.  With `corners`, axes are exchanged
+    one after the other, each slab spanning the full padded extent of the
+    other axes, so that corner ghost cells are filled as well.  Without
+    `corners`, slabs only span the interior of the other axes and all axes
+    are exchanged at once.  Empty local sections are skipped: each section
+    exchanges with its nearest non-empty neighbours.  With `persistent`, the
+    requests are created once with ``Send_init``/``Recv_init`` and restarted
+    on every exchange.
+
+    `start` posts the (first) exchange and returns immediately, so that
+    computation on the interior can overlap it; `wait` completes it.
+    """
+
+    def __init__(self, larr, periods, persistent, corners=True):
+        distribution = larr.distribution
+        self.comm = distribution.cart_comm(periods)
+        self.persistent = persistent
+        self.buf = buf = larr.padded_ndarray
+        base_type = MPI._typedict[buf.dtype.char]
+        self.datatypes = []
+        # One list of (is_send, datatype, peer, tag) per exchanged axis.
+        self.phases = []
+
+        for axis, (lo, hi) in enumerate(distribution.padding):
+            if not (lo or hi):
+                continue
+            size = distribution.local_shape[axis]
+            lower, upper = self._neighbours(axis, size, max(lo, hi),
+                                            periods[axis])
+            if size == 0:
+                self.phases.append([])
+                continue
+            # Messages travelling up the grid use tag 2*axis, down 2*axis+1.
+            regions = [(False, 0, lo, lower, 2 * axis),
+                       (True, lo, lo, lower, 2 * axis + 1),
+                       (False, lo + size, hi, upper, 2 * axis + 1),
+                       (True, lo + size - hi, hi, upper, 2 * axis)]
+            phase = []
+            for (is_send, start, width, peer, tag) in regions:
+                if not width:
+                    continue
+                if corners:
+                    subsizes = list(buf.shape)
+                    starts = [0] * buf.ndim
+                else:
+                    subsizes = list(distribution.local_shape)
+                    starts = [pad_lo for (pad_lo, _) in distribution.padding]
+                subsizes[axis] = width
+                starts[axis] = start
+                datatype = base_type.Create_subarray(buf.shape, subsizes,
+                                                     starts).Commit()
+                self.datatypes.append(datatype)
+                phase.append((is_send, datatype, peer, tag))
+            self.phases.append(phase)
+
+        if not corners and self.phases:
+            self.phases = [sum(self.phases, [])]
+        if persistent:
+            self.requests = [[self._request(*t, persistent=True)
+                              for t in phase]
+                             for phase in self.phases]
+        self._pending = None
+
+    def _neighbours(self, axis, size, width, periodic):
+        """Ranks of the nearest non-empty sections below and above this one
+        along `axis`; empty sections take no part in the exchange.
+        """
+        remain = [i == axis for i in range(self.buf.ndim)]
+        axis_comm = self.comm.Sub(remain)
+        sizes = axis_comm.allgather(size)
+        axis_comm.Free()
+        nonempty = [c for (c, n) in enumerate(sizes) if n]
+        if not nonempty:
+            # The axis has length 0: there is nothing to exchange.
+            return MPI.PROC_NULL, MPI.PROC_NULL
+        if min(sizes[c] for c in nonempty) < width:
+            # Every rank sees the same sizes, so every rank raises.
+            msg = ("Local size (%d) along axis %d is smaller than the halo "
+                   "width (%d).")
+            raise ValueError(msg % (min(sizes[c] for c in nonempty), axis,
+                                    width))
+        if not size:
+            return MPI.PROC_NULL, MPI.PROC_NULL
+        coords = list(self.comm.Get_coords(self.comm.Get_rank()))
+        i = nonempty.index(coords[axis])
+        peers = []
+        for j in (i - 1, i + 1):
+            if not periodic and not 0 <= j < len(nonempty):
+                peers.append(MPI.PROC_NULL)
+                continue
+            coords[axis] = nonempty[j % len(nonempty)]
+            peers.append(self.comm.Get_cart_rank(coords))
+        return tuple(peers)
+
+    def _request(self, is_send, datatype, peer, tag, persistent):
+        if persistent:
+            init = self.comm.Send_init if is_send else self.comm.Recv_init
+        else:
+            init = self.comm.Isend if is_send else self.comm.Irecv
+        return init([self.buf, 1, datatype], peer, tag)
+
+    def _start_phase(self, i):
+        if self.persistent:
+            requests = self.requests[i]
+            MPI.Prequest.Startall(requests)
+        else:
+            requests = [self._request(*t, persistent=False)
+                        for t in self.phases[i]]
+        return requests
+
+    def start(self):
+        if self.phases:
+            self._pending = self._start_phase(0)
+
+    def wait(self):
+        if self._pending is None:
+            return
+        MPI.Request.Waitall(self._pending)
+        self._pending = None
+        for i in range(1, len(self.phases)):
+            MPI.Request.Waitall(self._start_phase(i))
+
+    def exchange(self):
+        self.start()
+        self.wait()
+
+    def free(self):
+        """Free the persistent requests and the datatypes.
+
+        Called when the exchange is dropped, e.g. with the LocalArray that
+        keeps it; calling it again, or after MPI is finalized, does nothing.
+        """
+        requests = sum(self.__dict__.pop('requests', []), [])
+        datatypes = self.__dict__.pop('datatypes', [])
+        if MPI.Is_finalized():
+            return
+        for handle in requests + datatypes:
+            handle.Free()
+
+    __del__ = free
+
+
 class LocalArray(object):
     """Distributed memory Python arrays."""
 
@@ -107,11 +256,27 @@ class LocalArray(object):
         self.distribution = distribution
 
         # create the buffer
+        padded_shape = distribution.padded_shape
+        is_padded = padded_shape != self.local_shape
         if buf is None:
-            self.ndarray = np.empty(self.local_shape, dtype=dtype)
+            padded = np.empty(padded_shape, dtype=dtype)
         else:
             mv = memoryview(buf)
-            self.ndarray = np.asarray(mv, dtype=dtype)
+            padded = np.asarray(mv, dtype=dtype)
+            if is_padded and padded.shape != padded_shape:
+                # An unpadded buffer for a padded distribution: copy it
+                # into the interior of a new padded buffer.
+                interior = padded
+                padded = np.empty(padded_shape, dtype=interior.dtype)
+                padded[distribution.interior] = interior
+
+        # With ghost cells, `ndarray` is a view on the interior of
+        # `padded_ndarray`; otherwise they are the same array.
+        self.padded_ndarray = padded
+        if is_padded:
+            self.ndarray = padded[distribution.interior]
+        else:
+            self.ndarray = padded
 
         # We pass a view of self.ndarray because we want the
         # GlobalIndex object to be able to change the LocalArray
@@ -238,11 +403,62 @@ class LocalArray(object):
         """
         distbuffer = {
             "__version__": "0.10.0",
-            "buffer": self.ndarray,
+            "buffer": self.padded_ndarray,
             "dim_data": self.dim_data,
         }
         return distbuffer
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # MPI requests and datatypes cannot be pickled.
+        state.pop('_halo_exchanges', None)
+        return state
+
+    #-------------------------------------------------------------------------
+    # Ghost cells
+    #-------------------------------------------------------------------------
+
+    def exchange_halos(self, periodic=False, persistent=True):
+        """Fill the ghost cells of `padded_ndarray` from the neighbouring
+        processes.
+
+        Ghost cells at the global boundary are left untouched unless the
+        boundary is periodic.  This is a collective operation.
+
+        Parameters
+        ----------
+        periodic : bool or sequence of bools, optional
+            Whether each dimension wraps around.
+        persistent : bool, optional
+            Reuse persistent MPI requests across calls.  The requests are
+            created on the first call and kept with this LocalArray.
+        """
+        if isinstance(periodic, bool):
+            periodic = (periodic,) * self.ndim
+        periods = tuple(bool(p) for p in periodic)
+        if persistent:
+            self._halo_exchange(periods).exchange()
+        else:
+            exchange = _HaloExchange(self, periods, persistent=False)
+            exchange.exchange()
+            exchange.free()
+
+    def _halo_exchange(self, periods, corners=True):
+        """Return the persistent halo exchange of this LocalArray for
+        `periods`, creating it on first use.  Internal.
+
+        Creating it is collective; the exchanges are kept, keyed by
+        `periods` and `corners`, until this LocalArray is dropped.
+        """
+        key = (tuple(periods), corners)
+        exchanges = self.__dict__.setdefault('_halo_exchanges', {})
+        try:
+            return exchanges[key]
+        except KeyError:
+            exchange = _HaloExchange(self, key[0], True, corners)
+            exchanges[key] = exchange
+            return exchange
+
     #-------------------------------------------------------------------------
     # Methods related to distributed indexing
     #-------------------------------------------------------------------------
@@ -253,7 +469,10 @@ class LocalArray(object):
     def set_localarray(self, a):
         arr = np.asarray(a, dtype=self.dtype, order='C')
         if arr.shape == self.local_shape:
-            self.ndarray = arr
+            if self.padded_ndarray is self.ndarray:
+                self.ndarray = self.padded_ndarray = arr
+            else:
+                self.ndarray[...] = arr
         else:
             raise ValueError("Incompatible local array shape")
 
@@ -917,48 +1136,76 @@ def local_reduction(out_comm, reducer, larr, ddpr, dtype, axes):
         Otherwise, returns the LocalArray section of the reduction result.
     """
 
+    out = _reduction_out(out_comm, ddpr, dtype)
+    reduce_comm = _reduction_comm(larr, axes)
+    return reducer(reduce_comm, larr, out, axes, dtype)
+
+
+def _reduction_out(out_comm, ddpr, dtype):
+    """ Allocate this rank's section of a reduction result.  Internal.
+
+    Returns None when this rank is not part of `out_comm`.
+    """
     if out_comm == MPI.COMM_NULL:
-        out = None
-    else:
-        dim_data = ddpr[out_comm.Get_rank()] if ddpr else ()
-        dist = maps.Distribution(comm=out_comm, dim_data=dim_data)
-        out = empty(dist, dtype)
+        return None
+    dim_data = ddpr[out_comm.Get_rank()] if ddpr else ()
+    dist = maps.Distribution(comm=out_comm, dim_data=dim_data)
+    return empty(dist, dtype)
+
 
+def _reduction_comm(larr, axes):
+    """ Sub-communicator of the ranks that share a section of the reduction
+    result, i.e. that differ only in their coordinates along `axes`.
+    Internal.
+    """
     remaining_dims = [False] * larr.ndim
     for axis in axes:
         remaining_dims[axis] = True
-    reduce_comm = larr.comm.Sub(remaining_dims)
-    return reducer(reduce_comm, larr, out, axes, dtype)
+    return larr.comm.Sub(remaining_dims)
 
 # --- Reductions for min, max, sum, mean, var, std ----------------------------
 
-def _basic_reducer(reduce_comm, op, func, args, kwargs, out):
+def _basic_reducer(reduce_comm, op, ufunc, larr, axes, dtype, out):
     """ Handles simple reductions: min, max, sum.  Internal. """
     if out is None:
         out_ndarray = None
     else:
         out_ndarray = out.ndarray
-    local_reduce = func(*args, **kwargs)
+    local_reduce = _local_ufunc_reduce(ufunc, larr.ndarray, axes, dtype)
     reduce_comm.Reduce(local_reduce, out_ndarray, op=op, root=0)
     return out
 
 def min_reducer(reduce_comm, larr, out, axes, dtype):
     """ Core reduction function for min."""
-    return _basic_reducer(reduce_comm, MPI.MIN,
-                          larr.ndarray.min, 
-                          (), {'axis':axes}, out)
+    return _basic_reducer(reduce_comm, MPI.MIN, np.minimum,
+                          larr, axes, dtype, out)
 
 def max_reducer(reduce_comm, larr, out, axes, dtype):
     """ Core reduction function for max."""
-    return _basic_reducer(reduce_comm, MPI.MAX,
-                          larr.ndarray.max, 
-                          (), {'axis':axes}, out)
+    return _basic_reducer(reduce_comm, MPI.MAX, np.maximum,
+                          larr, axes, dtype, out)
 
 def sum_reducer(reduce_comm, larr, out, axes, dtype):
     """ Core reduction function for sum."""
-    return _basic_reducer(reduce_comm, MPI.SUM,
-                          larr.ndarray.sum, 
-                          (), {'axis':axes, 'dtype':dtype}, out)
+    return _basic_reducer(reduce_comm, MPI.SUM, np.add,
+                          larr, axes, dtype, out)
+
+def ptp_reducer(reduce_comm, larr, out, axes, dtype):
+    """ Core reduction function for ptp."""
+    if out is None:
+        out_min = out_max = None
+    else:
+        out_min = np.empty_like(out.ndarray)
+        out_max = np.empty_like(out.ndarray)
+    reduce_comm.Reduce(_local_ufunc_reduce(np.minimum, larr.ndarray, axes,
+                                           dtype),
+                       out_min, op=MPI.MIN, root=0)
+    reduce_comm.Reduce(_local_ufunc_reduce(np.maximum, larr.ndarray, axes,
+                                           dtype),
+                       out_max, op=MPI.MAX, root=0)
+    if out is not None:
+        np.subtract(out_max, out_min, out=out.ndarray)
+    return out
 
 def mean_reducer(reduce_comm, larr, out, axes, dtype):
     """ Core reduction function for mean."""
@@ -970,36 +1217,1710 @@ def mean_reducer(reduce_comm, larr, out, axes, dtype):
 
 def var_reducer(reduce_comm, larr, out, axes, dtype):
     """ Core reduction function for var."""
-    mean = empty_like(out, dtype=float) if out is not None else None
-    mean = mean_reducer(reduce_comm, larr, mean, axes, dtype=float)
+    moments = _reduce_moments(reduce_comm, _local_moments(larr, axes, dtype),
+                              out is not None)
+    if out is not None:
+        out.ndarray[...] = moments[..., -1] / moments[..., 0]
+    return out
+
+
+def std_reducer(reduce_comm, larr, out, axes, dtype):
+    """ Core reduction function for std."""
+    moments = _reduce_moments(reduce_comm, _local_moments(larr, axes, dtype),
+                              out is not None)
+    if out is not None:
+        out.ndarray[...] = np.sqrt(moments[..., -1] / moments[..., 0])
+    return out
+
+# --- Single-pass moments: var, std, describe ---------------------------------
+#
+# Each rank summarizes its section as (count, mean, M2) partials, where M2 is
+# the sum of squared deviations from the local mean.  The partials are merged
+# pairwise (Chan, Golub & LeVeque) inside a user-defined MPI operation, so a
+# variance costs one collective.  The partials for one output element are kept
+# contiguous and reduced as a single MPI contiguous datatype so MPI never
+# splits a record when it segments large messages.  The mean of complex data
+# takes two fields.  The extrema of `describe` are reduced separately, in the
+# array's own dtype.
+
+_DESCRIBE_FIELDS = ('count', 'mean', 'var', 'min', 'max')
+
+# Cache of (MPI.Op, MPI.Datatype) pairs, keyed by record width.
+_moments_ops = {}
+
+
+def _local_moments(larr, axes, dtype=np.float64):
+    """ Compute this rank's (count, mean, M2) partials over `axes`.  Internal.
+
+    Returns a float64 ndarray with the shape of the reduced local array plus
+    a trailing record axis.  For complex data the mean takes two fields, its
+    real and imaginary parts, and M2 sums the squared moduli.  The local sums
+    are accumulated in `dtype` if it is a floating point type, as in
+    `numpy.var`, and in float64 otherwise.
+    """
+    ndarray = larr.ndarray
+    is_complex = ndarray.dtype.kind == 'c'
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'c':
+        dtype = np.finfo(dtype).dtype
+    elif dtype.kind != 'f':
+        dtype = np.dtype(np.float64)
+    count = 1
+    for axis in axes:
+        count *= ndarray.shape[axis]
+    out_shape = tuple(s for (axis, s) in enumerate(ndarray.shape)
+                      if axis not in axes)
+    moments = np.zeros(out_shape + (4 if is_complex else 3,))
+    if count == 0:
+        return moments
+
+    mean_dtype = np.result_type(dtype, np.complex64) if is_complex else dtype
+    mean = ndarray.mean(axis=axes, keepdims=True, dtype=mean_dtype)
+    moments[..., 0] = count
+    if is_complex:
+        moments[..., 1] = mean.real.reshape(out_shape)
+        moments[..., 2] = mean.imag.reshape(out_shape)
+        moments[..., 3] = np.square(np.abs(ndarray - mean)).sum(axis=axes,
+                                                                dtype=dtype)
+    else:
+        moments[..., 1] = mean.reshape(out_shape)
+        moments[..., 2] = np.square(ndarray - mean).sum(axis=axes,
+                                                        dtype=dtype)
+    return moments
+
+
+def _merge_moments(inrecs, inoutrecs):
+    """ Merge the partials in `inrecs` into `inoutrecs`, in place.  Internal.
+    """
+    n_a, mean_a, m2_a = inrecs[:, 0], inrecs[:, 1:-1], inrecs[:, -1]
+    n_b, mean_b, m2_b = inoutrecs[:, 0], inoutrecs[:, 1:-1], inoutrecs[:, -1]
+    n = n_a + n_b
+    with np.errstate(invalid='ignore', divide='ignore'):
+        frac_a = np.where(n > 0, n_a / n, 0.0)
+    delta = mean_a - mean_b
+    m2 = m2_a + m2_b + np.square(delta).sum(axis=1) * n_b * frac_a
+    inoutrecs[:, 1:-1] = mean_b + delta * frac_a[:, np.newaxis]
+    inoutrecs[:, -1] = m2
+    inoutrecs[:, 0] = n
+
+
+def _moments_op(width):
+    """ Return the (MPI.Op, MPI.Datatype) pair for records of `width`
+    float64 values, creating and caching it on first use.  Internal.
+    """
+    try:
+        return _moments_ops[width]
+    except KeyError:
+        pass
+
+    def merge(inbuf, inoutbuf, datatype):
+        inrecs = np.frombuffer(inbuf, dtype=np.float64).reshape(-1, width)
+        inoutrecs = np.frombuffer(inoutbuf, dtype=np.float64)
+        _merge_moments(inrecs, inoutrecs.reshape(-1, width))
+
+    record_type = MPI.DOUBLE.Create_contiguous(width).Commit()
+    op = MPI.Op.Create(merge, commute=True)
+    _moments_ops[width] = (op, record_type)
+    return op, record_type
+
+
+def _reduce_moments(reduce_comm, moments, is_root):
+    """ Merge the partials in `moments` across `reduce_comm`.  Internal.
 
-    temp = empty_like(larr, dtype=float)
+    Returns the merged records on the root, None elsewhere.
+    """
+    op, record_type = _moments_op(moments.shape[-1])
+    merged = np.empty_like(moments) if is_root else None
+    recvbuf = [merged, record_type] if is_root else None
+    reduce_comm.Reduce([moments, record_type], recvbuf, op=op, root=0)
+    return merged
+
+
+def local_describe(out_comm, larr, ddpr, axes):
+    """ Entry point for `describe` on local arrays.
 
-    # Make mean.ndarray's shape broadcastable.
-    if mean is not None:
-        mean_shape = tuple(1 if axis in axes else s
-                           for (axis, s) in enumerate(larr.ndarray.shape))
-        mean.ndarray.shape = mean_shape
-        # Copy mean.ndarray into temp.ndarray
-        temp.ndarray[...] = mean.ndarray
+    Computes the count, mean and variance of `larr` over `axes` with one
+    local sweep and one collective, and the minimum and maximum with one
+    collective each, in the dtype of `larr`.
+
+    Parameters
+    ----------
+    out_comm : MPI Comm instance.
+        The MPI communicator for the results.  Is equal to MPI.COMM_NULL
+        when this rank is not part of the output communicator.
 
-    # have to broadcast mean.ndarray to all ranks in this reduce_comm.
-    reduce_comm.Bcast(temp.ndarray, root=0)
+    larr : LocalArray
+        Input.  Defined for all ranks.
 
-    # Do the variance calculation.
-    temp.ndarray[...] = (larr.ndarray - temp.ndarray) ** 2
+    ddpr : sequence of dim-data dictionaries.
 
-    # Get the mean reduction of temp's data.
-    mean_reducer(reduce_comm, temp, out, axes, dtype)
+    axes : Sequence of ints.
 
+    Returns
+    -------
+    dict of LocalArray or None
+        When out_comm == MPI.COMM_NULL, returns None.  Otherwise, a LocalArray
+        section per statistic, keyed by 'count', 'mean', 'var', 'min' and
+        'max'.
+    """
+    reduce_comm = _reduction_comm(larr, axes)
+    is_root = out_comm != MPI.COMM_NULL
+    moments = _reduce_moments(reduce_comm, _local_moments(larr, axes),
+                              is_root)
+
+    # The extrema keep the dtype of `larr`, so that 64-bit integers and
+    # complex values are exact.
+    dtype = larr.dtype
+    extrema = {}
+    for (name, func, bound) in (('min', np.minimum, np.inf),
+                                ('max', np.maximum, -np.inf)):
+        identity = complex(bound, bound) if dtype.kind == 'c' else None
+        extrema[name] = _reduction_out(out_comm, ddpr, dtype)
+        ufunc_reducer(reduce_comm, larr, extrema[name], axes, dtype, func,
+                      identity)
+    if not is_root:
+        return None
+
+    count = moments[..., 0]
+    mean = moments[..., 1]
+    if dtype.kind == 'c':
+        mean = mean + 1j * moments[..., 2]
+    values = {
+        'count': count.astype(np.int64),
+        'mean': mean,
+        'var': moments[..., -1] / count,
+        }
+    stats = {}
+    for name in _DESCRIBE_FIELDS:
+        if name in extrema:
+            stats[name] = extrema[name]
+            continue
+        out = _reduction_out(out_comm, ddpr, values[name].dtype)
+        out.ndarray[...] = values[name]
+        stats[name] = out
+    return stats
+
+# --- Covariance: cov, corrcoef -----------------------------------------------
+#
+# Each rank summarizes its rows as (count, column means, centered Gram matrix)
+# partials, the Gram matrix coming from a single BLAS product.  The partials
+# are merged pairwise, as for the single-pass moments above but with an outer
+# product of the mean differences, by a user-defined operation in one
+# Allreduce.
+
+# Cache of (MPI.Op, MPI.Datatype) pairs, keyed by number of columns.
+_gram_ops = {}
+
+
+def _merge_grams(inrec, inoutrec, ncols):
+    """ Merge the partials `inrec` into `inoutrec`, in place.  Internal. """
+    n_a, mean_a = inrec[0], inrec[1:ncols + 1]
+    gram_a = inrec[ncols + 1:].reshape(ncols, ncols)
+    n_b, mean_b = inoutrec[0], inoutrec[1:ncols + 1]
+    gram_b = inoutrec[ncols + 1:].reshape(ncols, ncols)
+    n = n_a + n_b
+    if n == 0:
+        return
+    frac_a = n_a / n
+    delta = mean_a - mean_b
+    gram_b += gram_a + np.outer(delta, delta) * (n_b * frac_a)
+    mean_b += delta * frac_a
+    inoutrec[0] = n
+
+
+def _gram_op(ncols):
+    """ Return the (MPI.Op, MPI.Datatype) pair for the partials of
+    `ncols` columns, creating and caching it on first use.  Internal.
+    """
+    try:
+        return _gram_ops[ncols]
+    except KeyError:
+        pass
+    width = 1 + ncols + ncols * ncols
+
+    def merge(inbuf, inoutbuf, datatype):
+        inrecs = np.frombuffer(inbuf, dtype=np.float64).reshape(-1, width)
+        inoutrecs = np.frombuffer(inoutbuf, dtype=np.float64)
+        for (inrec, inoutrec) in zip(inrecs, inoutrecs.reshape(-1, width)):
+            _merge_grams(inrec, inoutrec, ncols)
+
+    record_type = MPI.DOUBLE.Create_contiguous(width).Commit()
+    op = MPI.Op.Create(merge, commute=True)
+    _gram_ops[ncols] = (op, record_type)
+    return op, record_type
+
+
+def local_gram(larr):
+    """ The number of rows, the column means and the centered Gram matrix
+    of a LocalArray distributed by rows, over all ranks.
+
+    Parameters
+    ----------
+    larr : LocalArray
+        2-D with an undistributed second dimension, or 1-D (one column).
+
+    Returns
+    -------
+    (count, mean, gram)
+        On every rank, in float64.
+    """
+    ncols = larr.global_shape[1] if larr.ndim == 2 else 1
+    x = larr.ndarray.reshape(larr.local_shape[0], ncols)
+    record = np.zeros(1 + ncols + ncols * ncols)
+    if len(x):
+        mean = x.mean(axis=0, dtype=np.float64)
+        centered = x - mean
+        record[0] = len(x)
+        record[1:ncols + 1] = mean
+        record[ncols + 1:] = np.dot(centered.T, centered).ravel()
+
+    op, record_type = _gram_op(ncols)
+    merged = np.empty_like(record)
+    larr.comm.Allreduce([record, record_type], [merged, record_type], op=op)
+    return (merged[0], merged[1:ncols + 1],
+            merged[ncols + 1:].reshape(ncols, ncols))
+
+# --- Reductions with arbitrary binary ufuncs ---------------------------------
+#
+# Each rank reduces its section locally, then the partial results are
+# combined with a user-defined MPI operation that applies the same binary
+# function to the incoming buffers.  Buffers travel as opaque records of
+# `dtype.itemsize` bytes, so any fixed-size dtype works.  Ranks whose section
+# is empty along the reduced axes contribute the operation's identity.
+
+# Predefined MPI operations, used in place of a user-defined one when the
+# dtype's kind is one MPI can reduce natively with that operation.
+_builtin_ops = {
+    np.add: (MPI.SUM, 'iufc'),
+    np.multiply: (MPI.PROD, 'iufc'),
+    np.maximum: (MPI.MAX, 'iuf'),
+    np.minimum: (MPI.MIN, 'iuf'),
+    np.logical_and: (MPI.LAND, 'b'),
+    np.logical_or: (MPI.LOR, 'b'),
+    np.logical_xor: (MPI.LXOR, 'b'),
+    np.bitwise_and: (MPI.BAND, 'iu'),
+    np.bitwise_or: (MPI.BOR, 'iu'),
+    np.bitwise_xor: (MPI.BXOR, 'iu'),
+    }
+
+# Cache of (MPI.Op, MPI.Datatype) pairs, keyed by (ufunc, dtype).
+_ufunc_ops = {}
+
+
+def _reduction_identity(func, dtype):
+    """ Return the identity of `func` for `dtype`, or None.  Internal. """
+    identity = getattr(func, 'identity', None)
+    if identity is not None:
+        return identity
+    if dtype.kind == 'f':
+        lowest, highest = -np.inf, np.inf
+    elif dtype.kind in 'iu':
+        lowest, highest = np.iinfo(dtype).min, np.iinfo(dtype).max
+    elif dtype.kind == 'b':
+        lowest, highest = False, True
+    else:
+        return None
+    if func in (np.maximum, np.fmax):
+        return lowest
+    if func in (np.minimum, np.fmin):
+        return highest
+    return None
+
+
+def _local_ufunc_reduce(func, ndarray, axes, dtype, identity=None):
+    """ Reduce `ndarray` over `axes` with the binary function `func`.
+    Internal.
+
+    `func` is either a NumPy ufunc or a callable that combines two ndarrays
+    elementwise.  If `ndarray` is empty along `axes`, the result is filled
+    with `identity`, or with `func`'s identity if `identity` is None.
+
+    Returns an ndarray of dtype `dtype`.
+    """
+    dtype = np.dtype(dtype)
+    out_shape = tuple(s for (axis, s) in enumerate(ndarray.shape)
+                      if axis not in axes)
+    if any(ndarray.shape[axis] == 0 for axis in axes):
+        if identity is None:
+            identity = _reduction_identity(func, dtype)
+        if identity is None:
+            msg = ("Reduction of an empty LocalArray with %r requires an "
+                   "identity.")
+            raise ValueError(msg % (func,))
+        result = np.empty(out_shape, dtype=dtype)
+        result[...] = np.array(identity).astype(dtype)
+        return result
+
+    if isinstance(func, np.ufunc):
+        result = ndarray
+        # Accumulate in `dtype`, as ndarray.sum(dtype=...) does.
+        for axis in sorted(axes, reverse=True):
+            result = func.reduce(result, axis=axis, dtype=dtype)
+        return np.asarray(result, dtype=dtype)
+
+    # Move the reduced axes to the front and flatten them, then combine
+    # neighbouring pairs until one slice remains.  This takes O(log n)
+    # vectorized calls of `func` and preserves the operand order.
+    rest = [axis for axis in range(ndarray.ndim) if axis not in axes]
+    stacked = ndarray.transpose(list(axes) + rest).reshape((-1,) + out_shape)
+    while len(stacked) > 1:
+        npairs = len(stacked) // 2
+        combined = func(stacked[0:2 * npairs:2], stacked[1:2 * npairs:2])
+        if len(stacked) % 2:
+            combined = np.concatenate((combined, stacked[-1:]))
+        stacked = combined
+    return np.asarray(stacked[0], dtype=dtype)
+
+
+def _create_ufunc_op(func, dtype):
+    """ Create an (MPI.Op, MPI.Datatype) pair that combines buffers of
+    `dtype` with `func`.  Internal.
+    """
+    def combine(inbuf, inoutbuf, datatype):
+        invals = np.frombuffer(inbuf, dtype=dtype)
+        inoutvals = np.frombuffer(inoutbuf, dtype=dtype)
+        inoutvals[...] = func(invals, inoutvals)
+
+    record_type = MPI.BYTE.Create_contiguous(dtype.itemsize).Commit()
+    op = MPI.Op.Create(combine, commute=True)
+    return op, record_type
+
+
+def _ufunc_op(ufunc, dtype):
+    """ Return the cached (MPI.Op, MPI.Datatype) pair for a NumPy ufunc.
+    Internal.
+    """
+    key = (ufunc, dtype.str)
+    try:
+        return _ufunc_ops[key]
+    except KeyError:
+        op_and_type = _ufunc_ops[key] = _create_ufunc_op(ufunc, dtype)
+        return op_and_type
+
+
+def ufunc_reducer(reduce_comm, larr, out, axes, dtype, ufunc, identity=None):
+    """ Core reduction function for an arbitrary binary ufunc.
+
+    `ufunc` must be associative and commutative.  It may be a NumPy ufunc,
+    any callable that combines two ndarrays elementwise, or the dotted name
+    of such a callable on the engine.
+    """
+    if isinstance(ufunc, six.string_types):
+        ufunc = get_from_dotted_name(ufunc)
+    dtype = np.dtype(dtype)
+    local_reduce = _local_ufunc_reduce(ufunc, larr.ndarray, axes, dtype,
+                                       identity)
+    out_ndarray = None if out is None else out.ndarray
+
+    builtin_op, kinds = _builtin_ops.get(ufunc, (None, ''))
+    if dtype.kind in kinds:
+        reduce_comm.Reduce(local_reduce, out_ndarray, op=builtin_op, root=0)
+        return out
+
+    is_ufunc = isinstance(ufunc, np.ufunc)
+    if is_ufunc:
+        op, record_type = _ufunc_op(ufunc, dtype)
+    else:
+        op, record_type = _create_ufunc_op(ufunc, dtype)
+    recvbuf = None if out is None else [out_ndarray, record_type]
+    try:
+        reduce_comm.Reduce([local_reduce, record_type], recvbuf, op=op,
+                           root=0)
+    finally:
+        # Ops for Python callables are not cached, since each call
+        # unpickles a new function object.
+        if not is_ufunc:
+            op.Free()
+            record_type.Free()
     return out
 
+# --- Arg-reductions: argmin, argmax -----------------------------------------
+#
+# Each rank finds its local extremum along the reduced axes and translates
+# its position into a global index through the local maps.  The (value,
+# index) pairs are then combined like MPI_MINLOC / MPI_MAXLOC: the extreme
+# value wins and ties go to the smallest global index, as in NumPy.  The
+# pairs travel as records of a structured dtype so that any value dtype and
+# 64-bit indices are supported.
+
+# Cache of (MPI.Op, MPI.Datatype) pairs, keyed by (kind, record dtype).
+_argreduce_ops = {}
 
-def std_reducer(reduce_comm, larr, out, axes, dtype):
-    """ Core reduction function for std."""
-    var_reducer(reduce_comm, larr, out, axes, dtype)
+
+def _global_index_table(larr, axis):
+    """ Return the global index of each local index along `axis`.
+    Internal.
+    """
+    axis_map = larr.distribution[axis]
+    return np.fromiter(axis_map.global_iter, dtype=np.int64,
+                       count=axis_map.size)
+
+
+def _local_argreduce(kind, larr, axes):
+    """ Compute this rank's (value, global index) records.  Internal.
+
+    `kind` is 'min' or 'max'.  The global index is the position along
+    `axes`, flattened in C order when there is more than one axis.
+    """
+    ndarray = larr.ndarray
+    rest = [axis for axis in range(ndarray.ndim) if axis not in axes]
+    out_shape = tuple(ndarray.shape[axis] for axis in rest)
+    record_dtype = np.dtype([('value', ndarray.dtype), ('index', np.int64)])
+    records = np.empty(out_shape, dtype=record_dtype)
+
+    reduced_shape = tuple(ndarray.shape[axis] for axis in axes)
+    if 0 in reduced_shape:
+        ufunc = np.minimum if kind == 'min' else np.maximum
+        records['value'] = _reduction_identity(ufunc, ndarray.dtype)
+        records['index'] = np.iinfo(np.int64).max
+        return records
+
+    stacked = ndarray.transpose(list(axes) + rest).reshape((-1,) + out_shape)
+    local_flat = (np.argmin if kind == 'min' else np.argmax)(stacked, axis=0)
+    records['value'] = np.take_along_axis(stacked, local_flat[np.newaxis],
+                                          axis=0)[0]
+
+    local_coords = np.unravel_index(local_flat, reduced_shape)
+    global_coords = [_global_index_table(larr, axis)[coords]
+                     for (axis, coords) in zip(axes, local_coords)]
+    global_shape = tuple(larr.global_shape[axis] for axis in axes)
+    records['index'] = np.ravel_multi_index(global_coords, global_shape)
+    return records
+
+
+def _merge_argreduce(kind, inrecs, inoutrecs):
+    """ Merge the (value, index) records in `inrecs` into `inoutrecs`, in
+    place.  Internal.
+    """
+    a, b = inrecs['value'], inoutrecs['value']
+    better = (a < b) if kind == 'min' else (a > b)
+    # NaNs win, as in NumPy.
+    better |= (a != a) & (b == b)
+    tie = (a == b) | ((a != a) & (b != b))
+    better |= tie & (inrecs['index'] < inoutrecs['index'])
+    inoutrecs[better] = inrecs[better]
+
+
+def _argreduce_op(kind, record_dtype):
+    """ Return the (MPI.Op, MPI.Datatype) pair that merges (value, index)
+    records, creating and caching it on first use.  Internal.
+    """
+    key = (kind, record_dtype.str, record_dtype.descr[0][1])
+    try:
+        return _argreduce_ops[key]
+    except KeyError:
+        pass
+
+    def merge(inbuf, inoutbuf, datatype):
+        inrecs = np.frombuffer(inbuf, dtype=record_dtype)
+        inoutrecs = np.frombuffer(inoutbuf, dtype=record_dtype)
+        _merge_argreduce(kind, inrecs, inoutrecs)
+
+    record_type = MPI.BYTE.Create_contiguous(record_dtype.itemsize).Commit()
+    op = MPI.Op.Create(merge, commute=True)
+    _argreduce_ops[key] = (op, record_type)
+    return op, record_type
+
+
+def _argreducer(kind, reduce_comm, larr, out, axes):
+    """ Handles arg-reductions: argmin, argmax.  Internal. """
+    records = _local_argreduce(kind, larr, axes)
+    op, record_type = _argreduce_op(kind, records.dtype)
+    merged = np.empty_like(records) if out is not None else None
+    recvbuf = None if out is None else [merged, record_type]
+    reduce_comm.Reduce([records, record_type], recvbuf, op=op, root=0)
     if out is not None:
-        np.sqrt(out.ndarray, out=out.ndarray)
+        out.ndarray[...] = merged['index']
+    return out
+
+
+def argmin_reducer(reduce_comm, larr, out, axes, dtype):
+    """ Core reduction function for argmin."""
+    return _argreducer('min', reduce_comm, larr, out, axes)
+
+
+def argmax_reducer(reduce_comm, larr, out, axes, dtype):
+    """ Core reduction function for argmax."""
+    return _argreducer('max', reduce_comm, larr, out, axes)
+
+
+# --- Order statistics: median, percentile, quantile -------------------------
+#
+# Parallel selection, without sorting.  The candidates for the k-th smallest
+# value start as every rank's values along the reduced axes.  Each round,
+# every rank finds the median of its candidates with np.partition, the ranks
+# agree on the count-weighted median of these as the pivot (an Allgather of
+# fixed-size buffers), and one Allreduce counts the candidates below and
+# equal to it.  The candidates on the wrong side of the pivot are dropped:
+# at least a quarter of them per round, so O(log n) rounds of small
+# collectives and O(n) local work suffice.  All reduction results of a rank
+# are selected together, so the number of rounds does not grow with their
+# number.
+
+
+def _pivots(comm, medians, counts):
+    """ The count-weighted median of each column of the `medians` of all
+    ranks of `comm`.  Internal.
+    """
+    nprocs = comm.Get_size()
+    all_medians = np.empty((nprocs, len(medians)), dtype=medians.dtype)
+    comm.Allgather(np.ascontiguousarray(medians), all_medians)
+    all_counts = np.empty((nprocs, len(counts)), dtype=np.int64)
+    comm.Allgather(np.ascontiguousarray(counts, dtype=np.int64), all_counts)
+    order = np.argsort(all_medians, axis=0, kind='mergesort')
+    medians = np.take_along_axis(all_medians, order, axis=0)
+    cumulative = np.cumsum(np.take_along_axis(all_counts, order, axis=0),
+                           axis=0)
+    position = np.argmax(2 * cumulative >= cumulative[-1], axis=0)
+    return medians[position, np.arange(medians.shape[1])]
+
+
+def _parallel_select(comm, columns, targets, ks):
+    """ The ``ks[i]``-th smallest value of ``columns[:, targets[i]]`` over
+    all ranks of `comm`, for each ``i``.  Internal.
+
+    `columns` is this rank's share of the values, in any order.  Returns an
+    array of ``len(ks)`` values, the same on every rank.
+    """
+    ks = np.array(ks, dtype=np.int64)
+    candidates = [columns[:, target] for target in targets]
+    result = np.zeros(len(ks), dtype=columns.dtype)
+    active = np.arange(len(ks))
+
+    while len(active):
+        counts = np.array([len(candidates[i]) for i in active],
+                          dtype=np.int64)
+        medians = np.zeros(len(active), dtype=columns.dtype)
+        for (j, i) in enumerate(active):
+            if counts[j]:
+                middle = counts[j] // 2
+                medians[j] = np.partition(candidates[i], middle)[middle]
+        pivots = _pivots(comm, medians, counts)
+
+        below = np.empty((2, len(active)), dtype=np.int64)
+        for (j, i) in enumerate(active):
+            below[0, j] = np.count_nonzero(candidates[i] < pivots[j])
+            below[1, j] = below[0, j] + np.count_nonzero(
+                candidates[i] == pivots[j])
+        total = np.empty_like(below)
+        comm.Allreduce(below, total, op=MPI.SUM)
+
+        still_active = []
+        for (j, i) in enumerate(active):
+            if ks[i] < total[0, j]:
+                candidates[i] = candidates[i][candidates[i] < pivots[j]]
+                still_active.append(i)
+            elif ks[i] < total[1, j]:
+                result[i] = pivots[j]
+            else:
+                candidates[i] = candidates[i][candidates[i] > pivots[j]]
+                ks[i] -= total[1, j]
+                still_active.append(i)
+        active = np.array(still_active, dtype=np.int64)
+    return result
+
+
+def _lerp(a, b, t):
+    """ Linear interpolation between `a` and `b`, as in NumPy's percentile.
+    Internal.
+    """
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
+def quantile_reducer(reduce_comm, larr, out, axes, dtype, q):
+    """ Core reduction function for quantile, percentile and median.
+
+    `q` is a fraction in [0, 1].  Values are interpolated linearly between
+    the nearest two order statistics, as NumPy's default method.
+    """
+    ndarray = larr.ndarray
+    rest = [axis for axis in range(ndarray.ndim) if axis not in axes]
+    nrest = int(np.prod([ndarray.shape[axis] for axis in rest]))
+    columns = ndarray.transpose(list(axes) + rest).reshape(-1, nrest)
+
+    # NaNs make the result NaN, as in NumPy.
+    if columns.dtype.kind in 'fc':
+        local_nan = np.isnan(columns).any(axis=0)
+    else:
+        local_nan = np.zeros(nrest, dtype=bool)
+    has_nan = np.empty_like(local_nan)
+    reduce_comm.Allreduce(local_nan, has_nan, op=MPI.LOR)
+
+    n = int(np.prod([larr.global_shape[axis] for axis in axes]))
+    index = q * (n - 1)
+    k0 = int(np.floor(index))
+    k1 = min(k0 + 1, n - 1)
+    skip = has_nan | (n == 0)
+    targets = np.flatnonzero(~skip)
+    ranks = [k0] if k1 == k0 else [k0, k1]
+    selected = _parallel_select(reduce_comm, columns,
+                                np.tile(targets, len(ranks)),
+                                np.repeat(ranks, len(targets)))
+    selected = selected.astype(dtype).reshape(len(ranks), len(targets))
+
+    if out is not None:
+        values = np.full(nrest, np.nan, dtype=dtype)
+        values[targets] = _lerp(selected[0], selected[-1], index - k0)
+        out.ndarray[...] = values.reshape(out.local_shape)
+    return out
+
+
+# --- Top-k ------------------------------------------------------------------
+#
+# Each rank finds its k-th best value with np.argpartition and keeps the
+# elements strictly better than it, plus the elements tied with it that have
+# the smallest global indices; only these k candidates get global indices
+# and are stored as (value, global index) records.  Ranks with fewer than k
+# elements pad with records whose index is -1.  A Reduce with a user-defined operation
+# that keeps the k best of two candidate lists merges them up a tree, so
+# only O(k log P) data moves.  NaNs count as the largest values, as in
+# np.sort, and ties go to the smallest global index.
+
+
+def _best_records(records, k, largest):
+    """ The `k` best of the (value, index) `records`, best first.
+    Internal.
+    """
+    valid = records['index'] >= 0
+    if largest:
+        order = np.lexsort((-records['index'], records['value'], valid))
+        order = order[::-1]
+    else:
+        order = np.lexsort((records['index'], records['value'], ~valid))
+    return records[order[:k]]
+
+
+def _global_flat_index(larr, positions):
+    """ Global indices into the flattened array of the elements at
+    `positions` in the flattened local array.  Internal.
+    """
+    local_coords = np.unravel_index(positions, larr.local_shape)
+    global_coords = [_global_index_table(larr, axis)[coords]
+                     for (axis, coords) in enumerate(local_coords)]
+    return np.ravel_multi_index(global_coords, larr.global_shape)
+
+
+def _local_best(larr, values, k, largest):
+    """ Positions in `values` of its `k` best elements, with ties broken by
+    global index.  Internal.
+    """
+    n = len(values)
+    kth = n - k if largest else k - 1
+    order = np.argpartition(values, kth)
+    pivot = values[order[kth]]
+    # np.argpartition orders NaNs last, as np.sort does, and treats them as
+    # equal to each other.
+    if values.dtype.kind in 'fc' and np.isnan(pivot):
+        tied = np.isnan(values)
+    else:
+        tied = values == pivot
+    better = order[kth + 1:] if largest else order[:kth]
+    better = better[~tied[better]]
+    ties = np.flatnonzero(tied)
+    need = k - len(better)
+    if need < len(ties):
+        ties = ties[np.argpartition(_global_flat_index(larr, ties),
+                                    need - 1)[:need]]
+    return np.concatenate((better, ties))
+
+
+def local_topk(larr, k, largest=True):
+    """ The `k` largest (or smallest) elements of a LocalArray over all
+    ranks, and their global indices into the flattened array.
+
+    Returns
+    -------
+    (values, indices) or None
+        Best first, on rank 0 of `larr.comm`; None elsewhere.
+    """
+    values = larr.ndarray.ravel()
+    record_dtype = np.dtype([('value', values.dtype), ('index', np.int64)])
+    records = np.zeros(k, dtype=record_dtype)
+    records['index'] = -1
+
+    if len(values):
+        best = _local_best(larr, values, min(k, len(values)), largest)
+        candidates = np.zeros(len(best), dtype=record_dtype)
+        candidates['value'] = values[best]
+        candidates['index'] = _global_flat_index(larr, best)
+        records[:len(best)] = _best_records(candidates, k, largest)
+
+    def merge(inbuf, inoutbuf, datatype):
+        inrecs = np.frombuffer(inbuf, dtype=record_dtype)
+        inoutrecs = np.frombuffer(inoutbuf, dtype=record_dtype)
+        both = np.concatenate((inrecs, inoutrecs))
+        inoutrecs[...] = _best_records(both, k, largest)
+
+    comm = larr.comm
+    is_root = comm.Get_rank() == 0
+    record_type = MPI.BYTE.Create_contiguous(k * record_dtype.itemsize)
+    record_type.Commit()
+    op = MPI.Op.Create(merge, commute=True)
+    try:
+        merged = np.empty_like(records) if is_root else None
+        recvbuf = [merged, record_type] if is_root else None
+        comm.Reduce([records, record_type], recvbuf, op=op, root=0)
+    finally:
+        op.Free()
+        record_type.Free()
+    if not is_root:
+        return None
+    return merged['value'], merged['index']
+
+# --- Prefix scans: cumsum, cumprod ------------------------------------------
+#
+# Along a block-distributed axis the ranks of the scan communicator hold
+# consecutive slabs in rank order, so each rank scans its slab locally,
+# exclusive-scans the slab totals with MPI_Exscan, and combines the
+# resulting offset into its slab.  Other layouts are redistributed to
+# contiguous blocks along the scan axis with one Alltoallv, scanned the same
+# way, and sent back with another.
+
+_scan_ops = {
+    np.add: MPI.SUM,
+    np.multiply: MPI.PROD,
+}
+
+
+def local_scan(larr, ufunc, axis, dtype):
+    """ Inclusive prefix scan of `larr` along `axis` with `ufunc`.
+
+    Parameters
+    ----------
+    larr : LocalArray
+    ufunc : numpy.add or numpy.multiply
+    axis : int
+        Non-negative axis along which to scan.
+    dtype : NumPy dtype
+        The dtype of the result, and of the accumulator.
+
+    Returns
+    -------
+    LocalArray
+        Distributed like `larr`.
+    """
+    op = _scan_ops[ufunc]
+    out = empty_like(larr, dtype=dtype)
+    scan_comm = _reduction_comm(larr, (axis,))
+    if larr.distribution[axis].dist == 'b':
+        _block_scan(scan_comm, op, ufunc, larr, out, axis)
+    else:
+        _redistributed_scan(scan_comm, op, ufunc, larr, out, axis)
+    return out
+
+
+def _block_scan(scan_comm, op, ufunc, larr, out, axis):
+    """ Scan along a block-distributed `axis` with MPI_Exscan.  Internal. """
+    ufunc.accumulate(larr.ndarray, axis=axis, dtype=out.dtype,
+                     out=out.ndarray)
+    _add_scan_offsets(scan_comm, op, ufunc, out.ndarray, axis)
+
+
+def _add_scan_offsets(scan_comm, op, ufunc, scanned, axis):
+    """ Combine the totals of the preceding ranks of `scan_comm` into
+    `scanned`, this rank's locally scanned block along `axis`.  Internal.
+    """
+    if scan_comm.Get_size() == 1:
+        return
+
+    if scanned.shape[axis] == 0:
+        total_shape = scanned.shape[:axis] + scanned.shape[axis+1:]
+        totals = np.empty(total_shape, dtype=scanned.dtype)
+        totals.fill(ufunc.identity)
+    else:
+        totals = np.array(np.take(scanned, -1, axis=axis))
+    offsets = np.empty_like(totals)
+    scan_comm.Exscan(totals, offsets, op=op)
+
+    # MPI_Exscan leaves the receive buffer of the first rank undefined.
+    if scan_comm.Get_rank() > 0:
+        ufunc(scanned, np.expand_dims(offsets, axis), out=scanned)
+
+
+def _redistributed_scan(scan_comm, op, ufunc, larr, out, axis):
+    """ Scan along a cyclic or unstructured `axis` by moving it to
+    contiguous blocks over the ranks of `scan_comm` and back.  Internal.
+    """
+    slab = np.ascontiguousarray(np.rollaxis(larr.ndarray, axis),
+                                dtype=out.dtype)
+    row_size = int(np.prod(slab.shape[1:]))
+    global_indices = _global_index_table(larr, axis)
+
+    # The rank of scan_comm that owns each index in the blocked layout.
+    nprocs, rank = scan_comm.Get_size(), scan_comm.Get_rank()
+    size = larr.global_shape[axis]
+    stops = [_start_stop_block(size, nprocs, r)[1] for r in range(nprocs)]
+    dest = np.searchsorted(stops, global_indices, side='right')
+    order = np.argsort(dest, kind='mergesort')
+    send_counts = np.bincount(dest, minlength=nprocs)
+
+    (indices,), recv_counts = _alltoallv(scan_comm, [global_indices[order]],
+                                         send_counts)
+    (rows,), _ = _alltoallv(scan_comm, [slab[order].ravel()],
+                            send_counts * row_size, recv_counts * row_size)
+    start, stop = _start_stop_block(size, nprocs, rank)
+    block = np.empty((stop - start,) + slab.shape[1:], dtype=out.dtype)
+    block[indices - start] = rows.reshape((len(indices),) + slab.shape[1:])
+
+    ufunc.accumulate(block, axis=0, out=block)
+    _add_scan_offsets(scan_comm, op, ufunc, block, 0)
+
+    # Send the scanned rows back in the order they came in.
+    (rows,), _ = _alltoallv(scan_comm, [block[indices - start].ravel()],
+                            recv_counts * row_size, send_counts * row_size)
+    scanned = np.empty_like(slab)
+    scanned[order] = rows.reshape(slab.shape)
+    out.ndarray[...] = np.rollaxis(scanned, 0, axis + 1)
+
+# --- Sorting ----------------------------------------------------------------
+#
+# Parallel sample sort.  Each rank sorts its section, contributes regularly
+# spaced samples from which every rank picks the same splitters, and sends
+# each element to the rank owning its splitter bucket with one Alltoallv.
+# The received runs are merged locally.  Bucket sizes depend on the data, so
+# a second Alltoallv moves every element to the rank that owns its sorted
+# position in the balanced, block-distributed result.
+#
+# A 2-D array is sorted along axis 0, each column independently; 1-D arrays
+# are handled as a single column.  Elements are tracked as flat arrays of
+# (column, value, global index) so that all columns share the collectives.
+# Ties are broken by global index, as in a stable sort.
+
+
+def _exchange_by_column(comm, arrays, dest, column, ncols):
+    """ Send element ``i`` of each array in `arrays` to rank ``dest[i]``.
+    Internal.
+
+    Elements keep their relative order within each column.  Returns the
+    received arrays, grouped by column and, within a column, by source
+    rank, along with the number of elements received per column.
+    """
+    nprocs = comm.Get_size()
+    bucket = dest * ncols + column
+    order = np.argsort(bucket, kind='mergesort')
+    send_counts = np.bincount(bucket, minlength=nprocs * ncols)
+    send_counts = send_counts.reshape(nprocs, ncols).astype(np.int64)
+    recv_counts = np.empty_like(send_counts)
+    comm.Alltoall(send_counts, recv_counts)
+
+    send_sizes = send_counts.sum(axis=1)
+    recv_sizes = recv_counts.sum(axis=1)
+    received = []
+    for arr in arrays:
+        recvbuf = np.empty(recv_sizes.sum(), dtype=arr.dtype)
+        comm.Alltoallv([np.ascontiguousarray(arr[order]), send_sizes],
+                       [recvbuf, recv_sizes])
+        received.append(recvbuf)
+
+    recv_column = np.repeat(np.tile(np.arange(ncols), nprocs),
+                            recv_counts.ravel())
+    regroup = np.argsort(recv_column, kind='mergesort')
+    return ([recvbuf[regroup] for recvbuf in received],
+            recv_counts.sum(axis=0))
+
+
+def _sort_splitters(comm, values, counts):
+    """ Choose ``comm.Get_size() - 1`` splitters per column from regular
+    samples of the locally sorted `values`.  Internal.
+
+    `values` holds the sorted columns one after the other, column ``c``
+    having ``counts[c]`` elements.  Returns an array of shape
+    ``(ncols, nprocs - 1)``, or None when there is no data at all.
+    """
+    nprocs = comm.Get_size()
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    samples = [values[start + (np.arange(nprocs) * 2 + 1) * count //
+                      (2 * nprocs)]
+               for (start, count) in zip(starts, counts) if count]
+    all_samples = [smp for smp in comm.allgather(samples) if smp]
+    if not all_samples:
+        return None
+    samples = np.sort(np.concatenate([np.array(smp) for smp in all_samples],
+                                     axis=1), axis=1)
+    nsamples = samples.shape[1]
+    return samples[:, np.arange(1, nprocs) * nsamples // nprocs]
+
+
+def local_sort(larr, out_comm, ddpr, return_indices=False):
+    """ Sort `larr` along axis 0 into a block-distributed result.
+
+    Parameters
+    ----------
+    larr : LocalArray
+        A 1-D LocalArray, or a 2-D LocalArray that is not distributed along
+        axis 1.  Its base communicator must be `out_comm`.
+    out_comm : MPI Comm instance
+        The communicator of the result.
+    ddpr : sequence of dim-data tuples
+        The dim-data of the result for every rank of `out_comm`.  Axis 0
+        must be block-distributed.
+    return_indices : bool, optional
+        If True, return the global indices that sort `larr` (along axis 0)
+        instead of the sorted values.
+
+    Returns
+    -------
+    LocalArray
+    """
+    nlocal = larr.local_shape[0]
+    ncols = larr.local_shape[1] if larr.ndim == 2 else 1
+    ndarray = larr.ndarray.reshape(nlocal, ncols)
+    global_rows = _global_index_table(larr, 0)
+
+    values = ndarray.T.ravel()
+    column = np.repeat(np.arange(ncols), nlocal)
+    index = np.tile(global_rows, ncols)
+    order = np.lexsort((index, values, column))
+    values, column, index = values[order], column[order], index[order]
+
+    splitters = _sort_splitters(out_comm, values, [nlocal] * ncols)
+    if splitters is None:
+        dest = np.zeros(len(values), dtype=np.int64)
+    else:
+        dest = np.concatenate([np.searchsorted(splitters[col],
+                                               values[column == col],
+                                               side='right')
+                               for col in range(ncols)])
+
+    # Move each element to its bucket and merge the received runs.
+    (values, index), counts = _exchange_by_column(out_comm, (values, index),
+                                                  dest, column, ncols)
+    column = np.repeat(np.arange(ncols), counts)
+    order = np.lexsort((index, values, column))
+    values, index = values[order], index[order]
+
+    # Move each element to the owner of its sorted position.
+    offsets = np.zeros_like(counts)
+    out_comm.Exscan(np.array(counts), offsets, op=MPI.SUM)
+    if out_comm.Get_rank() == 0:
+        offsets[...] = 0
+    position = np.concatenate([offset + np.arange(count)
+                               for (offset, count) in zip(offsets, counts)])
+    stops = np.array([dim_data[0]['stop'] for dim_data in ddpr])
+    dest = np.searchsorted(stops, position, side='right')
+    result = index if return_indices else values
+    (result,), _ = _exchange_by_column(out_comm, (result,), dest, column,
+                                       ncols)
+
+    dist = maps.Distribution(comm=out_comm,
+                             dim_data=ddpr[out_comm.Get_rank()])
+    out = empty(dist, dtype=result.dtype)
+    out.ndarray[...] = result.reshape(ncols, -1).T.reshape(out.local_shape)
+    return out
+
+
+# --- Compaction -------------------------------------------------------------
+#
+# Selections such as a[mask] leave each rank with a data-dependent number of
+# elements.  An Exscan of the local counts gives every rank the global
+# position of its first element.  The selected elements either stay where
+# they are, as the sections of an irregular block distribution, or are
+# rebalanced into even blocks with one Alltoallv.  Either way the result is
+# in rank order.
+
+
+def _compact(comm, arrays, balance=False):
+    """ Concatenate the 1-D ndarrays in `arrays`, all of the same length,
+    over the ranks of `comm` in rank order.  Internal.
+
+    Returns a list of block-distributed LocalArrays sharing a distribution,
+    even if `balance` and otherwise one where every rank keeps its elements.
+    """
+    rank, nprocs = comm.Get_rank(), comm.Get_size()
+    count = np.array([len(arrays[0])], dtype=np.int64)
+    first = np.zeros_like(count)
+    comm.Exscan(count, first, op=MPI.SUM)
+    if rank == 0:
+        first[0] = 0
+    total = comm.allreduce(int(count[0]), op=MPI.SUM)
+
+    if balance:
+        stops = [_start_stop_block(total, nprocs, r)[1]
+                 for r in range(nprocs)]
+        dest = np.searchsorted(stops, first[0] + np.arange(count[0]),
+                               side='right')
+        column = np.zeros(count[0], dtype=np.int64)
+        arrays, _ = _exchange_by_column(comm, arrays, dest, column, 1)
+        start, stop = _start_stop_block(total, nprocs, rank)
+    else:
+        start, stop = int(first[0]), int(first[0] + count[0])
+
+    dim_data = ({'dist_type': 'b',
+                 'size': total,
+                 'proc_grid_rank': rank,
+                 'proc_grid_size': nprocs,
+                 'start': start,
+                 'stop': stop},)
+    dist = maps.Distribution(comm=comm, dim_data=dim_data)
+    return [LocalArray(dist, buf=arr) for arr in arrays]
+
+
+def local_compress(larr, mask, out_comm, balance=False):
+    """ The elements of `larr` where `mask` is True, over all ranks.
+
+    Parameters
+    ----------
+    larr : LocalArray
+    mask : LocalArray
+        Of bools, distributed like `larr`.
+    out_comm : MPI Comm instance
+        The communicator of the result, with the same ranks as the base
+        communicator of `larr`.
+    balance : bool, optional
+        If True, rebalance the result into even blocks.
+
+    Returns
+    -------
+    LocalArray
+        1-D and block-distributed, holding the selected elements of the
+        ranks in rank order.
+    """
+    values = larr.ndarray[mask.ndarray]
+    return _compact(out_comm, (values,), balance)[0]
+
+
+def local_nonzero(mask, out_comm, balance=False, shape=None):
+    """ The global indices of the nonzero elements of `mask`, over all ranks.
+
+    The indices are flat indices into `mask`, unraveled into `shape`, which
+    defaults to the global shape of `mask`.  See `local_compress` for the
+    other parameters.
+
+    Returns
+    -------
+    list of LocalArrays
+        One per dimension of `shape`.
+    """
+    positions = np.flatnonzero(mask.ndarray)
+    local_coords = np.unravel_index(positions, mask.local_shape)
+    global_coords = [_global_index_table(mask, axis)[coords]
+                     for (axis, coords) in enumerate(local_coords)]
+    flat = np.ravel_multi_index(global_coords, mask.global_shape)
+    shape = mask.global_shape if shape is None else shape
+    indices = [np.asarray(ind, dtype=np.int64)
+               for ind in np.unravel_index(flat, shape)]
+    return _compact(out_comm, indices, balance)
+
+
+# --- Fancy indexing ---------------------------------------------------------
+#
+# take and put with distributed index arrays.  Every rank translates the flat
+# global indices it holds into (owner, local index) pairs with the ownership
+# rules of the indexed array's dim-data, and one Alltoallv routes the
+# requests to the owners.  For take, the owners answer with a second
+# Alltoallv of the same shape, reversed, and the answers are put back in
+# request order.
+
+
+def _alltoallv(comm, arrays, send_counts, recv_counts=None):
+    """ Exchange each of the 1-D `arrays`, grouped by destination rank with
+    ``send_counts[r]`` elements for rank ``r``.  Internal.
+
+    Returns the received arrays, grouped by source rank, and the number of
+    elements received from each rank.
+    """
+    send_counts = np.asarray(send_counts, dtype=np.int64)
+    if recv_counts is None:
+        recv_counts = np.empty_like(send_counts)
+        comm.Alltoall(send_counts, recv_counts)
+    received = []
+    for arr in arrays:
+        recvbuf = np.empty(recv_counts.sum(), dtype=arr.dtype)
+        comm.Alltoallv([np.ascontiguousarray(arr), send_counts],
+                       [recvbuf, recv_counts])
+        received.append(recvbuf)
+    return received, recv_counts
+
+
+def _send_to_owners(comm, ddpr, global_shape, flat, arrays=()):
+    """ Send the flat global indices `flat` of an array with dim-data
+    `ddpr` to their owners as local indices, along with the matching
+    elements of `arrays`.  Internal.
+
+    Returns the permutation that grouped the requests by owner, the number
+    of requests sent to and received from each rank, and the received local
+    indices (one array per dimension) followed by the received `arrays`.
+    """
+    size = int(np.prod(global_shape))
+    bad = bool(np.any((flat < -size) | (flat >= size)))
+    if comm.allreduce(bad, op=MPI.LOR):
+        raise IndexError("Index out of bounds for size %d" % size)
+    flat = np.where(flat < 0, flat + size, flat)
+    ranks, local = owning_ranks_and_local_indices(
+        ddpr, np.unravel_index(flat, global_shape))
+
+    order = np.argsort(ranks, kind='mergesort')
+    send_counts = np.bincount(ranks, minlength=comm.Get_size())
+    outgoing = [ind[order] for ind in local] + [arr[order] for arr in arrays]
+    received, recv_counts = _alltoallv(comm, outgoing, send_counts)
+    return order, send_counts, recv_counts, received
+
+
+def local_take(larr, ddpr, comm, indices):
+    """ Gather the elements of `larr` at the flat global `indices`.
+
+    Parameters
+    ----------
+    larr : LocalArray
+    ddpr : sequence of dim-data tuples
+        The dim-data of `larr` for every rank of `comm`.
+    comm : MPI Comm instance
+        A communicator of the ranks holding `larr` and `indices`.
+    indices : LocalArray
+        Of ints, indexing the flattened `larr`.
+
+    Returns
+    -------
+    LocalArray
+        Distributed like `indices`.
+    """
+    flat = indices.ndarray.ravel().astype(np.int64)
+    order, send_counts, recv_counts, received = _send_to_owners(
+        comm, ddpr, larr.global_shape, flat)
+    answers = larr.ndarray[tuple(received)]
+    (values,), _ = _alltoallv(comm, (answers,), recv_counts, send_counts)
+    result = np.empty(len(flat), dtype=larr.dtype)
+    result[order] = values
+    return LocalArray(indices.distribution,
+                      buf=result.reshape(indices.local_shape))
+
+
+def local_put(larr, ddpr, comm, indices, values, ufunc=None):
+    """ Scatter `values` into `larr` at the flat global `indices`.
+
+    `values` is a LocalArray distributed like `indices`, or a scalar.  If a
+    `ufunc` is given, the values are combined into `larr` with ``ufunc.at``,
+    so repeated indices accumulate; otherwise, one of the values for a
+    repeated index wins.  See `local_take` for the other parameters.
+    """
+    flat = indices.ndarray.ravel().astype(np.int64)
+    if isinstance(values, LocalArray):
+        values = values.ndarray.ravel()
+    values = np.broadcast_to(np.asarray(values, dtype=larr.dtype), flat.shape)
+    _, _, _, received = _send_to_owners(comm, ddpr, larr.global_shape, flat,
+                                        (values,))
+    local, values = tuple(received[:-1]), received[-1]
+    if ufunc is None:
+        larr.ndarray[local] = values
+    else:
+        ufunc.at(larr.ndarray, local, values)
+
+
+# --- Histograms --------------------------------------------------------------
+#
+# Each rank bins its own section; the counts are summed onto rank 0 of the
+# array's communicator with a single Reduce.  Bin edges that depend on the
+# data use the global minimum and maximum, found with a single Allreduce.
+
+def _global_min_max(comm, values):
+    """ The minimum and maximum of `values` over all ranks of `comm`, as
+    floats, or None if there are no values at all.  Internal.
+
+    Both come from one Allreduce of ``[-min, max]`` with MPI.MAX; ranks
+    without values contribute ``-inf``.  MPI.MAX is undefined for NaNs, so
+    ranks with NaNs contribute ``inf``, and the range is then ``(-inf,
+    inf)`` on every rank.
+    """
+    local = np.array([-np.inf, -np.inf])
+    if values.size:
+        local[:] = -float(values.min()), float(values.max())
+        if np.isnan(local).any():
+            local[:] = np.inf
+    extrema = np.empty_like(local)
+    comm.Allreduce(local, extrema, op=MPI.MAX)
+    if extrema[1] == -np.inf:
+        return None
+    return -extrema[0], extrema[1]
+
+
+def local_histogram(larr, bins=10, range=None, weights=None):
+    """ Histogram of the values of a LocalArray over all ranks, as
+    `numpy.histogram`.
+
+    Parameters
+    ----------
+    larr : LocalArray
+    bins : int or sequence of scalars, optional
+    range : (float, float), optional
+        Defaults to the global minimum and maximum of `larr`.
+    weights : LocalArray, optional
+        Distributed like `larr`.
+
+    Returns
+    -------
+    (hist, bin_edges) or None
+        On rank 0 of `larr.comm`; None elsewhere.
+    """
+    comm = larr.comm
+    values = larr.ndarray.ravel()
+    if range is None and np.ndim(bins) == 0:
+        range = _global_min_max(comm, values)
+        if range is None:
+            range = (0, 1)
+        elif not np.isfinite(range).all():
+            raise ValueError("autodetected range of [%s, %s] is not finite"
+                             % range)
+    edges = np.histogram_bin_edges(values, bins, range)
+    if weights is not None:
+        weights = weights.ndarray.ravel()
+    hist, _ = np.histogram(values, edges, weights=weights)
+    total = np.empty_like(hist) if comm.Get_rank() == 0 else None
+    comm.Reduce(hist, total, op=MPI.SUM, root=0)
+    return None if total is None else (total, edges)
+
+
+def local_bincount(larr, weights=None, minlength=0):
+    """ Number of occurrences of each value in a 1-D LocalArray of
+    non-negative ints over all ranks, as `numpy.bincount`.
+
+    Returns
+    -------
+    ndarray or None
+        On rank 0 of `larr.comm`; None elsewhere.
+    """
+    comm = larr.comm
+    values = larr.ndarray
+    extrema = _global_min_max(comm, values)
+    if extrema is not None and extrema[0] < 0:
+        raise ValueError("'list' argument must have no negative elements")
+    length = (minlength if extrema is None else
+              max(int(extrema[1]) + 1, minlength))
+    if weights is not None:
+        weights = weights.ndarray
+    counts = np.bincount(values, weights, minlength=length)
+    total = np.empty_like(counts) if comm.Get_rank() == 0 else None
+    comm.Reduce(counts, total, op=MPI.SUM, root=0)
+    return total
+
+
+# --- Unique values -----------------------------------------------------------
+#
+# Each rank finds the unique values of its section and their counts, then
+# sends every (value, count) pair to the rank that owns the value under a
+# hash partition, with one Alltoallv.  Every value ends up on exactly one
+# rank, which merges the partial counts.  The merged sections become the
+# sections of a block-distributed result, so no further data moves; each
+# section is sorted, but the result as a whole is not.
+
+_FNV_OFFSET = np.uint64(14695981039346656037)
+_FNV_PRIME = np.uint64(1099511628211)
+
+
+def _hash_owner(values, nprocs):
+    """ The rank owning each of `values` when hash-partitioned over `nprocs`
+    ranks.  Internal.
+
+    The FNV-1a hash of the bytes of each value is used, so equal values
+    have the same owner on every rank.
+    """
+    if values.dtype.kind in 'fc':
+        values = values + 0  # Maps -0.0 onto 0.0.
+    data = np.ascontiguousarray(values).view(np.uint8)
+    data = data.reshape(len(values), values.dtype.itemsize)
+    hashes = np.full(len(values), _FNV_OFFSET, dtype=np.uint64)
+    for column in data.T:
+        hashes ^= column
+        hashes *= _FNV_PRIME
+    return (hashes % np.uint64(nprocs)).astype(np.int64)
+
+
+def local_unique(larr, out_comm):
+    """ The unique values of a LocalArray over all ranks and the number of
+    times each occurs.
+
+    Parameters
+    ----------
+    larr : LocalArray
+    out_comm : MPI Comm instance
+        The communicator of the results, with the same ranks as the base
+        communicator of `larr`.
+
+    Returns
+    -------
+    (values, counts) : pair of 1-D, block-distributed LocalArrays
+        Each rank holds, in sorted order, the values it owns under a hash
+        partition.
+    """
+    nprocs = out_comm.Get_size()
+    values, counts = np.unique(larr.ndarray, return_counts=True)
+    counts = counts.astype(np.int64)
+    owner = _hash_owner(values, nprocs)
+    column = np.zeros(len(values), dtype=np.int64)
+    (values, counts), _ = _exchange_by_column(out_comm, (values, counts),
+                                              owner, column, 1)
+
+    values, inverse = np.unique(values, return_inverse=True)
+    merged = np.zeros(len(values), dtype=np.int64)
+    np.add.at(merged, inverse.ravel(), counts)
+
+    values, merged = _compact(out_comm, (values, merged))
+    return values, merged
+
+
+# --- Matrix products ---------------------------------------------------------
+
+def local_summa(a, b, out_comm, ddpr, panels, dtype):
+    """ Multiply 2-D block-distributed LocalArrays with SUMMA.
+
+    `a` and `b` must share a base communicator and process grid.  For each
+    panel of the inner dimension, the process column owning that panel of
+    `a` broadcasts it along the process rows, the process row owning that
+    panel of `b` broadcasts it along the process columns, and every rank
+    accumulates the product of the two panels into its block of the result.
+
+    Parameters
+    ----------
+    a, b : LocalArray
+    out_comm : MPI Comm instance
+        The communicator of the result.
+    ddpr : sequence of dim-data tuples
+        The dim-data of the result for every rank of `out_comm`.
+    panels : sequence of tuples
+        ``(start, stop, a_owner, b_owner)`` for each panel of the inner
+        dimension, where `a_owner` is the process-grid column holding
+        ``a[:, start:stop]`` and `b_owner` the process-grid row holding
+        ``b[start:stop, :]``.
+    dtype : NumPy dtype
+        The dtype of the result.
+
+    Returns
+    -------
+    LocalArray
+    """
+    out = _reduction_out(out_comm, ddpr, dtype)
+    out.fill(0)
+    row_comm = a.comm.Sub([False, True])
+    col_comm = a.comm.Sub([True, False])
+    a_offset = a.distribution[1].start
+    b_offset = b.distribution[0].start
+    a_col = a.cart_coords[1]
+    b_row = b.cart_coords[0]
+
+    for (start, stop, a_owner, b_owner) in panels:
+        if a_col == a_owner:
+            a_panel = a.ndarray[:, start - a_offset:stop - a_offset]
+            a_panel = np.ascontiguousarray(a_panel, dtype=dtype)
+        else:
+            a_panel = np.empty((a.local_shape[0], stop - start), dtype=dtype)
+        row_comm.Bcast(a_panel, root=a_owner)
+
+        if b_row == b_owner:
+            b_panel = b.ndarray[start - b_offset:stop - b_offset, :]
+            b_panel = np.ascontiguousarray(b_panel, dtype=dtype)
+        else:
+            b_panel = np.empty((stop - start, b.local_shape[1]), dtype=dtype)
+        col_comm.Bcast(b_panel, root=b_owner)
+
+        out.ndarray += np.dot(a_panel, b_panel)
+    return out
+
+
+def _vector_piece(comm, vec, bounds, dtype):
+    """ Give each rank of `comm` the elements of the 1-D `vec` in its global
+    range ``bounds[rank]``, with a single Alltoallv.  Internal.
+    """
+    indices = _global_index_table(vec, 0)
+    values = np.asarray(vec.ndarray, dtype=dtype)
+    wanted = [np.flatnonzero((indices >= start) & (indices < stop))
+              for (start, stop) in bounds]
+    order = np.concatenate(wanted)
+    (got_indices, got_values), _ = _alltoallv(
+        comm, [indices[order], values[order]], [len(w) for w in wanted])
+    start, stop = bounds[comm.Get_rank()]
+    piece = np.empty(stop - start, dtype=dtype)
+    piece[got_indices - start] = got_values
+    return piece
+
+
+def local_matvec(mat, vec, out_comm, ddpr, dtype, bounds=None,
+                 vec_first=False):
+    """ Multiply a 2-D block-distributed LocalArray by a 1-D LocalArray.
+
+    Each rank multiplies its block of `mat` by the piece of `vec` that lines
+    up with its columns (rows, for ``vec @ mat``), and the partial products
+    are summed with a single Reduce over the process-grid row (or column).
+    A rank only receives its own piece of `vec`, with one Alltoallv, and
+    nothing moves if `vec` is already distributed that way.
+
+    Parameters
+    ----------
+    mat, vec : LocalArray
+        Must be on the same ranks.
+    out_comm : MPI Comm instance
+        The communicator of the result, which must be the reduction of
+        `mat`'s distribution along the inner dimension.
+    ddpr : sequence of dim-data tuples
+    dtype : NumPy dtype
+    bounds : sequence of (start, stop), optional
+        The global range of the inner dimension of `mat` on each rank of
+        `mat.comm`.  None if each rank's section of `vec` is that range.
+    vec_first : bool, optional
+        Compute ``vec @ mat`` instead of ``mat @ vec``.
+
+    Returns
+    -------
+    LocalArray or None
+        None on ranks that are not part of `out_comm`.
+    """
+    axis = 0 if vec_first else 1
+    if bounds is None:
+        piece = np.asarray(vec.ndarray, dtype=dtype)
+    else:
+        piece = _vector_piece(mat.comm, vec, bounds, dtype)
+    if vec_first:
+        partial = np.dot(piece, mat.ndarray)
+    else:
+        partial = np.dot(mat.ndarray, piece)
+    partial = np.ascontiguousarray(partial, dtype=dtype)
+
+    out = _reduction_out(out_comm, ddpr, dtype)
+    reduce_comm = _reduction_comm(mat, (axis,))
+    reduce_comm.Reduce(partial, out.ndarray if out is not None else None,
+                       op=MPI.SUM, root=0)
+    return out
+
+
+def local_inner(a, b, out_comm, ddpr, dtype):
+    """ Inner product of two 1-D LocalArrays with the same distribution,
+    summed with a single Reduce.
+
+    Returns
+    -------
+    LocalArray or None
+        The 0-d result on the rank of `out_comm`, None elsewhere.
+    """
+    partial = np.array(np.dot(a.ndarray, b.ndarray), dtype=dtype)
+    out = _reduction_out(out_comm, ddpr, dtype)
+    reduce_comm = _reduction_comm(a, (0,))
+    reduce_comm.Reduce(partial, out.ndarray if out is not None else None,
+                       op=MPI.SUM, root=0)
+    return out
+
+# --- Transposes and reshapes -------------------------------------------------
+#
+# A transpose permutes the maps and the process grid.  The transposed block
+# of a rank then belongs to the rank at the permuted grid coordinates, which
+# is the same rank unless the permutation reorders distributed dimensions.
+#
+# A reshape (in C order) goes through the global linear index.  The result
+# is block-distributed along its first dimension, so that every rank owns a
+# contiguous linear range.  A source section that is itself a contiguous
+# range only sends the segments overlapping each destination range; other
+# sections send the linear index of every element along with its value.
+
+def local_transpose(larr, axes, out_comm, ddpr, sources, dests):
+    """ Permute the dimensions of a LocalArray.
+
+    Parameters
+    ----------
+    larr : LocalArray
+    axes : sequence of ints
+        The permutation, as for `numpy.transpose`.
+    out_comm : MPI Comm instance
+        The communicator of the result.
+    ddpr : sequence of dim-data tuples
+        The dim-data of the result for every rank of `out_comm`.
+    sources, dests : sequences of ints
+        For every rank, the rank its block of the result comes from and the
+        rank its transposed block goes to.
+
+    Returns
+    -------
+    LocalArray
+    """
+    rank = out_comm.Get_rank()
+    distribution = maps.Distribution(comm=out_comm, dim_data=ddpr[rank])
+    out = empty(distribution, dtype=larr.dtype)
+    block = np.ascontiguousarray(np.transpose(larr.ndarray, axes))
+    if dests[rank] == rank:
+        out.ndarray[...] = block
+    else:
+        recvbuf = np.empty(out.local_shape, dtype=larr.dtype)
+        out_comm.Sendrecv(block, dest=dests[rank], recvbuf=recvbuf,
+                          source=sources[rank])
+        out.ndarray[...] = recvbuf
+    return out
+
+
+def _linear_start(larr):
+    """ Return the linear (C order) index of the first local element and
+    whether the local section is a contiguous linear range.  Internal.
+    """
+    if larr.local_size == 0:
+        return 0, True
+    tables = [_global_index_table(larr, axis) for axis in range(larr.ndim)]
+    first = np.ravel_multi_index([t[0] for t in tables], larr.global_shape)
+    last = np.ravel_multi_index([t[-1] for t in tables], larr.global_shape)
+    return int(first), int(last - first + 1) == larr.local_size
+
+
+def _linear_indices(larr):
+    """ Return the linear (C order) index of every local element, in local
+    C order.  Internal.
+    """
+    tables = [_global_index_table(larr, axis) for axis in range(larr.ndim)]
+    return np.ravel_multi_index(np.ix_(*tables), larr.global_shape).ravel()
+
+
+def local_reshape(larr, out_comm, ddpr):
+    """ Give a LocalArray a new shape, as `numpy.reshape` in C order.
+
+    Parameters
+    ----------
+    larr : LocalArray
+    out_comm : MPI Comm instance
+        The communicator of the result, with the ranks of `larr`'s base
+        communicator.
+    ddpr : sequence of dim-data tuples
+        The dim-data of the result for every rank of `out_comm`.  The result
+        must be block-distributed along its first dimension only, in rank
+        order.
+
+    Returns
+    -------
+    LocalArray
+    """
+    rank = out_comm.Get_rank()
+    distribution = maps.Distribution(comm=out_comm, dim_data=ddpr[rank])
+    out = empty(distribution, dtype=larr.dtype)
+
+    first, contiguous = _linear_start(larr)
+    sources = out_comm.allgather((first, contiguous))
+    out_counts = np.array(out_comm.allgather(out.local_size), dtype=np.int64)
+    out_stops = np.cumsum(out_counts)
+    out_starts = out_stops - out_counts
+
+    values = larr.ndarray.ravel()
+    if contiguous:
+        send_lo = np.clip(out_starts - first, 0, values.size)
+        send_hi = np.clip(out_stops - first, 0, values.size)
+        indices = np.empty(0, dtype=np.int64)
+    else:
+        indices = _linear_indices(larr)
+        order = np.argsort(indices, kind='mergesort')
+        indices, values = indices[order], values[order]
+        send_lo = np.searchsorted(indices, out_starts)
+        send_hi = np.searchsorted(indices, out_stops)
+    send_counts = send_hi - send_lo
+    recv_counts = np.empty_like(send_counts)
+    out_comm.Alltoall(send_counts, recv_counts)
+    recv_displs = np.cumsum(recv_counts) - recv_counts
+
+    received = np.empty(recv_counts.sum(), dtype=larr.dtype)
+    out_comm.Alltoallv([values, (send_counts, send_lo)],
+                       [received, (recv_counts, recv_displs)])
+
+    # Linear indices only come from the non-contiguous sources.
+    index_send_counts = send_counts * (not contiguous)
+    index_counts = recv_counts * [not c for (_, c) in sources]
+    index_displs = np.cumsum(index_counts) - index_counts
+    received_indices = np.empty(index_counts.sum(), dtype=np.int64)
+    out_comm.Alltoallv([indices, (index_send_counts,
+                                  send_lo * (not contiguous))],
+                       [received_indices, (index_counts, index_displs)])
+
+    flat = out.ndarray.reshape(-1)
+    lo = out_starts[rank]
+    index_start = 0
+    for (source, (source_first, source_contiguous)) in enumerate(sources):
+        count = recv_counts[source]
+        segment = received[recv_displs[source]:recv_displs[source] + count]
+        if source_contiguous:
+            start = max(source_first, lo) - lo
+            flat[start:start + count] = segment
+        else:
+            positions = received_indices[index_start:index_start + count]
+            flat[positions - lo] = segment
+            index_start += count
+    return out
+
+# --- Assembling arrays from blocks -------------------------------------------
+
+def _intersect(bounds, other):
+    """ The intersection of two boxes of (start, stop) pairs, or None if it
+    is empty.  Internal.
+    """
+    box = [(max(lo, olo), min(hi, ohi))
+           for ((lo, hi), (olo, ohi)) in zip(bounds, other)]
+    if any(lo >= hi for (lo, hi) in box):
+        return None
+    return box
+
+
+def local_assemble(blocks, out_comm, ddpr, dtype):
+    """ Assemble a block-distributed LocalArray from blocks of other
+    LocalArrays.
+
+    Every rank sends every other rank only the parts of its blocks that fall
+    into that rank's section of the result, with a single ``Alltoallv``.
+
+    Parameters
+    ----------
+    blocks : sequence of (rank, key, bounds) tuples
+        The LocalArray named `key` on rank `rank` of `out_comm` holds the
+        box `bounds`, a (start, stop) pair per dimension, of the result.
+        The same sequence must be given on every rank.
+    out_comm : MPI Comm instance
+        The communicator of the result.
+    ddpr : sequence of dim-data tuples
+        The dim-data of the result for every rank of `out_comm`; block or
+        undistributed dimensions only.
+    dtype : NumPy dtype
+        The dtype of the result.
+
+    Returns
+    -------
+    LocalArray
+    """
+    rank = out_comm.Get_rank()
+    nprocs = out_comm.Get_size()
+    distribution = maps.Distribution(comm=out_comm, dim_data=ddpr[rank])
+    out = empty(distribution, dtype=dtype)
+    out_bounds = [dim_data_bounds(dim_data) for dim_data in ddpr]
+
+    # Both sides walk `blocks` in the same order, so the pieces of a message
+    # need no header.
+    pieces = [[] for _ in range(nprocs)]
+    boxes = [[] for _ in range(nprocs)]
+    for (source, key, bounds) in blocks:
+        if source == rank:
+            larr = get_from_dotted_name(key)
+            for dest in range(nprocs):
+                box = _intersect(bounds, out_bounds[dest])
+                if box is not None:
+                    index = tuple(slice(lo - start, hi - start) for
+                                  ((lo, hi), (start, _)) in zip(box, bounds))
+                    pieces[dest].append(larr.ndarray[index].ravel())
+        box = _intersect(bounds, out_bounds[rank])
+        if box is not None:
+            boxes[source].append(box)
+
+    send_counts = [sum(piece.size for piece in dest_pieces)
+                   for dest_pieces in pieces]
+    sendbuf = np.empty(sum(send_counts), dtype=dtype)
+    position = 0
+    for piece in (piece for dest_pieces in pieces for piece in dest_pieces):
+        sendbuf[position:position + piece.size] = piece
+        position += piece.size
+
+    shapes = [[tuple(hi - lo for (lo, hi) in box) for box in source_boxes]
+              for source_boxes in boxes]
+    recv_counts = [sum(int(np.prod(shape)) for shape in source_shapes)
+                   for source_shapes in shapes]
+    recvbuf = np.empty(sum(recv_counts), dtype=dtype)
+    out_comm.Alltoallv([sendbuf, send_counts], [recvbuf, recv_counts])
+
+    out_start = [start for (start, _) in out_bounds[rank]]
+    position = 0
+    for (source_boxes, source_shapes) in zip(boxes, shapes):
+        for (box, shape) in zip(source_boxes, source_shapes):
+            size = int(np.prod(shape))
+            index = tuple(slice(lo - start, hi - start) for
+                          ((lo, hi), start) in zip(box, out_start))
+            out.ndarray[index] = recvbuf[position:position + size].reshape(
+                shape)
+            position += size
     return out
 
 # ---------------------------------------------------------------------------
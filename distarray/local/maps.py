@@ -27,6 +27,7 @@ import numpy as np
 from distarray.externals.six.moves import range, zip
 
 from distarray.local import construct
+from distarray.local.mpiutils import MPI
 from distarray.metadata_utils import (make_grid_shape, normalize_grid_shape,
                                       normalize_dist, distribute_indices,
                                       positivify)
@@ -104,6 +105,26 @@ class Distribution(object):
     def local_size(self):
         return reduce(operator.mul, self.local_shape, 1)
 
+    @property
+    def padding(self):
+        """The (low, high) ghost-cell widths along each dimension."""
+        return tuple(m.padding for m in self._maps)
+
+    @property
+    def padded_shape(self):
+        """The local shape including ghost cells."""
+        return tuple(lo + size + hi
+                     for ((lo, hi), size) in zip(self.padding,
+                                                 self.local_shape))
+
+    @property
+    def interior(self):
+        """The slices selecting the locally owned elements of a buffer of
+        shape `padded_shape`."""
+        return tuple(slice(lo, lo + size)
+                     for ((lo, hi), size) in zip(self.padding,
+                                                 self.local_shape))
+
     @property
     def ndim(self):
         return len(self._maps)
@@ -126,6 +147,45 @@ class Distribution(object):
         assert coords == tuple(self.comm.Get_coords(self.comm_rank))
         return coords
 
+    def cart_comm(self, periods):
+        """ Return a Cartesian communicator over this distribution's process
+        grid with the given periodicity per dimension.
+
+        Periodic communicators are created on first use, which is collective
+        over `base_comm`, and kept for later calls.
+        """
+        periods = tuple(bool(p) for p in periods)
+        if not any(periods):
+            return self.comm
+        comms = self.__dict__.setdefault('_periodic_comms', {})
+        try:
+            return comms[periods]
+        except KeyError:
+            comm = self.base_comm.Create_cart(self.grid_shape, periods,
+                                              reorder=False)
+            comms[periods] = comm
+            return comm
+
+    def free(self):
+        """ Free the periodic communicators created by `cart_comm`.
+
+        Called when the Distribution is dropped; calling it again, or after
+        MPI is finalized, does nothing.
+        """
+        comms = self.__dict__.pop('_periodic_comms', {})
+        if MPI.Is_finalized():
+            return
+        for comm in comms.values():
+            comm.Free()
+
+    __del__ = free
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The periodic communicators belong to this instance.
+        state.pop('_periodic_comms', None)
+        return state
+
     def coords_from_rank(self, rank):
         return self.comm.Get_coords(rank)
 
@@ -158,13 +218,16 @@ def map_from_dim_dict(dd):
     grid_size = dd.get('proc_grid_size', 1)
     block_size = dd.get('block_size', 1)
     indices = dd.get('indices', None)
+    padding = tuple(dd.get('padding', (0, 0)))
 
     if dist_type == 'n':
         return BlockMap(global_size=size, grid_size=grid_size,
-                        grid_rank=grid_rank, start=0, stop=size)
+                        grid_rank=grid_rank, start=0, stop=size,
+                        padding=padding)
     if dist_type == 'b':
         return BlockMap(global_size=size, grid_size=grid_size,
-                        grid_rank=grid_rank, start=start, stop=stop)
+                        grid_rank=grid_rank, start=start, stop=stop,
+                        padding=padding)
     if dist_type == 'c' and block_size == 1:
         return CyclicMap(global_size=size, grid_size=grid_size,
                          grid_rank=grid_rank, start=start)
@@ -182,7 +245,9 @@ def map_from_dim_dict(dd):
 class MapBase(object):
     """ Base class for all one dimensional Map classes.
     """
-    pass
+
+    # Ghost cells on the (low, high) side of the local section.
+    padding = (0, 0)
 
 
 class BlockMap(MapBase):
@@ -191,13 +256,15 @@ class BlockMap(MapBase):
 
     dist = 'b'
 
-    def __init__(self, global_size, grid_size, grid_rank, start, stop):
+    def __init__(self, global_size, grid_size, grid_rank, start, stop,
+                 padding=(0, 0)):
         self.start = start
         self.stop = stop
         self.local_size = stop - start
         self.global_size = global_size
         self.grid_size = grid_size
         self.grid_rank = grid_rank
+        self.padding = tuple(padding)
 
     def local_from_global(self, gidx):
         if gidx < self.start or gidx >= self.stop:
@@ -211,13 +278,16 @@ class BlockMap(MapBase):
 
     @property
     def dim_dict(self):
-        return {'dist_type': self.dist,
-                'size': self.global_size,
-                'proc_grid_rank': self.grid_rank,
-                'proc_grid_size': self.grid_size,
-                'start': self.start,
-                'stop': self.stop,
-                }
+        dim_dict = {'dist_type': self.dist,
+                    'size': self.global_size,
+                    'proc_grid_rank': self.grid_rank,
+                    'proc_grid_size': self.grid_size,
+                    'start': self.start,
+                    'stop': self.stop,
+                    }
+        if any(self.padding):
+            dim_dict['padding'] = self.padding
+        return dim_dict
 
     @property
     def global_iter(self):
@@ -0,0 +1,201 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+One-sided access to the elements of a distributed array.
+
+A `Window` exposes the local buffer of every rank's LocalArray in an MPI RMA
+window, so that code running on the engines can read and update arbitrary
+elements of the array without the cooperation of their owners.  Global
+indices are resolved to owning ranks and buffer offsets with the array's
+dim-data.  Every call is one passive-target epoch in which each owner
+involved is accessed once, through an indexed datatype that covers all the
+elements requested from it.
+
+Windows are created with `distarray.dist.distarray.DistArray.expose`.
+"""
+
+from __future__ import division
+
+import numpy as np
+
+from distarray.local import maps
+from distarray.local.mpiutils import MPI
+from distarray.metadata_utils import owning_ranks_and_local_indices
+
+
+# NumPy equivalents of the MPI operations `Window.accumulate` supports, used
+# to combine repeated indices before they are sent.  MPI.Op objects are not
+# hashable, hence the list of pairs.
+_accumulate_ufuncs = [
+    (MPI.SUM, np.add),
+    (MPI.PROD, np.multiply),
+    (MPI.MAX, np.maximum),
+    (MPI.MIN, np.minimum),
+    (MPI.REPLACE, None),
+]
+
+
+class Window(object):
+    """ An MPI window over the local buffers of a distributed array.
+
+    Creating and freeing a Window are collective over `comm`.
+
+    Parameters
+    ----------
+    larr : LocalArray
+    ddpr : sequence of dim-data tuples
+        The dim-data of `larr` for every rank of `comm`.
+    comm : MPI Comm instance
+        A communicator of the ranks holding `larr`, in the order of `ddpr`.
+    """
+
+    def __init__(self, larr, ddpr, comm):
+        buf = larr.padded_ndarray
+        if not buf.flags.c_contiguous:
+            raise ValueError("The local buffer must be C contiguous.")
+        self.larr = larr
+        self.ddpr = ddpr
+        self.comm = comm
+        self.dtype = buf.dtype
+        self.base_type = MPI._typedict[buf.dtype.char]
+        self.win = MPI.Win.Create(buf, disp_unit=buf.dtype.itemsize,
+                                  comm=comm)
+
+        # Offset of the interior and shape of every rank's padded buffer.
+        lower, padded_shape = [], []
+        for dim_data in ddpr:
+            padding = [tuple(dd.get('padding', (0, 0))) for dd in dim_data]
+            sizes = [maps.map_from_dim_dict(dd).size for dd in dim_data]
+            lower.append([lo for (lo, _) in padding])
+            padded_shape.append([size + lo + hi
+                                 for (size, (lo, hi)) in zip(sizes, padding)])
+        self._lower = np.array(lower, dtype=np.int64)
+        padded_shape = np.array(padded_shape, dtype=np.int64)
+        # C-order strides, in elements, of every rank's padded buffer.
+        self._strides = np.cumprod(padded_shape[:, :0:-1], axis=1)[:, ::-1]
+        self._strides = np.hstack((self._strides,
+                                   np.ones((len(ddpr), 1), dtype=np.int64)))
+
+    def _normalize(self, global_indices):
+        """ Return `global_indices` as an array of shape ``(K, ndim)``,
+        without negative indices.  Internal.
+        """
+        indices = np.asarray(global_indices, dtype=np.int64)
+        if self.larr.ndim == 1 and indices.ndim == 1:
+            indices = indices[:, np.newaxis]
+        if indices.ndim != 2 or indices.shape[1] != self.larr.ndim:
+            msg = "global_indices must have shape (K, %d)."
+            raise IndexError(msg % self.larr.ndim)
+        shape = np.array(self.larr.global_shape)
+        return np.where(indices < 0, indices + shape, indices)
+
+    def _locate(self, indices):
+        """ The owning rank and buffer offset of each index tuple.
+        Internal.
+        """
+        ranks, local = owning_ranks_and_local_indices(self.ddpr, indices.T)
+        coords = np.array(local, dtype=np.int64).reshape(len(local), -1).T
+        coords = coords + self._lower[ranks]
+        offsets = (coords * self._strides[ranks]).sum(axis=1)
+        return ranks, offsets
+
+    def _epoch(self, ranks, offsets, transfer):
+        """ Call ``transfer(rank, positions, target_type)`` once for every
+        owner in `ranks`, all in one passive-target epoch.  Internal.
+
+        `positions` are the positions of the owner's elements in `ranks`,
+        and `target_type` selects them in the owner's buffer.
+        """
+        self.win.Lock_all()
+        try:
+            for rank in np.unique(ranks):
+                positions = np.flatnonzero(ranks == rank)
+                target_type = self.base_type.Create_indexed_block(
+                    1, offsets[positions].tolist()).Commit()
+                try:
+                    transfer(int(rank), positions, target_type)
+                finally:
+                    target_type.Free()
+        finally:
+            self.win.Unlock_all()
+
+    def get(self, global_indices):
+        """ Read the elements at `global_indices`.
+
+        Parameters
+        ----------
+        global_indices : array_like
+            Of shape ``(K, ndim)``, or ``(K,)`` for 1-D arrays.
+
+        Returns
+        -------
+        ndarray
+            The K elements, in order.
+        """
+        ranks, offsets = self._locate(self._normalize(global_indices))
+        result = np.empty(len(offsets), dtype=self.dtype)
+        received = []
+
+        def transfer(rank, positions, target_type):
+            buf = np.empty(len(positions), dtype=self.dtype)
+            self.win.Get([buf, self.base_type], rank,
+                         target=(0, 1, target_type))
+            received.append((positions, buf))
+
+        self._epoch(ranks, offsets, transfer)
+        for (positions, buf) in received:
+            result[positions] = buf
+        return result
+
+    def accumulate(self, global_indices, values, op=MPI.SUM):
+        """ Combine `values` into the elements at `global_indices`.
+
+        Parameters
+        ----------
+        global_indices : array_like
+            Of shape ``(K, ndim)``, or ``(K,)`` for 1-D arrays.
+        values : array_like or scalar
+            K values, or one for all.
+        op : MPI.Op, optional
+            One of MPI.SUM, MPI.PROD, MPI.MAX, MPI.MIN or MPI.REPLACE.
+            Repeated indices are combined with `op` before they are sent;
+            with MPI.REPLACE, the last value wins.
+        """
+        ufuncs = [ufunc for (mpi_op, ufunc) in _accumulate_ufuncs
+                  if mpi_op == op]
+        if not ufuncs:
+            raise ValueError("Unsupported op %r." % op)
+        indices = self._normalize(global_indices)
+        values = np.broadcast_to(np.asarray(values, dtype=self.dtype),
+                                 (len(indices),))
+        if not len(indices):
+            return
+
+        flat = np.ravel_multi_index(indices.T, self.larr.global_shape)
+        unique, inverse = np.unique(flat, return_inverse=True)
+        inverse = inverse.ravel()
+        if ufuncs[0] is None:
+            combined = np.empty(len(unique), dtype=self.dtype)
+            combined[inverse] = values
+        else:
+            order = np.argsort(inverse, kind='mergesort')
+            starts = np.searchsorted(inverse[order], np.arange(len(unique)))
+            combined = ufuncs[0].reduceat(values[order], starts)
+        indices = np.array(np.unravel_index(unique,
+                                            self.larr.global_shape)).T
+        ranks, offsets = self._locate(indices.reshape(-1, self.larr.ndim))
+
+        def transfer(rank, positions, target_type):
+            buf = np.ascontiguousarray(combined[positions])
+            self.win.Accumulate([buf, self.base_type], rank,
+                                target=(0, 1, target_type), op=op)
+
+        self._epoch(ranks, offsets, transfer)
+
+    def free(self):
+        """ Free the MPI window.  Collective. """
+        self.win.Free()
@@ -0,0 +1,164 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+The local rows of row-block distributed sparse matrices.
+
+Every rank holds a contiguous block of rows in compressed sparse row (CSR)
+form, with global column indices.  A matrix-vector product needs the vector
+entries of every column that appears in the local rows; most of them are
+usually owned by the rank itself, the rest by a few neighbours.  The
+communication plan that fetches the off-rank entries is computed once, when
+the matrix is built: every rank tells each owner which of its entries it
+needs, and each product is then a single ``Alltoallv`` of exactly those
+entries followed by a local CSR product.
+
+Matrices are created with `distarray.dist.sparse.CSRMatrix.from_coo`.
+"""
+
+from __future__ import division
+
+import numpy as np
+
+from distarray.local import maps
+from distarray.local.localarray import (LocalArray, _alltoallv,
+                                        _send_to_owners)
+from distarray.local.mpiutils import MPI
+from distarray.metadata_utils import owning_ranks_and_local_indices
+
+
+class CSRMatrix(object):
+    """ The rows of a distributed CSR matrix held by one rank.
+
+    Parameters
+    ----------
+    row_distribution : maps.Distribution
+        The 1-D block distribution of the rows, and of the result of `dot`.
+    shape : (int, int)
+        The global shape of the matrix.
+    indptr, indices, data : ndarray
+        The local rows in CSR form, with global column indices.
+    col_ddpr : sequence of dim-data tuples
+        The dim-data of the vectors the matrix multiplies, for every rank.
+    """
+
+    def __init__(self, row_distribution, shape, indptr, indices, data,
+                 col_ddpr):
+        self.row_distribution = row_distribution
+        self.comm = row_distribution.comm
+        self.shape = tuple(shape)
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.col_ddpr = col_ddpr
+        self._plan()
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def _plan(self):
+        """ Work out which vector entries to exchange in `dot`.  Internal.
+        """
+        rank, nprocs = self.comm.Get_rank(), self.comm.Get_size()
+        needed, inverse = np.unique(self.indices, return_inverse=True)
+        ranks, (local,) = owning_ranks_and_local_indices(self.col_ddpr,
+                                                         (needed,))
+        order = np.argsort(ranks, kind='mergesort')
+        ranks, local = ranks[order], local[order]
+        # Position of every stored column in the gathered vector entries.
+        positions = np.empty_like(order)
+        positions[order] = np.arange(len(order))
+        self._columns = positions[inverse.ravel()]
+
+        remote = ranks != rank
+        self._own = (np.flatnonzero(~remote), local[~remote])
+        self._remote = np.flatnonzero(remote)
+        self._recv_counts = np.bincount(ranks[remote], minlength=nprocs)
+        (self._send_local,), self._send_counts = _alltoallv(
+            self.comm, (local[remote],), self._recv_counts)
+
+    def dot(self, x):
+        """ The product of the matrix and the vector `x`.
+
+        Collective.
+
+        Parameters
+        ----------
+        x : LocalArray
+            1-D, with the dim-data `col_ddpr`.
+
+        Returns
+        -------
+        LocalArray
+            Distributed like the rows.
+        """
+        (received,), _ = _alltoallv(self.comm,
+                                    (x.ndarray[self._send_local],),
+                                    self._send_counts, self._recv_counts)
+        entries = np.empty(len(self._remote) + len(self._own[0]),
+                           dtype=x.dtype)
+        entries[self._remote] = received
+        entries[self._own[0]] = x.ndarray[self._own[1]]
+
+        dtype = np.result_type(self.data.dtype, x.dtype)
+        result = np.zeros(len(self.indptr) - 1, dtype=dtype)
+        if self.nnz:
+            products = self.data * entries[self._columns]
+            starts = self.indptr[:-1]
+            nonempty = np.flatnonzero(self.indptr[1:] > starts)
+            result[nonempty] = np.add.reduceat(products, starts[nonempty])
+        return LocalArray(self.row_distribution, buf=result)
+
+
+def from_coo(rows, cols, data, shape, row_ddpr, col_ddpr, comm):
+    """ Build the local rows of a CSR matrix from COO triplets.
+
+    The triplets can be held by any rank; each is sent to the owner of its
+    row.  Repeated entries are summed.
+
+    Parameters
+    ----------
+    rows, cols, data : LocalArray
+        The row indices, column indices and values, distributed alike.
+    shape : (int, int)
+        The global shape of the matrix.
+    row_ddpr : sequence of dim-data tuples
+        The 1-D block distribution of the rows, for every rank of `comm`.
+    col_ddpr : sequence of dim-data tuples
+        The dim-data of the vectors the matrix multiplies.
+    comm : MPI Comm instance
+        A communicator of the ranks holding the triplets.
+
+    Returns
+    -------
+    CSRMatrix
+    """
+    cols = cols.ndarray.ravel().astype(np.int64)
+    bad = bool(np.any((cols < 0) | (cols >= shape[1])))
+    if comm.allreduce(bad, op=MPI.LOR):
+        raise IndexError("Column index out of bounds for size %d" % shape[1])
+    row_indices = rows.ndarray.ravel().astype(np.int64)
+    if comm.allreduce(bool(np.any(row_indices < 0)), op=MPI.LOR):
+        raise IndexError("Negative row index.")
+    _, _, _, received = _send_to_owners(comm, row_ddpr, (shape[0],),
+                                        row_indices,
+                                        (cols, data.ndarray.ravel()))
+    (local_rows, cols, values) = received
+
+    # Sort by row and column and sum the repeated entries.
+    row_distribution = maps.Distribution(comm=comm,
+                                         dim_data=row_ddpr[comm.Get_rank()])
+    nrows = row_distribution.local_shape[0]
+    flat = local_rows * shape[1] + cols
+    unique, inverse = np.unique(flat, return_inverse=True)
+    inverse = inverse.ravel()
+    summed = np.zeros(len(unique), dtype=values.dtype)
+    np.add.at(summed, inverse, values)
+    counts = np.bincount(unique // shape[1], minlength=nrows)
+    indptr = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    return CSRMatrix(row_distribution, shape, indptr, unique % shape[1],
+                     summed, col_ddpr)
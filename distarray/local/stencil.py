@@ -0,0 +1,244 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Stencil operators on block-distributed LocalArrays.
+
+A stencil is an array of weights with an odd length along every dimension,
+centred on the output element: ``out[i] = sum(weights[k] * arr[i + k - c])``
+where ``c`` is the centre of `weights`.  Elements beyond the global boundary
+are taken from the other side of the domain for periodic dimensions and are
+`cval` otherwise.
+
+The neighbour values come from ghost cells (see
+`LocalArray.exchange_halos`).  The halo exchange is started first, the
+interior of the local section, which needs no ghost cells, is computed while
+it proceeds, and the boundary strips are computed once it completes.
+"""
+
+from __future__ import division
+
+import numpy as np
+
+from distarray.externals.six.moves import range, zip
+
+from distarray.local import maps
+from distarray.local.localarray import LocalArray, _HaloExchange, empty
+
+
+def _normalize_periods(periodic, ndim):
+    if isinstance(periodic, bool):
+        return (periodic,) * ndim
+    return tuple(bool(p) for p in periodic)
+
+
+def _padded_work(larr, radii):
+    """ Return `larr` if its ghost layer is at least `radii` wide, else a
+    copy of `larr` with such a ghost layer.  Internal.
+    """
+    padding = larr.distribution.padding
+    if all(lo >= r and hi >= r for ((lo, hi), r) in zip(padding, radii)):
+        return larr
+    dim_data = []
+    for dim_dict, (lo, hi), r in zip(larr.dim_data, padding, radii):
+        dim_dict = dict(dim_dict)
+        dim_dict['padding'] = (max(lo, r), max(hi, r))
+        dim_data.append(dim_dict)
+    distribution = maps.Distribution(comm=larr.distribution.base_comm,
+                                     dim_data=dim_data)
+    return LocalArray(distribution, dtype=larr.dtype, buf=larr.ndarray)
+
+
+def _fill_boundary_ghosts(larr, periods, cval):
+    """ Set the ghost cells beyond a non-periodic global boundary to
+    `cval`.  Internal.
+    """
+    padded = larr.padded_ndarray
+    for axis, (lo, hi) in enumerate(larr.distribution.padding):
+        if periods[axis]:
+            continue
+        axis_map = larr.distribution[axis]
+        index = [slice(None)] * padded.ndim
+        if lo and axis_map.start == 0:
+            index[axis] = slice(0, lo)
+            padded[tuple(index)] = cval
+        if hi and axis_map.stop == axis_map.global_size:
+            index[axis] = slice(padded.shape[axis] - hi, None)
+            padded[tuple(index)] = cval
+
+
+def _stencil_regions(shape, radii):
+    """ Split the local index space into the interior region, whose stencil
+    stays within the local section, and the boundary strips around it.
+    Internal.
+    """
+    interior = []
+    for size, r in zip(shape, radii):
+        start = min(r, size)
+        interior.append(slice(start, max(start, size - r)))
+    strips = []
+    for axis, size in enumerate(shape):
+        before = interior[:axis]
+        after = [slice(0, n) for n in shape[axis + 1:]]
+        for strip in (slice(0, interior[axis].start),
+                      slice(interior[axis].stop, size)):
+            if strip.stop > strip.start:
+                strips.append(tuple(before + [strip] + after))
+    return tuple(interior), strips
+
+
+def _apply_weights(work, weights, out, region):
+    """ Compute ``out[region]`` from the padded buffer of `work`.
+    Internal.
+    """
+    if any(r.stop <= r.start for r in region):
+        return
+    padded = work.padded_ndarray
+    pad_lo = [lo for (lo, _) in work.distribution.padding]
+    center = [n // 2 for n in weights.shape]
+    acc = out[region]
+    acc[...] = 0
+    for k in zip(*np.nonzero(weights)):
+        src = tuple(slice(p + r.start + ki - ci, p + r.stop + ki - ci)
+                    for (p, r, ki, ci) in zip(pad_lo, region, k, center))
+        acc += weights[k] * padded[src]
+
+
+def _check_weights(weights, ndim):
+    weights = np.asarray(weights)
+    if weights.ndim != ndim:
+        msg = "weights must have %d dimensions (given %d)."
+        raise ValueError(msg % (ndim, weights.ndim))
+    if any(n % 2 == 0 for n in weights.shape):
+        msg = "weights must have an odd length along every dimension."
+        raise ValueError(msg)
+    return weights
+
+
+def _stencil(larr, weights, periods, cval):
+    """ Returns the padded work array and the result of the stencil, and
+    leaves the ghost cells of the work array filled.  Internal.
+    """
+    radii = [n // 2 for n in weights.shape]
+    work = _padded_work(larr, radii)
+    _fill_boundary_ghosts(work, periods, cval)
+
+    # Corner ghost cells are only needed for weights off the axes.
+    center = np.array(radii)
+    offsets = np.transpose(np.nonzero(weights)) - center
+    corners = bool(len(offsets)) and (np.count_nonzero(offsets, axis=1)
+                                      > 1).any()
+
+    dtype = np.result_type(larr.dtype, weights.dtype)
+    out = empty(larr.distribution, dtype=dtype)
+    interior, strips = _stencil_regions(larr.local_shape, radii)
+
+    # With a wide enough ghost layer, the persistent exchange kept with
+    # `larr` is reused; a padded copy needs a one-off exchange.
+    if work is larr:
+        exchange = larr._halo_exchange(periods, corners)
+    else:
+        exchange = _HaloExchange(work, periods, persistent=False,
+                                 corners=corners)
+    exchange.start()
+    try:
+        _apply_weights(work, weights, out.ndarray, interior)
+    finally:
+        exchange.wait()
+        if work is not larr:
+            exchange.free()
+    for strip in strips:
+        _apply_weights(work, weights, out.ndarray, strip)
+    return work, out
+
+
+def apply_stencil(larr, weights, periodic=False, cval=0.0):
+    """ Apply a stencil of `weights` to every element of `larr`.
+
+    Parameters
+    ----------
+    larr : LocalArray
+        Every dimension must be block-distributed or undistributed.
+    weights : array_like
+        Same number of dimensions as `larr`, odd length along each.
+    periodic : bool or sequence of bools, optional
+    cval : scalar, optional
+        Value of the elements beyond a non-periodic boundary.
+
+    Returns
+    -------
+    LocalArray
+        Distributed like `larr`.
+    """
+    weights = _check_weights(weights, larr.ndim)
+    periods = _normalize_periods(periodic, larr.ndim)
+    return _stencil(larr, weights, periods, cval)[1]
+
+
+def gradient(larr, axis, spacing=1.0, periodic=False):
+    """ Gradient of `larr` along `axis`, as in `numpy.gradient`.
+
+    Central differences are used everywhere except at a non-periodic
+    global boundary, where one-sided differences are used.
+    """
+    weights = np.zeros((1,) * axis + (3,) + (1,) * (larr.ndim - axis - 1))
+    weights.flat[0] = -0.5 / spacing
+    weights.flat[-1] = 0.5 / spacing
+    periods = _normalize_periods(periodic, larr.ndim)
+    work, out = _stencil(larr, weights, periods, 0.0)
+    if periods[axis]:
+        return out
+
+    # One-sided differences at the global boundary; the neighbour may be a
+    # ghost cell when the local section is a single element thick.
+    axis_map = larr.distribution[axis]
+    padded = np.rollaxis(work.padded_ndarray, axis)
+    result = np.rollaxis(out.ndarray, axis)
+    lo = work.distribution.padding[axis][0]
+    other = tuple(slice(p, p + n) for (i, ((p, _), n)) in
+                  enumerate(zip(work.distribution.padding, larr.local_shape))
+                  if i != axis)
+    size = larr.local_shape[axis]
+    if size and axis_map.start == 0:
+        result[0] = (padded[(lo + 1,) + other] -
+                     padded[(lo,) + other]) / spacing
+    if size and axis_map.stop == axis_map.global_size:
+        result[-1] = (padded[(lo + size - 1,) + other] -
+                      padded[(lo + size - 2,) + other]) / spacing
+    return out
+
+
+def diff(larr, axis, out_comm, ddpr):
+    """ First-order difference of `larr` along `axis`, as in `numpy.diff`.
+
+    Parameters
+    ----------
+    larr : LocalArray
+    axis : int
+    out_comm : MPI Comm instance
+        The communicator of the result.
+    ddpr : sequence of dim-data tuples
+        The dim-data of the result for every rank of `out_comm`: the
+        distribution of `larr` with the last element along `axis` removed.
+
+    Returns
+    -------
+    LocalArray
+    """
+    weights = np.zeros((1,) * axis + (3,) + (1,) * (larr.ndim - axis - 1),
+                       dtype=np.int8)
+    weights.flat[1] = -1
+    weights.flat[2] = 1
+    periods = (False,) * larr.ndim
+    full = _stencil(larr, weights, periods, 0)[1]
+
+    distribution = maps.Distribution(comm=out_comm,
+                                     dim_data=ddpr[out_comm.Get_rank()])
+    out = empty(distribution, dtype=full.dtype)
+    index = [slice(None)] * larr.ndim
+    index[axis] = slice(0, out.local_shape[axis])
+    out.ndarray[...] = full.ndarray[tuple(index)]
+    return out
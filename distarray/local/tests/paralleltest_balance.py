@@ -0,0 +1,72 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+import time
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from distarray.local import balance
+import distarray.local.localarray as localarray
+from distarray.local.maps import Distribution
+from distarray.testing import MpiTestCase
+
+
+class TestBalancedVectorize(MpiTestCase):
+
+    def test_result(self):
+        d = Distribution.from_shape(self.comm, (7, 9), ('b', 'c'))
+        a = localarray.fromfunction(lambda i, j: 9 * i + j, d, dtype='int64')
+        b = localarray.fromfunction(lambda i, j: i - j, d, dtype='int64')
+        func = np.vectorize(lambda x, y, z, w=0: x * y + z + w)
+        out, _ = balance.balanced_vectorize(func, self.comm, (a, b, 3),
+                                            {'w': a}, chunks=4)
+        assert_array_equal(out.ndarray, func(a.ndarray, b.ndarray, 3,
+                                             w=a.ndarray))
+
+    def test_result_dtype(self):
+        """Do all ranks, including those without elements, agree on the
+        dtype of the result, as `numpy.vectorize` picks it?"""
+        d = Distribution.from_shape(self.comm, (3,))
+        a = localarray.fromfunction(lambda i: i, d, dtype='int64')
+        func = np.vectorize(lambda x: x / 2.0)
+        out, _ = balance.balanced_vectorize(func, self.comm, (a,), {})
+        self.assertEqual(out.dtype, np.dtype('float64'))
+        self.assertEqual(out.padded_ndarray.dtype, np.dtype('float64'))
+        assert_array_equal(out.ndarray, a.ndarray / 2.0)
+
+    def test_result_dtype_promoted(self):
+        """Are results of different dtypes on different ranks promoted?"""
+        d = Distribution.from_shape(self.comm, (4 * self.comm_size,))
+        a = localarray.fromfunction(lambda i: i, d, dtype='int64')
+        func = np.vectorize(lambda x: x / 2.0 if x == 0 else x)
+        out, _ = balance.balanced_vectorize(func, self.comm, (a,), {},
+                                            chunks=1)
+        self.assertEqual(out.dtype, np.dtype('float64'))
+        assert_array_equal(out.ndarray, np.where(a.ndarray, a.ndarray, 0))
+
+    def test_stealing(self):
+        """Do the other ranks take over chunks of a slow rank?"""
+        d = Distribution.from_shape(self.comm, (4 * self.comm_size,))
+        a = localarray.fromfunction(lambda i: i, d, dtype='int64')
+
+        def slow_on_rank_0(x):
+            if x < 4:
+                time.sleep(0.05)
+            return 2 * x
+
+        out, stolen = balance.balanced_vectorize(
+            np.vectorize(slow_on_rank_0), self.comm, (a,), {})
+        assert_array_equal(out.ndarray, 2 * a.ndarray)
+        self.assertGreater(self.comm.allreduce(stolen), 0)
+
+
+if __name__ == '__main__':
+    try:
+        unittest.main()
+    except SystemExit:
+        pass
@@ -0,0 +1,36 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+import unittest
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from distarray.local import fft
+from distarray.testing import MpiTestCase
+
+
+class TestTranspose(MpiTestCase):
+
+    def test_transpose(self):
+        # A (6, 9) array split along axis 0, made whole along axis 0 and
+        # split along axis 1.
+        arr = np.arange(54).reshape(6, 9)
+        rows = [(0, 2), (2, 4), (4, 5), (5, 6)]
+        cols = [(0, 3), (3, 6), (6, 9), (9, 9)]
+        rank = self.comm.Get_rank()
+        local = arr[slice(*rows[rank])]
+        result = fft.transpose(self.comm, local, 0, 1, rows, cols)
+        assert_array_equal(result, arr[:, slice(*cols[rank])])
+
+        back = fft.transpose(self.comm, result, 1, 0, cols, rows)
+        assert_array_equal(back, local)
+
+
+if __name__ == '__main__':
+    try:
+        unittest.main()
+    except SystemExit:
+        pass
@@ -7,7 +7,7 @@
 import unittest
 
 import numpy as np
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_allclose, assert_array_equal
 
 from distarray.testing import MpiTestCase, assert_localarrays_equal
 from distarray.local import arecompatible
@@ -65,6 +65,100 @@ class TestFunctions(MpiTestCase):
         la1 = localarray.fromndarray_like(la0.ndarray, la0)
         assert_localarrays_equal(la0, la1, check_dtype=True)
 
+    def test_local_histogram(self):
+        """Are the counts summed onto rank 0 with global bin edges?"""
+        d = Distribution.from_shape(comm=self.comm, shape=(16,))
+        a = localarray.fromfunction(lambda i: i, d, dtype='float64')
+        result = localarray.local_histogram(a, bins=4)
+        if self.comm.Get_rank() == 0:
+            hist, edges = result
+            assert_array_equal(hist, [4, 4, 4, 4])
+            assert_array_equal(edges, [0, 3.75, 7.5, 11.25, 15])
+        else:
+            self.assertIsNone(result)
+
+    def test_local_histogram_with_empty_rank(self):
+        """Do ranks without elements leave the global range alone?"""
+        d = Distribution.from_shape(comm=self.comm, shape=(3,))
+        a = localarray.fromfunction(lambda i: 2 * i - 1, d, dtype='int64')
+        result = localarray.local_histogram(a, bins=2)
+        if self.comm.Get_rank() == 0:
+            hist, edges = result
+            assert_array_equal(hist, [1, 2])
+            assert_array_equal(edges, [-1, 1, 3])
+
+    def test_local_histogram_nan(self):
+        """Does a NaN on one rank make every rank reject the range?"""
+        d = Distribution.from_shape(comm=self.comm, shape=(16,))
+        a = localarray.fromfunction(lambda i: np.nan if i == 5 else i, d,
+                                    dtype='float64')
+        with self.assertRaises(ValueError):
+            localarray.local_histogram(a, bins=4)
+
+    def test_local_unique(self):
+        """Does each unique value end up on exactly one rank?"""
+        d = Distribution.from_shape(comm=self.comm, shape=(30,))
+        a = localarray.fromfunction(lambda i: i % 7, d, dtype='int64')
+        values, counts = localarray.local_unique(a, self.comm)
+        self.assertEqual(values.global_shape, (7,))
+        assert_array_equal(values.ndarray, np.sort(values.ndarray))
+        all_values = np.concatenate(self.comm.allgather(values.ndarray))
+        all_counts = np.concatenate(self.comm.allgather(counts.ndarray))
+        order = np.argsort(all_values)
+        assert_array_equal(all_values[order], np.arange(7))
+        assert_array_equal(all_counts[order], np.bincount(np.arange(30) % 7))
+
+    def test_local_topk(self):
+        """Are the candidates of ranks without k elements merged?"""
+        d = Distribution.from_shape(comm=self.comm, shape=(3,))
+        a = localarray.fromfunction(lambda i: (i * 5) % 3, d, dtype='int64')
+        result = localarray.local_topk(a, 2)
+        if self.comm.Get_rank() == 0:
+            assert_array_equal(result[0], [2, 1])
+            assert_array_equal(result[1], [1, 2])
+        else:
+            self.assertIsNone(result)
+
+    def test_local_topk_ties(self):
+        """Do ties across a block boundary go to the smallest index?"""
+        x = np.ones(6 * self.comm_size)
+        x[5:11] = 5
+        d = Distribution.from_shape(comm=self.comm, shape=x.shape)
+        a = localarray.fromfunction(lambda i: x[i], d, dtype='float64')
+        result = localarray.local_topk(a, 3)
+        if self.comm.Get_rank() == 0:
+            assert_array_equal(result[0], [5, 5, 5])
+            assert_array_equal(result[1], [5, 6, 7])
+        else:
+            self.assertIsNone(result)
+
+    def test_local_topk_cyclic_ties(self):
+        """Are ties broken by global index across a cyclic distribution?"""
+        x = np.random.RandomState(0).randint(0, 4, size=(9, 5))
+        d = Distribution.from_shape(comm=self.comm, shape=x.shape,
+                                    dist=('c', 'n'))
+        a = localarray.fromfunction(lambda i, j: x[i, j], d, dtype='int64')
+        flat = x.ravel()
+        position = np.arange(flat.size)
+        for largest, key in ((True, -flat), (False, flat)):
+            result = localarray.local_topk(a, 7, largest=largest)
+            if self.comm.Get_rank() == 0:
+                expected = np.lexsort((position, key))[:7]
+                assert_array_equal(result[1], expected)
+                assert_array_equal(result[0], flat[expected])
+
+    def test_local_gram(self):
+        """Are the partials of ranks without rows merged on every rank?"""
+        x = np.random.RandomState(0).rand(3, 2)
+        d = Distribution.from_shape(comm=self.comm, shape=(3, 2),
+                                    dist=('b', 'n'))
+        a = localarray.fromfunction(lambda i, j: x[i, j], d, dtype='float64')
+        count, mean, gram = localarray.local_gram(a)
+        self.assertEqual(count, 3)
+        assert_allclose(mean, x.mean(axis=0))
+        centered = x - x.mean(axis=0)
+        assert_allclose(gram, centered.T.dot(centered))
+
 class TestCreationFunctions(MpiTestCase):
 
     def test_empty(self):
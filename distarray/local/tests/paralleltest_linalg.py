@@ -0,0 +1,145 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+import unittest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from distarray.local.localarray import LocalArray
+from distarray.local.maps import Distribution
+from distarray.local import linalg
+from distarray.testing import MpiTestCase
+
+
+class TestKrylovSolvers(MpiTestCase):
+
+    def setUp(self):
+        n = 20
+        rng = np.random.RandomState(0)
+        m = rng.rand(n, n)
+        self.spd = m.dot(m.T) + n * np.eye(n)
+        self.general = m + n * np.eye(n)
+        self.b = rng.rand(n)
+        self.dist = Distribution.from_shape(self.comm, (n,))
+        self.rows = slice(self.dist[0].start, self.dist[0].stop)
+
+    def local(self, arr):
+        return LocalArray(self.dist, buf=arr[self.rows].copy())
+
+    def matvec(self, matrix):
+        def matvec(x):
+            whole = np.concatenate(self.comm.allgather(x.ndarray))
+            return self.local(matrix.dot(whole))
+        return matvec
+
+    def check(self, method, matrix, rhs=None):
+        rhs = self.b if rhs is None else rhs
+        b, x0 = self.local(rhs), self.local(np.zeros_like(rhs))
+        matvec = self.matvec(matrix)
+        solver = linalg.make_solver(method, b, x0, matvec(x0), 1e-10, 100)
+        linalg.solve(solver, matvec)
+        report = solver.report()
+        self.assertTrue(report['converged'])
+        self.assertLess(report['iterations'], 30)
+        ax = matvec(solver.x)
+        assert_allclose(ax.ndarray, rhs[self.rows], rtol=1e-8)
+
+    def test_cg(self):
+        self.check('cg', self.spd)
+
+    def test_bicgstab(self):
+        self.check('bicgstab', self.general)
+
+    def test_bicgstab_complex(self):
+        rng = np.random.RandomState(1)
+        n = len(self.b)
+        matrix = (rng.rand(n, n) + 1j * rng.rand(n, n) +
+                  n * (1 + 1j) * np.eye(n))
+        self.check('bicgstab', matrix, rng.rand(n) + 1j * rng.rand(n))
+
+    def test_bicgstab_complex_early_exit(self):
+        """Is the norm of s right for a complex operator?  With A = c I,
+        s vanishes after the first product."""
+        rng = np.random.RandomState(1)
+        n = len(self.b)
+        rhs = rng.rand(n) + 1j * rng.rand(n)
+        b, x0 = self.local(rhs), self.local(np.zeros_like(rhs))
+        matvec = self.matvec((1 + 2j) * np.eye(n))
+        # The expansion cancels down to about sqrt(eps) of the norm of r.
+        solver = linalg.make_solver('bicgstab', b, x0, matvec(x0), 1e-6, 100)
+        solver.step(matvec(solver.operand))
+        self.assertTrue(solver.converged)
+        assert_allclose(solver.x.ndarray, rhs[self.rows] / (1 + 2j))
+
+    def test_maxiter(self):
+        b, x0 = self.local(self.b), self.local(np.zeros_like(self.b))
+        matvec = self.matvec(self.general)
+        solver = linalg.make_solver('bicgstab', b, x0, matvec(x0), 1e-14, 2)
+        linalg.solve(solver, matvec)
+        self.assertFalse(solver.converged)
+        self.assertEqual(solver.iterations, 2)
+
+
+class TestTallSkinny(MpiTestCase):
+
+    def local(self, arr):
+        dist = Distribution.from_shape(self.comm, arr.shape, ('b', 'n'))
+        start, stop = dist[0].start, dist[0].stop
+        ddpr = self.comm.allgather(dist.dim_data)
+        return LocalArray(dist, buf=arr[start:stop].copy()), ddpr
+
+    def gather(self, larr):
+        return np.vstack(self.comm.allgather(larr.ndarray))
+
+    def check_tsqr(self, a):
+        larr, ddpr = self.local(a)
+        q, r = linalg.tsqr(larr, self.comm, ddpr)
+        self.assertEqual(r is None, self.comm.Get_rank() != 0)
+        r = self.comm.bcast(r)
+        q = self.gather(q)
+        assert_allclose(q.dot(r), a, atol=1e-12)
+        assert_allclose(q.T.dot(q), np.eye(q.shape[1]), atol=1e-12)
+        assert_allclose(np.tril(r, -1), 0, atol=1e-12)
+
+    def test_tsqr(self):
+        self.check_tsqr(np.random.RandomState(0).rand(23, 4))
+
+    def test_tsqr_with_empty_rank(self):
+        # With 4 ranks, the last one holds no rows.
+        self.check_tsqr(np.random.RandomState(0).rand(3, 2))
+
+    def test_svd(self):
+        a = np.random.RandomState(0).rand(23, 4)
+        larr, ddpr = self.local(a)
+        u, s, vt = linalg.svd(larr, self.comm, ddpr)
+        s, vt = self.comm.bcast((s, vt))
+        u = self.gather(u)
+        assert_allclose((u * s).dot(vt), a, atol=1e-12)
+        assert_allclose(u.T.dot(u), np.eye(4), atol=1e-12)
+        self.assertTrue(np.all(np.diff(s) <= 0))
+
+    def test_lstsq(self):
+        rng = np.random.RandomState(0)
+        a, x = rng.rand(23, 3), rng.rand(3, 2)
+        noise = 1e-3 * rng.rand(23, 2)
+        (la, _), (lb, _) = self.local(a), self.local(a.dot(x) + noise)
+        result = linalg.lstsq(la, lb, self.comm)
+        if self.comm.Get_rank() != 0:
+            self.assertIsNone(result)
+            return
+        x_fit, residuals, rank, s = result
+        self.assertEqual(rank, 3)
+        # The residual is orthogonal to the columns of a.
+        residual = a.dot(x) + noise - a.dot(x_fit)
+        assert_allclose(a.T.dot(residual), 0, atol=1e-12)
+        assert_allclose(residuals, (residual ** 2).sum(axis=0))
+
+
+if __name__ == '__main__':
+    try:
+        unittest.main()
+    except SystemExit:
+        pass
@@ -13,6 +13,7 @@ from distarray.testing import (MpiTestCase, assert_localarrays_allclose,
                                assert_localarrays_equal)
 from distarray.local.localarray import LocalArray, ndenumerate
 from distarray.local.maps import Distribution
+from distarray.local.mpiutils import MPI
 from distarray.local.error import InvalidDimensionError, IncompatibleArrayError
 
 
@@ -474,6 +475,166 @@ class TestComm(MpiTestCase):
         la = LocalArray(dist)
 
 
+class TestParallelSelect(MpiTestCase):
+
+    def test_select_every_rank(self):
+        from distarray.local.localarray import _parallel_select
+        rank = self.comm.Get_rank()
+        # Duplicates, and an empty section on rank 1.
+        data = np.random.RandomState(rank).randint(0, 5, size=(3 * rank, 2))
+        everything = np.concatenate(self.comm.allgather(data))
+        n = len(everything)
+        targets = np.repeat([0, 1], n)
+        ks = np.tile(np.arange(n), 2)
+        result = _parallel_select(self.comm, np.sort(data, axis=0), targets,
+                                  ks)
+        expected = np.sort(everything, axis=0).T.ravel()
+        np.testing.assert_array_equal(result, expected)
+
+
+class TestHaloExchange(MpiTestCase):
+
+    def padded_1d(self, padding=(1, 1)):
+        rank = self.comm.Get_rank()
+        dim_data = ({'dist_type': 'b', 'size': 8, 'proc_grid_size': 4,
+                     'proc_grid_rank': rank, 'start': 2 * rank,
+                     'stop': 2 * rank + 2, 'padding': padding},)
+        larr = LocalArray(Distribution(comm=self.comm, dim_data=dim_data),
+                          dtype=int)
+        larr.padded_ndarray.fill(-1)
+        larr.ndarray[...] = np.arange(2 * rank, 2 * rank + 2)
+        return larr
+
+    def padded_2d(self):
+        coords = divmod(self.comm.Get_rank(), 2)
+        bounds = ([(0, 2), (2, 4)], [(0, 3), (3, 6)])
+        dim_data = tuple({'dist_type': 'b', 'size': bounds[i][-1][1],
+                          'proc_grid_size': 2, 'proc_grid_rank': coords[i],
+                          'start': bounds[i][coords[i]][0],
+                          'stop': bounds[i][coords[i]][1],
+                          'padding': (1, 1)} for i in range(2))
+        larr = LocalArray(Distribution(comm=self.comm, dim_data=dim_data),
+                          dtype=int)
+        larr.padded_ndarray.fill(-1)
+        rows, cols = (np.arange(*bounds[i][coords[i]]) for i in range(2))
+        larr.ndarray[...] = rows[:, np.newaxis] * 10 + cols
+        return larr
+
+    def test_padded_buffer(self):
+        larr = self.padded_1d()
+        self.assertEqual(larr.padded_ndarray.shape, (4,))
+        self.assertEqual(larr.local_shape, (2,))
+        self.assertEqual(larr.ndarray.shape, (2,))
+        self.assertEqual(larr.dim_data[0]['padding'], (1, 1))
+        buf = larr.__distarray__()['buffer']
+        self.assertEqual(buf.shape, (4,))
+
+    def test_exchange_1d(self):
+        larr = self.padded_1d()
+        larr.exchange_halos()
+        rank = self.comm.Get_rank()
+        lower = 2 * rank - 1 if rank > 0 else -1
+        upper = 2 * rank + 2 if rank < 3 else -1
+        expected = [lower, 2 * rank, 2 * rank + 1, upper]
+        self.assertEqual(larr.padded_ndarray.tolist(), expected)
+
+    def test_exchange_1d_periodic(self):
+        larr = self.padded_1d()
+        larr.exchange_halos(periodic=True)
+        rank = self.comm.Get_rank()
+        expected = [(2 * rank - 1) % 8, 2 * rank, 2 * rank + 1,
+                    (2 * rank + 2) % 8]
+        self.assertEqual(larr.padded_ndarray.tolist(), expected)
+
+    def test_exchange_repeated(self):
+        for persistent in (True, False):
+            larr = self.padded_1d()
+            larr.exchange_halos(periodic=True, persistent=persistent)
+            larr.ndarray[...] *= 10
+            larr.exchange_halos(periodic=True, persistent=persistent)
+            rank = self.comm.Get_rank()
+            self.assertEqual(larr.padded_ndarray[0],
+                             10 * ((2 * rank - 1) % 8))
+            self.assertEqual(larr.padded_ndarray[-1],
+                             10 * ((2 * rank + 2) % 8))
+
+    def test_exchange_2d_periodic_corners(self):
+        larr = self.padded_2d()
+        larr.exchange_halos(periodic=True)
+        row_start = larr.distribution[0].start
+        col_start = larr.distribution[1].start
+        rows = (np.arange(row_start - 1, row_start + 3)) % 4
+        cols = (np.arange(col_start - 1, col_start + 4)) % 6
+        expected = rows[:, np.newaxis] * 10 + cols
+        self.assertEqual(larr.padded_ndarray.tolist(), expected.tolist())
+
+    def test_stencil_reuses_exchange(self):
+        from distarray.local.stencil import apply_stencil
+        larr = self.padded_1d()
+        rank = self.comm.Get_rank()
+        for scale in (1, 10):
+            larr.ndarray[...] = scale * np.arange(2 * rank, 2 * rank + 2)
+            out = apply_stencil(larr, [1, 0, 1], periodic=True)
+            expected = [scale * ((i - 1) % 8 + (i + 1) % 8)
+                        for i in range(2 * rank, 2 * rank + 2)]
+            self.assertEqual(out.ndarray.tolist(), expected)
+        self.assertEqual(len(larr._halo_exchanges), 1)
+
+    def test_handles_freed_when_dropped(self):
+        larr = self.padded_1d()
+        larr.exchange_halos(periodic=True)
+        exchange, = larr._halo_exchanges.values()
+        requests = sum(exchange.requests, [])
+        datatypes = list(exchange.datatypes)
+        comm = larr.distribution.cart_comm((True,))
+        del larr, exchange
+        self.assertTrue(all(r == MPI.REQUEST_NULL for r in requests))
+        self.assertTrue(all(t == MPI.DATATYPE_NULL for t in datatypes))
+        self.assertEqual(comm, MPI.COMM_NULL)
+
+    def test_free_twice(self):
+        larr = self.padded_1d()
+        larr.exchange_halos()
+        exchange, = larr._halo_exchanges.values()
+        exchange.free()
+        exchange.free()
+        larr.distribution.free()
+
+    def test_exchange_zero_size_axis(self):
+        rank = self.comm.Get_rank()
+        dim_data = ({'dist_type': 'b', 'size': 0, 'proc_grid_size': 4,
+                     'proc_grid_rank': rank, 'start': 0, 'stop': 0,
+                     'padding': (1, 1)},)
+        larr = LocalArray(Distribution(comm=self.comm, dim_data=dim_data),
+                          dtype=int)
+        larr.padded_ndarray.fill(-1)
+        larr.exchange_halos(periodic=True)
+        larr.exchange_halos(persistent=False)
+        self.assertEqual(larr.padded_ndarray.tolist(), [-1, -1])
+
+    def test_halo_wider_than_section(self):
+        larr = self.padded_1d(padding=(3, 3))
+        with self.assertRaises(ValueError):
+            larr.exchange_halos()
+
+    def test_exchange_skips_empty_section(self):
+        # 9 elements over 4 ranks: sections of 3, 3, 3 and 0.
+        rank = self.comm.Get_rank()
+        start, stop = min(3 * rank, 9), min(3 * rank + 3, 9)
+        dim_data = ({'dist_type': 'b', 'size': 9, 'proc_grid_size': 4,
+                     'proc_grid_rank': rank, 'start': start, 'stop': stop,
+                     'padding': (1, 1)},)
+        larr = LocalArray(Distribution(comm=self.comm, dim_data=dim_data),
+                          dtype=int)
+        larr.padded_ndarray.fill(-1)
+        larr.ndarray[...] = np.arange(start, stop)
+        larr.exchange_halos(periodic=True)
+        if rank < 3:
+            expected = [(start - 1) % 9] + list(range(start, stop)) + \
+                       [stop % 9]
+            self.assertEqual(larr.padded_ndarray.tolist(), expected)
+
+
 class TestNDEnumerate(MpiTestCase):
     """Make sure we generate indices compatible with __getitem__."""
 
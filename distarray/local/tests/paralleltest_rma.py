@@ -0,0 +1,57 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+import unittest
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from distarray.local import localarray
+from distarray.local.maps import Distribution
+from distarray.local.mpiutils import MPI
+from distarray.local.rma import Window
+from distarray.testing import MpiTestCase
+
+
+class TestWindow(MpiTestCase):
+
+    def setUp(self):
+        d = Distribution.from_shape(comm=self.comm, shape=(6, 5),
+                                    dist=('b', 'c'), grid_shape=(2, 2))
+        self.larr = localarray.fromfunction(lambda i, j: 10 * i + j, d,
+                                            dtype='int64')
+        ddpr = self.comm.allgather(self.larr.dim_data)
+        self.win = Window(self.larr, ddpr, self.comm)
+
+    def tearDown(self):
+        self.win.free()
+
+    def test_get(self):
+        indices = [(5, 4), (0, 0), (3, 1), (-1, -2), (3, 1)]
+        assert_array_equal(self.win.get(indices), [54, 0, 31, 53, 31])
+
+    def test_get_nothing(self):
+        self.assertEqual(len(self.win.get(np.empty((0, 2)))), 0)
+
+    def test_accumulate(self):
+        # Every rank adds 1 twice to (2, 3) and once to (4, 0).
+        self.win.accumulate([(2, 3), (4, 0), (2, 3)], 1)
+        self.comm.Barrier()
+        nprocs = self.comm.Get_size()
+        assert_array_equal(self.win.get([(2, 3), (4, 0), (1, 1)]),
+                           [23 + 2 * nprocs, 40 + nprocs, 11])
+
+    def test_accumulate_replace(self):
+        if self.comm.Get_rank() == 0:
+            self.win.accumulate([(1, 2), (1, 2)], [7, 8], op=MPI.REPLACE)
+        self.comm.Barrier()
+        assert_array_equal(self.win.get([(1, 2)]), [8])
+
+
+if __name__ == '__main__':
+    try:
+        unittest.main()
+    except SystemExit:
+        pass
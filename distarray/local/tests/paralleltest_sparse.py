@@ -0,0 +1,67 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+import unittest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from distarray.local.localarray import LocalArray
+from distarray.local.maps import Distribution
+from distarray.local.sparse import from_coo
+from distarray.testing import MpiTestCase
+
+
+class TestCSRMatrix(MpiTestCase):
+
+    def setUp(self):
+        # A 9x7 matrix with repeated entries and an empty row (4).
+        rng = np.random.RandomState(0)
+        self.rows = np.array([0, 0, 1, 2, 3, 5, 5, 6, 7, 8, 8, 0, 6])
+        self.cols = np.array([0, 6, 1, 3, 2, 0, 4, 6, 5, 1, 1, 0, 3])
+        self.data = rng.rand(len(self.rows))
+        self.dense = np.zeros((9, 7))
+        np.add.at(self.dense, (self.rows, self.cols), self.data)
+
+        self.row_dist = Distribution.from_shape(self.comm, (9,))
+        self.col_dist = Distribution.from_shape(self.comm, (7,))
+        row_ddpr = self.comm.allgather(self.row_dist.dim_data)
+        col_ddpr = self.comm.allgather(self.col_dist.dim_data)
+
+        triplet_dist = Distribution.from_shape(self.comm, (len(self.rows),))
+        start, stop = triplet_dist[0].start, triplet_dist[0].stop
+        triplets = [LocalArray(triplet_dist, buf=arr[start:stop])
+                    for arr in (self.rows, self.cols, self.data)]
+        self.matrix = from_coo(*(triplets + [(9, 7), row_ddpr, col_ddpr,
+                                             self.comm]))
+
+    def test_nnz(self):
+        nnz = self.comm.allreduce(self.matrix.nnz)
+        self.assertEqual(nnz, np.count_nonzero(self.dense))
+
+    def test_dot(self):
+        x = np.arange(1.0, 8.0)
+        start, stop = self.col_dist[0].start, self.col_dist[0].stop
+        rows = slice(self.row_dist[0].start, self.row_dist[0].stop)
+        # The communication plan is reused by the second product.
+        for _ in range(2):
+            y = self.matrix.dot(LocalArray(self.col_dist, buf=x[start:stop]))
+            assert_allclose(y.ndarray, self.dense.dot(x)[rows])
+            x = -x
+
+    def test_dot_complex(self):
+        x = np.arange(7) * 1j
+        start, stop = self.col_dist[0].start, self.col_dist[0].stop
+        y = self.matrix.dot(LocalArray(self.col_dist, buf=x[start:stop]))
+        self.assertEqual(y.dtype, np.complex128)
+        rows = slice(self.row_dist[0].start, self.row_dist[0].stop)
+        assert_allclose(y.ndarray, self.dense.dot(x)[rows])
+
+
+if __name__ == '__main__':
+    try:
+        unittest.main()
+    except SystemExit:
+        pass
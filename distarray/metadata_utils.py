@@ -172,6 +172,82 @@ def _start_stop_block(size, proc_grid_size, proc_grid_rank):
     return start, stop
 
 
+def _weighted_block_bounds(weights, proc_grid_size):
+    """Return the (start, stop) of every block of a block dim, such that
+    the blocks hold nearly equal sums of the non-negative `weights`, one per
+    index.
+
+    Each boundary is the one whose prefix sum of `weights` is closest to its
+    share of the total.  With all-zero weights the blocks are regular.
+    """
+    weights = numpy.asarray(weights, dtype=float)
+    if (weights.ndim != 1 or not numpy.all(numpy.isfinite(weights)) or
+            numpy.any(weights < 0)):
+        raise ValueError("weights must be 1-D, finite and non-negative.")
+    size = len(weights)
+    total = weights.sum()
+    if total == 0:
+        return [_start_stop_block(size, proc_grid_size, rank)
+                for rank in range(proc_grid_size)]
+
+    prefix = numpy.concatenate(([0.0], numpy.cumsum(weights)))
+    shares = total * numpy.arange(1, proc_grid_size) / proc_grid_size
+    above = numpy.searchsorted(prefix, shares)
+    below = numpy.maximum(above - 1, 0)
+    closer_below = shares - prefix[below] < prefix[above] - shares
+    edges = [0] + numpy.where(closer_below, below, above).tolist() + [size]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def normalize_weights(weights, shape, dist=None):
+    """Return a list with the per-index weights of each dimension, or None
+    for dimensions without weights.
+
+    Parameters
+    ----------
+    weights : None, dict, sequence or array_like
+        A dict mapping dimensions to 1-D weights, a sequence with 1-D weights
+        or None for every dimension, or weights of the whole `shape`, which
+        are summed over the other dimensions for each dimension.
+    shape : tuple of int
+    dist : tuple of str, optional
+        The dist_type of each dimension.  Weights of the whole `shape` only
+        give weights to the block-distributed ('b') dimensions.
+
+    Returns
+    -------
+    list
+    """
+    ndim = len(shape)
+    if weights is None:
+        return [None] * ndim
+    if isinstance(weights, Mapping):
+        weights = [weights.get(i) for i in range(ndim)]
+    else:
+        try:
+            whole = numpy.asarray(weights, dtype=float)
+        except (TypeError, ValueError):
+            whole = None
+        if whole is not None and whole.shape == tuple(shape):
+            if dist is None:
+                dist = ('b',) * ndim
+            return [whole.sum(axis=tuple(a for a in range(ndim) if a != i))
+                    if dist[i] == 'b' else None
+                    for i in range(ndim)]
+        if len(weights) != ndim:
+            msg = "weights do not match the shape %r."
+            raise ValueError(msg % (tuple(shape),))
+    normalized = []
+    for (size, w) in zip(shape, weights):
+        if w is not None:
+            w = numpy.asarray(w, dtype=float)
+            if w.shape != (size,):
+                msg = "weights do not match the shape %r."
+                raise ValueError(msg % (tuple(shape),))
+        normalized.append(w)
+    return normalized
+
+
 def distribute_block_indices(dd):
     """Fill in `start` and `stop` in dim dict `dd`."""
     if ('start' in dd) and ('stop' in dd):
@@ -229,3 +305,84 @@ def normalize_reduction_axes(axes, ndim):
     else:
         axes = tuple(positivify(a, ndim) for a in axes)
     return axes
+
+
+def dim_data_bounds(dim_data):
+    """Return the global (start, stop) of a block or undistributed section
+    along each dimension of `dim_data`."""
+    return [(dd.get('start', 0), dd.get('stop', dd['size']))
+            for dd in dim_data]
+
+
+def _axis_owners(dim_dicts, idx):
+    """Return the grid coordinate that owns each global index in `idx`
+    along one dimension, and the local index there.
+
+    `dim_dicts` holds the dim dict of every grid coordinate of the
+    dimension, in order.
+    """
+    dd = dim_dicts[0]
+    dist_type = dd['dist_type']
+    if dist_type == 'n':
+        return numpy.zeros_like(idx), idx
+    elif dist_type == 'b':
+        starts = numpy.array([d['start'] for d in dim_dicts])
+        stops = numpy.array([d['stop'] for d in dim_dicts])
+        coords = numpy.searchsorted(stops, idx, side='right')
+        return coords, idx - starts[coords]
+    elif dist_type == 'c':
+        block_size = dd.get('block_size', 1)
+        blocks = idx // block_size
+        coords = blocks % len(dim_dicts)
+        local = (blocks // len(dim_dicts)) * block_size + idx % block_size
+        return coords, local
+    elif dist_type == 'u':
+        owner = numpy.empty(dd['size'], dtype=numpy.int64)
+        local = numpy.empty(dd['size'], dtype=numpy.int64)
+        for (coord, d) in enumerate(dim_dicts):
+            owner[d['indices']] = coord
+            local[d['indices']] = numpy.arange(len(d['indices']))
+        return owner[idx], local[idx]
+    else:
+        msg = "dist_type %r not supported."
+        raise TypeError(msg % dist_type)
+
+
+def owning_ranks_and_local_indices(dim_data_per_rank, global_indices):
+    """Vectorized ownership computation.
+
+    Parameters
+    ----------
+    dim_data_per_rank : sequence of dim-data tuples
+        The dim-data of every rank, in rank order.
+    global_indices : sequence of integer arrays
+        One array of non-negative global indices per dimension.
+
+    Returns
+    -------
+    ranks : ndarray
+        The rank that owns each indexed element.
+    local_indices : tuple of ndarrays
+        The index of each element in its owner's local array, one array
+        per dimension.
+
+    Raises `IndexError` if any index is out of bounds.
+    """
+    ndim = len(dim_data_per_rank[0])
+    grid_coords, local_indices, grid_shape = [], [], []
+    for axis in range(ndim):
+        by_coord = dict((dim_data[axis].get('proc_grid_rank', 0),
+                         dim_data[axis])
+                        for dim_data in dim_data_per_rank)
+        dim_dicts = [by_coord[coord] for coord in sorted(by_coord)]
+        idx = numpy.asarray(global_indices[axis], dtype=numpy.int64)
+        size = dim_dicts[0]['size']
+        if idx.size and (idx.min() < 0 or idx.max() >= size):
+            msg = "Index out of bounds for axis %d with size %d"
+            raise IndexError(msg % (axis, size))
+        coords, local = _axis_owners(dim_dicts, idx)
+        grid_coords.append(coords)
+        local_indices.append(local)
+        grid_shape.append(len(dim_dicts))
+    ranks = numpy.ravel_multi_index(grid_coords, grid_shape)
+    return ranks, tuple(local_indices)
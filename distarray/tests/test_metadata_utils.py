@@ -5,6 +5,10 @@
 # ---------------------------------------------------------------------------
 
 import unittest
+
+import numpy
+from numpy.testing import assert_array_equal
+
 from distarray import metadata_utils
 
 
@@ -26,5 +30,87 @@ class TestPositivify(unittest.TestCase):
         self.assertEqual(result, 8)
 
 
+
+class TestWeightedBlockBounds(unittest.TestCase):
+
+    def test_uniform(self):
+        bounds = metadata_utils._weighted_block_bounds(numpy.ones(12), 4)
+        self.assertEqual(bounds, [(0, 3), (3, 6), (6, 9), (9, 12)])
+
+    def test_skewed(self):
+        # The last quarter of the indices costs as much as the rest.
+        weights = numpy.ones(16)
+        weights[12:] = 3
+        bounds = metadata_utils._weighted_block_bounds(weights, 2)
+        self.assertEqual(bounds, [(0, 12), (12, 16)])
+
+    def test_zero_weights(self):
+        bounds = metadata_utils._weighted_block_bounds(numpy.zeros(5), 2)
+        self.assertEqual(bounds, [(0, 3), (3, 5)])
+
+    def test_negative_weights(self):
+        with self.assertRaises(ValueError):
+            metadata_utils._weighted_block_bounds([1, -1, 1], 2)
+
+
+class TestNormalizeWeights(unittest.TestCase):
+
+    def test_dict(self):
+        weights = metadata_utils.normalize_weights({1: [1, 2]}, (3, 2))
+        self.assertIsNone(weights[0])
+        assert_array_equal(weights[1], [1, 2])
+
+    def test_whole_shape(self):
+        weights = metadata_utils.normalize_weights(numpy.ones((3, 2)),
+                                                   (3, 2))
+        assert_array_equal(weights[0], [2, 2, 2])
+        assert_array_equal(weights[1], [3, 3])
+
+    def test_whole_shape_with_dist(self):
+        weights = metadata_utils.normalize_weights(numpy.ones((3, 2)),
+                                                   (3, 2), ('b', 'n'))
+        assert_array_equal(weights[0], [2, 2, 2])
+        self.assertIsNone(weights[1])
+
+    def test_mismatch(self):
+        with self.assertRaises(ValueError):
+            metadata_utils.normalize_weights([[1, 2, 3], None], (2, 2))
+
+
+class TestDimDataBounds(unittest.TestCase):
+
+    def test_block_and_undistributed(self):
+        dim_data = ({'dist_type': 'b', 'size': 10, 'start': 4, 'stop': 7},
+                    {'dist_type': 'n', 'size': 3})
+        self.assertEqual(metadata_utils.dim_data_bounds(dim_data),
+                         [(4, 7), (0, 3)])
+
+
+class TestOwningRanksAndLocalIndices(unittest.TestCase):
+
+    def test_block_cyclic(self):
+        # A 5x6 array, block rows over 2 ranks, cyclic (block size 2)
+        # columns over 2 ranks.
+        rows = [{'dist_type': 'b', 'size': 5, 'proc_grid_size': 2,
+                 'proc_grid_rank': r, 'start': start, 'stop': stop}
+                for (r, (start, stop)) in enumerate([(0, 3), (3, 5)])]
+        cols = [{'dist_type': 'c', 'size': 6, 'proc_grid_size': 2,
+                 'proc_grid_rank': r, 'start': 2 * r, 'block_size': 2}
+                for r in range(2)]
+        ddpr = [(rows[0], cols[0]), (rows[0], cols[1]),
+                (rows[1], cols[0]), (rows[1], cols[1])]
+        ranks, local = metadata_utils.owning_ranks_and_local_indices(
+            ddpr, (numpy.array([0, 2, 3, 4]), numpy.array([0, 3, 4, 3])))
+        assert_array_equal(ranks, [0, 1, 2, 3])
+        assert_array_equal(local[0], [0, 2, 0, 1])
+        assert_array_equal(local[1], [0, 1, 2, 1])
+
+    def test_out_of_bounds(self):
+        ddpr = [({'dist_type': 'n', 'size': 4},)]
+        with self.assertRaises(IndexError):
+            metadata_utils.owning_ranks_and_local_indices(
+                ddpr, (numpy.array([1, 4]),))
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,86 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Benchmark an explicit 2-D heat-equation solver on a growing number of
+engines.  Usage:
+    $ ipcluster start --n=4 --engines=MPI
+    ...
+    $ python benchmark.py <order> <steps>
+
+The grid is ``order x order``, block-distributed over a 2-D process grid
+with a one-cell ghost layer, and has zero (Dirichlet) boundaries.  Every
+step is ``u += alpha * laplacian(u)``.  With distarray, all the steps run
+on the engines in a single call: `u` is updated in place, so the persistent
+halo exchange created on the first step is reused by the following ones,
+and `u` is never gathered on the client.  The reported rate includes that
+first step and the one round trip to the engines; grid creation is not
+timed.
+"""
+
+from __future__ import print_function
+
+import sys
+from timeit import default_timer as clock
+
+import numpy
+
+from distarray.dist import Context, Distribution
+from distarray.dist.random import Random
+
+
+ALPHA = 0.2  # Stable for alpha <= 0.25 with unit grid spacing.
+
+
+def heat_numpy(u, steps):
+    for _ in range(steps):
+        padded = numpy.pad(u, 1, mode='constant')
+        lap = (padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] +
+               padded[1:-1, 2:] - 4 * u)
+        u = u + ALPHA * lap
+    return u
+
+
+def heat_distarray(u, steps):
+
+    def local_heat(u, steps, alpha):
+        import numpy
+        from distarray.local.stencil import apply_stencil
+        weights = numpy.array([[0., 1., 0.], [1., -4., 1.], [0., 1., 0.]])
+        for _ in range(steps):
+            u.ndarray[...] += alpha * apply_stencil(u, weights).ndarray
+
+    u.context.apply(local_heat, (u.key, steps, ALPHA), targets=u.targets)
+    return u
+
+
+def bench_numpy(order, steps):
+    u = numpy.random.random((order, order))
+    start = clock()
+    heat_numpy(u, steps)
+    return steps / (clock() - start)
+
+
+def bench_distarray(context, order, steps):
+    distribution = Distribution.from_shape(context, (order, order),
+                                           dist=('b', 'b'), halo=1)
+    u = Random(context).rand(distribution)
+    start = clock()
+    heat_distarray(u, steps)
+    return steps / (clock() - start)
+
+
+if __name__ == '__main__':
+    order = int(sys.argv[1])
+    steps = int(sys.argv[2])
+
+    all_targets = Context().targets
+    print("grid: %d x %d, %d steps" % (order, order, steps))
+    print("%8s %14s" % ('engines', 'steps/s'))
+    print("%8s %14.4g" % ('numpy', bench_numpy(order, steps)))
+    for n in range(1, len(all_targets) + 1):
+        context = Context(targets=all_targets[:n])
+        print("%8d %14.4g" % (n, bench_distarray(context, order, steps)))
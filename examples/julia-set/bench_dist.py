@@ -6,7 +6,11 @@
 
 """
 Benchmark calculating the Julia set with Distarray for various array
-distributions and number of engines. Usage:
+distributions and number of engines.  The cost of a pixel is its number of
+iterations, which varies widely over the plane, so the block distributions
+are also run with blocks balanced by `Distribution.from_cost`, and with
+`vectorize(julia, balanced=True)`, which steals work between engines.
+Usage:
     $ ipcluster start --n=20 --engines=MPI
     ...
     $ python bench_dist.py
@@ -22,11 +26,14 @@ from distarray.dist.decorators import local, vectorize
 
 
 # Make an empty distributed array
-def make_empty_da(resolution, dist, context):
+def make_empty_da(resolution, dist, context, balance=None):
     """Create the arr we will build the fractal with."""
-    distribution = Distribution.from_shape(context,
-                                           (resolution[0], resolution[1]),
-                                           dist=dist)
+    shape = (resolution[0], resolution[1])
+    if balance == 'cost':
+        distribution = Distribution.from_cost(context, shape, julia_cost,
+                                              dist=dist)
+    else:
+        distribution = Distribution.from_shape(context, shape, dist=dist)
     out = context.empty(distribution, dtype=complex)
     return out
 
@@ -55,12 +62,20 @@ def julia(z, c, z_max, n_max):
     return n
 
 
-def test_distarray(dist, context):
+# The cost of computing a pixel, sampled to balance the blocks.
+def julia_cost(i, j):
+    re_step = float(re_ax[1] - re_ax[0]) / resolution[0]
+    im_step = float(im_ax[1] - im_ax[0]) / resolution[1]
+    z = complex(re_ax[0] + re_step*i, im_ax[0] + im_step*j)
+    return julia(z, c, z_max, n_max) + 1
+
+
+def test_distarray(dist, context, balance=None):
     global draw_coord
     global julia
     local_draw_coord = local(draw_coord)
-    vect_julia = vectorize(julia)
-    darr = make_empty_da(resolution, dist, context)
+    vect_julia = vectorize(julia, balanced=(balance == 'stealing'))
+    darr = make_empty_da(resolution, dist, context, balance)
     darr = local_draw_coord(darr, re_ax, im_ax, resolution)
     start = clock()
     darr = vect_julia(darr, c, z_max, n_max)
@@ -81,9 +96,15 @@ n_max = 100
 # number of engines
 engines = range(4, 21, 2)
 
-# array distributions
-dists = [{0: 'c', 1: 'b'}, {0: 'c', 1: 'c'}, {0: 'b'}, {0: 'c'},
-         {0: 'b', 1: 'b'}, {0: 'b', 1: 'c'}]
+# array distributions, and how the load is balanced: by the cost of the
+# blocks or by work stealing
+dists = [({0: 'c', 1: 'b'}, None), ({0: 'c', 1: 'c'}, None),
+         ({0: 'b'}, None), ({0: 'c'}, None),
+         ({0: 'b', 1: 'b'}, None), ({0: 'b', 1: 'c'}, None),
+         ({0: 'b'}, 'cost'), ({0: 'b', 1: 'b'}, 'cost'),
+         ({0: 'b'}, 'stealing'), ({0: 'b', 1: 'b'}, 'stealing')]
+labels = [repr(dist) + (' ' + balance if balance else '')
+          for (dist, balance) in dists]
 
 dist_data = [[] for i in range(len(dists))]
 engine_data = []
@@ -93,13 +114,13 @@ for num_engines in engines:
     targets = list(range(num_engines))
     context = Context(client, targets=targets)
     print(num_engines)
-    for i, dist in enumerate(dists):
-        print(dist)
-        time = test_distarray(dist, context)
+    for i, (dist, balance) in enumerate(dists):
+        print(labels[i])
+        time = test_distarray(dist, context, balance)
         dist_data[i].append(time)
 
 for i, data in enumerate(dist_data):
-    pyplot.plot(list(engines), data, label=dists[i].__repr__(), lw=2)
+    pyplot.plot(list(engines), data, label=labels[i], lw=2)
 
 pyplot.title('Julia set benchmark - array distribution type vs number of '
              'engines')
@@ -0,0 +1,65 @@
+# encoding: utf-8
+# ---------------------------------------------------------------------------
+#  Copyright (C) 2008-2014, IPython Development Team and Enthought, Inc.
+#  Distributed under the terms of the BSD License.  See COPYING.rst.
+# ---------------------------------------------------------------------------
+
+"""
+Benchmark distributed matrix multiplication (SUMMA) against NumPy.  Usage:
+    $ ipcluster start --n=4 --engines=MPI
+    ...
+    $ python benchmark.py <n>
+
+Square matrices of order 2**3 up to 2**(n-1) are multiplied.  Matrix
+creation is not timed.
+"""
+
+from __future__ import print_function
+
+import sys
+from timeit import default_timer as clock
+
+import numpy
+
+from distarray.dist import Context, Distribution, dot
+from distarray.dist.random import Random
+
+
+def bench_numpy(order, repeat=3):
+    a = numpy.random.random((order, order))
+    b = numpy.random.random((order, order))
+    times = []
+    for _ in range(repeat):
+        start = clock()
+        numpy.dot(a, b)
+        times.append(clock() - start)
+    return min(times)
+
+
+def bench_distarray(context, order, repeat=3):
+    distribution = Distribution.from_shape(context, (order, order),
+                                           dist=('b', 'b'))
+    random = Random(context)
+    a = random.rand(distribution)
+    b = random.rand(distribution)
+    times = []
+    for _ in range(repeat):
+        start = clock()
+        dot(a, b)
+        times.append(clock() - start)
+    return min(times)
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1])
+    orders = [2**i for i in range(3, n)]
+
+    context = Context()
+    print("engines: %d" % len(context.targets))
+    print("%8s %12s %12s %8s" % ('order', 'numpy (s)', 'distarray (s)',
+                                 'ratio'))
+    for order in orders:
+        numpy_time = bench_numpy(order)
+        distarray_time = bench_distarray(context, order)
+        print("%8d %12.4g %12.4g %8.3g" % (order, numpy_time, distarray_time,
+                                           distarray_time / numpy_time))